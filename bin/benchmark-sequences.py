@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+"""
+Benchmark of sequence-aware methods of the 'blessed' Terminal library for python.
+
+Measures :meth:`~.Sequence.padd` and :meth:`~.Sequence.strip_seqs` of generated output resembling
+that captured from programs that redraw a progress indicator by backspace and cursor movement, at
+sizes doubling from 1 megabyte: time per megabyte should remain about the same, as they scale
+linearly.
+
+Then measures the printable width of lines of ASCII, Latin, and CJK text by the width table used by
+:meth:`~.Sequence.length`, compared to the sum of :func:`wcwidth.wcwidth` of each character.
+
+Then measures frames per second interpreted by :class:`~.screen.Screen`, of frames resembling those
+of bin/plasma.py, every cell of a distinct 24-bit background color, at sizes of common terminals.
+
+Then measures :meth:`~.Terminal.wrap` and :meth:`~.Terminal.measure` of 1 megabyte of paragraphs
+of prose, of colored prose, and of prose containing long unbroken URLs, which are broken across
+lines: time should be proportional to the size of input, also for words longer than a line.
+
+Usage: benchmark-sequences.py [TERM] [MAX_MEGABYTES]
+"""
+from __future__ import division, print_function
+
+# std imports
+import sys
+import timeit
+
+# 3rd party
+from wcwidth import wcwidth
+
+# local
+from blessed import Terminal
+from blessed.screen import Screen
+from blessed._width import text_width
+from blessed.sequences import Sequence
+
+MEGABYTE = 1024 * 1024
+
+#: Sizes of screen, as (height, width), of frames measured by :func:`benchmark_screen`.
+SCREEN_SIZES = ((24, 80), (50, 132), (60, 240))
+
+#: Sample text of each script, measured by :func:`benchmark_width`.
+WIDTH_SAMPLES = (
+    ('ascii', u'The quick brown fox jumps over the lazy dog. '),
+    ('latin', u'Portez ce vieux whisky au juge blond qui fume, \xe0 l\'\xe9t\xe9. '),
+    ('cjk', u'こんにちは世界、abc。'),
+)
+
+
+def make_progress_output(term, size):
+    """Return string of at least ``size`` characters of progress redrawn by movement."""
+    chunks, length, line = [], 0, 0
+    while length < size:
+        line += 1
+        row = [term.bold(u'file-{0:05d}.tar.gz'.format(line)), u' ']
+        for percent in range(0, 101, 5):
+            status = u'{0:3d}%'.format(percent)
+            if percent % 10:
+                row.append(status + u'\b' * len(status))
+            else:
+                row.append(status + term.move_left(len(status)))
+        row.append(term.green(u'done') + u'\n')
+        chunk = u''.join(row)
+        chunks.append(chunk)
+        length += len(chunk)
+    return u''.join(chunks)
+
+
+def benchmark_padd(term, max_megabytes):
+    """Display time per megabyte of padd() and strip_seqs() of progress output."""
+    print('{0:>8s} {1:>12s} {2:>12s}'.format('size', 'padd s/MB', 'strip s/MB'))
+    megabytes = 1
+    while megabytes <= max_megabytes:
+        text = Sequence(make_progress_output(term, megabytes * MEGABYTE), term)
+        # each measurement is of a new Sequence, so that its parsing is measured
+        padd = min(timeit.repeat(lambda: Sequence(text[:], term).padd(), number=1, repeat=3))
+        strip = min(timeit.repeat(lambda: Sequence(text[:], term).strip_seqs(),
+                                  number=1, repeat=3))
+        print('{0:>6d}MB {1:>12.3f} {2:>12.3f}'.format(
+            megabytes, padd / megabytes, strip / megabytes))
+        megabytes *= 2
+
+
+def benchmark_width(number=20000):
+    """Display time of measuring lines of each script by width table and by wcwidth."""
+    print('{0:>8s} {1:>12s} {2:>12s}'.format('script', 'table us', 'wcwidth us'))
+    for name, line in WIDTH_SAMPLES:
+        assert text_width(line) == sum(max(wcwidth(char), 0) for char in line)
+        table = min(timeit.repeat(lambda: text_width(line), number=number, repeat=3))
+        per_char = min(timeit.repeat(lambda: sum(max(wcwidth(char), 0) for char in line),
+                                     number=number, repeat=3))
+        print('{0:>8s} {1:>12.2f} {2:>12.2f}'.format(
+            name, table * 1e6 / number, per_char * 1e6 / number))
+
+
+def make_plasma_frame(term, time):
+    """Return frame of every cell of the screen of ``term`` by its own 24-bit background color."""
+    cells = [term.home]
+    for y in range(term.height - 1):
+        for x in range(term.width):
+            cells.append(term.on_color_rgb((x * 3 + time) % 256, (y * 7) % 256, (x * y) % 256))
+            cells.append(u' ')
+    cells.append(term.normal)
+    return u''.join(cells)
+
+
+def benchmark_screen(kind, number=5):
+    """Display frames per second, and megabytes per second, written to a Screen of each size."""
+    print('{0:>8s} {1:>12s} {2:>12s}'.format('size', 'frames/s', 'MB/s'))
+    for height, width in SCREEN_SIZES:
+        screen = Screen(height=height, width=width)
+        term = Terminal(kind=kind, stream=screen, force_styling=True)
+        term.number_of_colors = 1 << 24
+        frames = [make_plasma_frame(term, time) for time in range(number)]
+        elapsed = min(timeit.repeat(lambda: [screen.write(frame) for frame in frames],
+                                    number=1, repeat=3))
+        size = sum(len(frame) for frame in frames)
+        print('{0:>8s} {1:>12.1f} {2:>12.2f}'.format(
+            '{0}x{1}'.format(width, height), number / elapsed, size / elapsed / MEGABYTE))
+
+
+def make_prose(term, size, kind):
+    """
+    Return string of at least ``size`` characters of paragraphs of words.
+
+    :arg str kind: ``'plain'``, ``'colored'`` where every third word is styled, or ``'urls'``
+        where every tenth word is an unbroken URL of several hundred characters.
+    """
+    words = WIDTH_SAMPLES[0][1].split()
+    url = u'https://example.com/' + u'/'.join(u'segment{0}?q={0}&r=s'.format(n) for n in range(24))
+    paragraphs, length, index = [], 0, 0
+    while length < size:
+        paragraph = []
+        for _ in range(40 + index % 80):
+            index += 1
+            word = words[index % len(words)]
+            if kind == 'colored' and not index % 3:
+                word = term.bold_red(word)
+            elif kind == 'urls' and not index % 10:
+                word = url
+            paragraph.append(word)
+        paragraphs.append(u' '.join(paragraph))
+        length += len(paragraphs[-1]) + 1
+    return u'\n'.join(paragraphs)
+
+
+def benchmark_wrap(term, width=80):
+    """Display time per megabyte of wrap() and measure() of each kind of prose."""
+    print('{0:>8s} {1:>12s} {2:>12s} {3:>12s}'.format('prose', 'wrap s/MB', 'measure s/MB',
+                                                     'lines'))
+    for kind in ('plain', 'colored', 'urls'):
+        text = make_prose(term, MEGABYTE, kind)
+        megabytes = len(text) / MEGABYTE
+        lines = term.wrap(text, width)
+        assert term.measure(text, width) == len(lines)
+        wrap = min(timeit.repeat(lambda: term.wrap(text, width), number=1, repeat=3))
+        measure = min(timeit.repeat(lambda: term.measure(text, width), number=1, repeat=3))
+        print('{0:>8s} {1:>12.3f} {2:>12.3f} {3:>12d}'.format(
+            kind, wrap / megabytes, measure / megabytes, len(lines)))
+
+
+def main(kind=None, max_megabytes=8):
+    """Program entry point."""
+    term = Terminal(kind=kind, force_styling=True)
+    benchmark_padd(term, max_megabytes)
+    print()
+    benchmark_width()
+    print()
+    benchmark_screen(kind)
+    print()
+    benchmark_wrap(term)
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2], max_megabytes=int((sys.argv[2:3] or [8])[0]))
@@ -1,17 +1,28 @@
 #!/usr/bin/env python3
-"""Example scrip that strips input of terminal sequences."""
+"""
+Example scrip that strips input of terminal sequences.
+
+Usage: strip.py [FILE]
+
+A FILE is mapped to memory and stripped by a pool of processes, one for each CPU, otherwise
+standard input is read and stripped as it arrives.
+"""
 # std imports
 import sys
 
 # local
 import blessed
+from blessed.parallel import strip_seqs_file
 
 
 def main():
     """Program entry point."""
     term = blessed.Terminal()
-    for line in sys.stdin:
-        print(term.strip_seqs(line))
+    if len(sys.argv) > 1 and sys.argv[1] != '-':
+        with open(sys.argv[1], 'rb') as infile:
+            strip_seqs_file(term, infile, sys.stdout.buffer)
+    else:
+        strip_seqs_file(term, sys.stdin.buffer, sys.stdout.buffer, encoding=sys.stdin.encoding)
 
 
 if __name__ == '__main__':
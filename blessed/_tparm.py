@@ -0,0 +1,330 @@
+"""
+Parameterized capabilities of terminfo(5), compiled to Python functions.
+
+A capability such as ``cup``, ``'\\x1b[%i%p1%d;%p2%dH'``, is a program of a small stack language
+interpreted by :func:`curses.tparm` each time it is called. :func:`tparm` instead compiles each
+capability once to a Python function, such as ``lambda p1, p2: '\\x1b[%d;%dH' % (p1 + 1, p2 + 1)``,
+as used by :class:`~.ParameterizingString`, which remembers its most recent results.
+
+Only the language of the capabilities of the terminfo database is compiled: programs that use
+static variables, string parameters, parameters pushed implicitly as for termcap, or formats of
+:func:`printf` that differ from those of Python, and any arguments not of the range of a C ``int``,
+are given to :func:`curses.tparm`.
+"""
+# std imports
+import re
+import platform
+
+# 3rd party
+import six
+
+# isort: off
+# curses
+if platform.system() == 'Windows':
+    import jinxed as curses   # pylint: disable=import-error
+else:
+    import curses
+
+__all__ = ('compile_tparm', 'tparm')
+
+#: Maximum number of capabilities compiled.
+_MAXSIZE = 1024
+
+#: Compiled function of each capability, ``None`` for those given to :func:`curses.tparm`.
+_PROGRAMS = {}
+
+#: Matches each element of a parameterized capability: a format of the top of the stack, an
+#: operation, or literal text. The format of flags ``'-'`` or ``'+'`` must begin with ``':'``.
+_RE_TPARM = re.compile(
+    r'%(?::(?P<cflags>[-+# ]*)|(?P<flags>[ #]*))(?P<width>\d*)(?:\.(?P<precision>\d+))?'
+    r'(?P<conv>[doxX])'
+    r'|%p(?P<param>[1-9])'
+    r'|%(?P<var_op>[Pg])(?P<var>[a-z])'
+    r'|%\{(?P<number>\d+)\}'
+    r"|%'(?P<char>[^'])'"
+    r'|%(?P<op>[%c+\-*/m&|^=<>AO!~i?te;])'
+    r'|(?P<text>[^%]+)'
+    r'|(?P<unsupported>%)')
+
+#: Python expression of each binary operation, of ``a`` and ``b`` popped from the stack.
+_BINARY_OPS = {
+    u'+': u'_int({a} + {b})',
+    u'-': u'_int({a} - {b})',
+    u'*': u'_int({a} * {b})',
+    u'/': u'_div({a}, {b})',
+    u'm': u'_mod({a}, {b})',
+    u'&': u'({a} & {b})',
+    u'|': u'({a} | {b})',
+    u'^': u'({a} ^ {b})',
+    u'=': u'int({a} == {b})',
+    u'<': u'int({a} < {b})',
+    u'>': u'int({a} > {b})',
+    u'A': u'int(bool({a} and {b}))',
+    u'O': u'int(bool({a} or {b}))',
+}
+
+#: Least and greatest value of a C ``int``, of the stack of :func:`curses.tparm`.
+_INT_MIN, _INT_MAX = -(1 << 31), (1 << 31) - 1
+
+
+class _Unsupported(ValueError):
+    """A capability that is not compiled, and is given to :func:`curses.tparm`."""
+
+
+def _int(value):
+    """Return ``value`` wrapped to a C ``int``, as by overflow of its arithmetic."""
+    return ((value - _INT_MIN) & 0xFFFFFFFF) + _INT_MIN
+
+
+def _div(dividend, divisor):
+    """Return quotient of C division, truncated toward zero, or *0* when divided by zero."""
+    if not divisor:
+        return 0
+    quotient = abs(dividend) // abs(divisor)
+    return _int(-quotient if (dividend < 0) != (divisor < 0) else quotient)
+
+
+def _mod(dividend, divisor):
+    """Return remainder of C division, of the sign of the dividend, or *0* by zero."""
+    if not divisor:
+        return 0
+    return dividend - divisor * _div(dividend, divisor)
+
+
+def _char(value):
+    """Return character of ``value`` by ``%c``, of which *0* is ``'\\x80'``, as by ncurses."""
+    return six.unichr(value & 0xFF) if value else u'\x80'
+
+
+class _Compiler(object):
+    """Compiler of a parameterized capability to the source of a Python function."""
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self):
+        """Class initializer."""
+        #: lines of source of the function body.
+        self.lines = []
+        self.indent = 1
+        #: Python expressions of values pushed, not yet written to the stack at runtime.
+        self.stack = []
+        #: format and expressions of output not yet appended to ``out``.
+        self.fmt, self.args = u'', []
+        #: number of blocks opened by each conditional, and whether its 'then' part is open.
+        self.conditionals = []
+        self.temps = 0
+        self.variables = set()
+        self.uses_stack = self.branches = self.chars = self.params = self.incremented = False
+
+    def emit(self, line):
+        """Add ``line`` of source at the current indentation."""
+        self.lines.append(u'    ' * self.indent + line)
+
+    def temporary(self, expr):
+        """Return name of a new variable assigned ``expr``."""
+        self.temps += 1
+        name = u't{0}'.format(self.temps)
+        self.emit(u'{0} = {1}'.format(name, expr))
+        return name
+
+    def push(self, expr):
+        """Push Python expression ``expr``."""
+        self.stack.append(expr)
+
+    def pop(self):
+        """Pop Python expression, from the stack at runtime when none are pushed."""
+        if self.stack:
+            return self.stack.pop()
+        if not self.params:
+            # without any %p, ncurses first pushes parameters, as for termcap(5).
+            raise _Unsupported('pop of parameters pushed implicitly')
+        self.uses_stack = True
+        return self.temporary(u'stack.pop() if stack else 0')
+
+    def freeze(self):
+        """Assign each expression pushed or output to a variable, before any is changed."""
+        self.stack = [expr if expr.isdigit() else self.temporary(expr) for expr in self.stack]
+        self.args = [expr if expr.isdigit() else self.temporary(expr) for expr in self.args]
+
+    def flush(self):
+        """Write expressions pushed to the stack, and output to ``out``, at runtime."""
+        for expr in self.stack:
+            self.uses_stack = True
+            self.emit(u'stack.append({0})'.format(expr))
+        if self.fmt:
+            self.emit(u'out.append({0})'.format(self.format()))
+        self.stack, self.fmt, self.args = [], u'', []
+
+    def format(self):
+        """Return Python expression of output not yet appended."""
+        if not self.args:
+            return repr(self.fmt.replace(u'%%', u'%'))
+        return u'{0!r} % ({1},)'.format(self.fmt, u', '.join(self.args))
+
+    def open_block(self, header):
+        """Begin block of ``header``, such as ``if t1:``."""
+        self.emit(header)
+        self.indent += 1
+        self.emit(u'pass')
+
+    def compile(self, cap):
+        """
+        Return source of a function evaluating ``cap``.
+
+        :arg str cap: parameterized capability.
+        :raises _Unsupported: ``cap`` is not of the language compiled.
+        :rtype: str
+        """
+        self.params = u'%p' in cap
+        for match in _RE_TPARM.finditer(cap):
+            self.element(match)
+        if self.conditionals:
+            raise _Unsupported('conditional not terminated by %;')
+        body = self.lines
+        if self.branches or self.uses_stack:
+            self.flush()
+            result = u"u''.join(out)"
+        else:
+            result = self.format()
+        if self.chars:
+            result = u"({0}).partition(u'\\x00')[0]".format(result)
+        head = [u'def _tparm({0}):'.format(u', '.join(
+            u'p{0}=0'.format(num) for num in range(1, 10)))]
+        head.extend(u'    v{0} = 0'.format(var) for var in sorted(self.variables))
+        if self.branches or self.uses_stack:
+            head.append(u'    out, stack = [], []')
+        return u'\n'.join(head + body + [u'    return ' + result]) + u'\n'
+
+    def element(self, match):
+        """Compile a single element of a capability."""
+        # pylint: disable=too-many-branches
+        group = match.groupdict()
+        if group['text'] is not None:
+            self.fmt += group['text'].replace(u'%', u'%%')
+        elif group['conv'] is not None:
+            self.conversion(match)
+        elif group['param'] is not None:
+            self.push(u'p' + group['param'])
+        elif group['var'] is not None:
+            name = u'v' + group['var']
+            self.variables.add(group['var'])
+            if group['var_op'] == u'g':
+                self.push(name)
+            else:
+                value = self.pop()
+                self.freeze()
+                self.emit(u'{0} = {1}'.format(name, value))
+        elif group['number'] is not None:
+            if int(group['number']) > _INT_MAX:
+                raise _Unsupported('constant out of range')
+            self.push(six.text_type(int(group['number'])))
+        elif group['char'] is not None:
+            self.push(six.text_type(ord(group['char'])))
+        elif group['op'] is not None:
+            self.operation(group['op'])
+        else:
+            raise _Unsupported('unsupported element at {0}'.format(match.start()))
+
+    def conversion(self, match):
+        """Compile output of the top of the stack by a format of :func:`printf`."""
+        flags = match.group('cflags') or match.group('flags') or u''
+        width, precision = match.group('width'), match.group('precision')
+        conv = match.group('conv')
+        if u'+' in flags or u'#' in flags or (precision is not None and (
+                not int(precision) or u'0' in flags or width.startswith(u'0'))):
+            # formats of which python differs from printf(3).
+            raise _Unsupported('unsupported format {0!r}'.format(match.group(0)))
+        expr = self.pop()
+        if conv != u'd':
+            expr = u'({0} & 0xFFFFFFFF)'.format(expr)
+        self.fmt += u'%' + flags + width + (
+            u'.' + precision if precision is not None else u'') + conv
+        self.args.append(expr)
+
+    def operation(self, op):
+        """Compile operation ``op`` of a single character."""
+        # pylint: disable=too-many-branches
+        if op == u'%':
+            self.fmt += u'%%'
+        elif op == u'c':
+            self.chars = True
+            self.fmt += u'%s'
+            self.args.append(u'_char({0})'.format(self.pop()))
+        elif op in _BINARY_OPS:
+            right, left = self.pop(), self.pop()
+            self.push(_BINARY_OPS[op].format(a=left, b=right))
+        elif op == u'!':
+            self.push(u'int(not {0})'.format(self.pop()))
+        elif op == u'~':
+            self.push(u'(~{0})'.format(self.pop()))
+        elif op == u'i':
+            # parameters are incremented only by the first %i, as by ncurses.
+            if self.indent > 1:
+                raise _Unsupported('%i of a conditional')
+            if not self.incremented:
+                self.freeze()
+                self.emit(u'p1, p2 = _int(p1 + 1), _int(p2 + 1)')
+                self.incremented = True
+        elif op == u'?':
+            self.conditionals.append([0, False])
+        elif op == u't':
+            if not self.conditionals or self.conditionals[-1][1]:
+                raise _Unsupported('%t without %?')
+            condition = self.pop()
+            self.flush()
+            self.branches = True
+            self.open_block(u'if {0}:'.format(condition))
+            self.conditionals[-1] = [self.conditionals[-1][0] + 1, True]
+        elif op == u'e':
+            if not self.conditionals or not self.conditionals[-1][1]:
+                raise _Unsupported('%e without %t')
+            self.flush()
+            self.indent -= 1
+            self.open_block(u'else:')
+            self.conditionals[-1][1] = False
+        else:
+            if not self.conditionals:
+                raise _Unsupported('%; without %?')
+            self.flush()
+            self.indent -= self.conditionals.pop()[0]
+
+
+def compile_tparm(cap):
+    """
+    Return function of parameters of ``cap``, returning its result, as by :func:`curses.tparm`.
+
+    :arg str cap: parameterized capability.
+    :rtype: callable
+    :returns: Function of up to 9 :class:`int` arguments, or ``None`` when ``cap`` is not of the
+        language compiled, and must be given to :func:`curses.tparm`.
+    """
+    try:
+        source = _Compiler().compile(cap)
+    except _Unsupported:
+        return None
+    namespace = {'_int': _int, '_div': _div, '_mod': _mod, '_char': _char}
+    # pylint: disable=exec-used
+    exec(compile(source, '<tparm {0!r}>'.format(cap), 'exec'), namespace)
+    return namespace['_tparm']
+
+
+def tparm(cap, *args):
+    """
+    Return ``cap`` evaluated with parameters ``args``, as by :func:`curses.tparm`.
+
+    :arg str cap: parameterized capability.
+    :arg args: up to 9 :class:`int` parameters.
+    :raises TypeError: any of ``args`` is not an :class:`int`.
+    :raises curses.error: :func:`curses.tparm` raised an exception.
+    :rtype: str
+    """
+    try:
+        function = _PROGRAMS[cap]
+    except KeyError:
+        if len(_PROGRAMS) >= _MAXSIZE:
+            _PROGRAMS.clear()
+        function = _PROGRAMS[cap] = compile_tparm(cap)
+    if function is not None and len(args) <= 9 and all(
+            isinstance(arg, six.integer_types) and _INT_MIN <= arg <= _INT_MAX for arg in args):
+        return function(*args)
+    return curses.tparm(cap.encode('latin1'), *args).decode('latin1')
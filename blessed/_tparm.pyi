@@ -0,0 +1,5 @@
+# std imports
+from typing import Callable, Optional
+
+def compile_tparm(cap: str) -> Optional[Callable[..., str]]: ...
+def tparm(cap: str, *args: int) -> str: ...
@@ -0,0 +1,210 @@
+"""
+Printable width of characters, by a table built from :func:`wcwidth.wcwidth`.
+
+The width of every code point is kept in a two-level table: a list of blocks, each a
+:class:`bytearray` of the widths of 256 consecutive code points. Blocks are built from
+:func:`wcwidth.wcwidth` on first use, and blocks of equal widths are shared.
+
+Grapheme clusters of emoji, such as flags, sequences joined by zero width joiner, and those
+modified by skin tone or variation selector 16, are measured as a whole, and their widths are
+remembered.
+"""
+# std imports
+import re
+import sys
+
+# 3rd party
+import six
+from wcwidth import wcwidth
+
+__all__ = ('char_width', 'cluster_width', 'is_narrow', 'iter_graphemes', 'text_width')
+
+#: Number of code points of each block of the table, as a power of 2.
+_BLOCK_BITS = 8
+_BLOCK_MASK = (1 << _BLOCK_BITS) - 1
+
+#: Blocks of widths, indexed by code point shifted by :data:`_BLOCK_BITS`, ``None`` until built.
+_BLOCKS = [None] * ((0x10FFFF >> _BLOCK_BITS) + 1)
+
+#: Blocks of widths by their contents, to share blocks of equal widths.
+_UNIQUE_BLOCKS = {}
+
+
+#: Characters that modify the preceding character of a grapheme cluster of emoji: variation
+#: selectors 15 and 16, combining enclosing keycap, emoji modifiers, and tags.
+_MODIFIERS = u'\ufe0e\ufe0f\u20e3'
+
+#: Pictographic characters, that may be joined by zero width joiner.
+_PICTOGRAPHS = u'\u2190-\u2bff\u3030\u303d\u3297\u3299'
+
+#: Regional indicator symbols, a pair of which is a flag.
+_RE_FLAG = u''
+
+if sys.maxunicode > 0xffff:
+    _MODIFIERS += u'\U0001F3FB-\U0001F3FF\U000E0020-\U000E007F'
+    _PICTOGRAPHS += u'\U0001F000-\U0001FAFF'
+    _RE_FLAG = u'[\U0001F1E6-\U0001F1FF]{2}|'
+
+#: Matches any grapheme cluster of emoji that is not measured as the sum of its characters: a
+#: flag, a sequence of pictographs joined by zero width joiner, or a character followed by
+#: modifiers.
+_RE_CLUSTER = re.compile(
+    u'{flag}[{pict}][{mod}]*(?:\u200d[{pict}][{mod}]*)+|[^\x00-\x1f\x7f-\x9f][{mod}]+'
+    .format(flag=_RE_FLAG, pict=_PICTOGRAPHS, mod=_MODIFIERS))
+
+#: Widths of grapheme clusters matched by :data:`_RE_CLUSTER`, cleared when it reaches
+#: :data:`_CLUSTER_WIDTHS_MAXSIZE`.
+_CLUSTER_WIDTHS = {}
+_CLUSTER_WIDTHS_MAXSIZE = 4096
+
+
+def _build_block(index):
+    """
+    Build, store, and return block ``index`` of the table.
+
+    :arg int index: code point shifted by :data:`_BLOCK_BITS`.
+    :rtype: bytearray
+    """
+    first = index << _BLOCK_BITS
+    try:
+        # use wcwidth clipped to 0 because it can sometimes return -1
+        block = bytearray(max(wcwidth(six.unichr(codepoint)), 0)
+                          for codepoint in range(first, first + _BLOCK_MASK + 1))
+    except ValueError:
+        # code point beyond the maximum of a "narrow" build of python 2
+        block = bytearray(_BLOCK_MASK + 1)
+    block = _UNIQUE_BLOCKS.setdefault(bytes(block), block)
+    _BLOCKS[index] = block
+    return block
+
+
+def _narrow_pattern(last):
+    """
+    Return pattern matching a string of only characters of width 1, up to code point ``last``.
+
+    :arg int last: greatest code point considered.
+    :rtype: str
+    """
+    ranges, start = [], None
+    for codepoint in range(last + 2):
+        if codepoint <= last and char_width(six.unichr(codepoint)) == 1:
+            if start is None:
+                start = codepoint
+        elif start is not None:
+            ranges.append(u'{0}-{1}'.format(re.escape(six.unichr(start)),
+                                            re.escape(six.unichr(codepoint - 1))))
+            start = None
+    return u'[{0}]*\\Z'.format(u''.join(ranges))
+
+
+def char_width(char):
+    """
+    Return printable width of a single character.
+
+    :arg str char: a single character.
+    :rtype: int
+    :returns: 0, 1, or 2, the width of :func:`wcwidth.wcwidth` clipped to 0.
+    """
+    codepoint = ord(char)
+    block = _BLOCKS[codepoint >> _BLOCK_BITS]
+    if block is None:
+        block = _build_block(codepoint >> _BLOCK_BITS)
+    return block[codepoint & _BLOCK_MASK]
+
+
+#: Matches a string of only characters of width 1, of Latin, Greek, Cyrillic, and similar scripts
+#: that precede the first wide characters, Hangul Jamo at U+1100. Compiled on first use.
+_RE_NARROW = None
+
+
+def _compile_narrow():
+    """Compile, store, and return :data:`_RE_NARROW`."""
+    global _RE_NARROW  # pylint: disable=global-statement
+    _RE_NARROW = re.compile(_narrow_pattern(0x10FF))
+    return _RE_NARROW
+
+
+def cluster_width(cluster):
+    """
+    Return printable width of a grapheme cluster.
+
+    :arg str cluster: a single grapheme cluster, such as yielded by :func:`iter_graphemes`.
+    :rtype: int
+    :returns: 2 for a flag, otherwise width of its first character, or 2 when it is narrow and
+        followed by variation selector 16, as for ``u'\u2764\ufe0f'``.
+    """
+    try:
+        return _CLUSTER_WIDTHS[cluster]
+    except KeyError:
+        pass
+    if len(cluster) == 1:
+        return char_width(cluster)
+    width = char_width(cluster[0])
+    if _RE_FLAG and u'\U0001F1E6' <= cluster[0] <= u'\U0001F1FF':
+        width = 2
+    elif width == 1 and cluster[1] == u'\ufe0f':
+        width = 2
+    if len(_CLUSTER_WIDTHS) >= _CLUSTER_WIDTHS_MAXSIZE:
+        _CLUSTER_WIDTHS.clear()
+    _CLUSTER_WIDTHS[cluster] = width
+    return width
+
+
+def _chars_width(text):
+    """Return sum of :func:`char_width` of each character of ``text``."""
+    width = 0
+    blocks = _BLOCKS
+    for char in text:
+        codepoint = ord(char)
+        block = blocks[codepoint >> _BLOCK_BITS]
+        if block is None:
+            block = _build_block(codepoint >> _BLOCK_BITS)
+        width += block[codepoint & _BLOCK_MASK]
+    return width
+
+
+def text_width(text):
+    """
+    Return printable width of a string of characters, without sequences.
+
+    :arg str text: string of characters.
+    :rtype: int
+    :returns: sum of :func:`char_width` of each character, or :func:`cluster_width` of each
+        grapheme cluster of emoji.
+    """
+    if (_RE_NARROW or _compile_narrow()).match(text):
+        return len(text)
+    width = offset = 0
+    for match in _RE_CLUSTER.finditer(text):
+        width += _chars_width(text[offset:match.start()]) + cluster_width(match.group())
+        offset = match.end()
+    return width + _chars_width(text[offset:])
+
+
+def is_narrow(text):
+    """
+    Return whether every character of ``text`` is of width 1, by a single match.
+
+    :arg str text: string of characters.
+    :rtype: bool
+    :returns: ``True`` when ``text`` is only of characters of width 1 that precede U+1100, which
+        may be false for other text of only characters of width 1.
+    """
+    return (_RE_NARROW or _compile_narrow()).match(text) is not None
+
+
+def iter_graphemes(text):
+    """
+    Generator yields (text, width) for each character of ``text``, or grapheme cluster of emoji.
+
+    :arg str text: string of characters.
+    :rtype: Iterator[tuple(str, int)]
+    """
+    offset = 0
+    for match in _RE_CLUSTER.finditer(text):
+        for char in text[offset:match.start()]:
+            yield char, char_width(char)
+        yield match.group(), cluster_width(match.group())
+        offset = match.end()
+    for char in text[offset:]:
+        yield char, char_width(char)
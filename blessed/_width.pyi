@@ -0,0 +1,11 @@
+# std imports
+from typing import Dict, List, Tuple, Iterator, Optional
+
+_BLOCKS: List[Optional[bytearray]]
+_CLUSTER_WIDTHS: Dict[str, int]
+
+def char_width(char: str) -> int: ...
+def text_width(text: str) -> int: ...
+def is_narrow(text: str) -> bool: ...
+def cluster_width(cluster: str) -> int: ...
+def iter_graphemes(text: str) -> Iterator[Tuple[str, int]]: ...
@@ -0,0 +1,302 @@
+r"""
+Software model of the cursor position, updated from output written to the terminal.
+
+Enabled by :attr:`~.Terminal.track_cursor`, the :attr:`~.Terminal.stream` of a terminal is wrapped
+so that each string written is also parsed by :class:`CursorTracker`, which follows printable text
+by its width, and the capabilities of :data:`~._capabilities.CAPABILITIES_CAUSE_MOVEMENT` by their
+parameters. The position is known without a query of the terminal, until a movement that cannot be
+followed, such as by an unknown sequence, makes it uncertain.
+"""
+# std imports
+import re
+
+# local
+from ._width import text_width
+from .sequences import _RE_PLAIN, _RE_ECMA48, _RE_INCOMPLETE, iter_spans
+
+__all__ = ('CursorTracker',)
+
+#: Final bytes of control sequences that move the cursor, such as ``'\x1b[2E'``, which make the
+#: position uncertain when written as a sequence not known by the terminal.
+_MOVING_FINALS = u'ABCDEFGHILMZ`abdefr'
+
+#: Matches a sequence that moves the cursor, or may: a control sequence of any of
+#: :data:`_MOVING_FINALS`, alternate screen or origin modes, save or restore of the cursor, and
+#: escape sequences of index, next line, reverse index, or full reset. Such a sequence not known by
+#: the terminal, or of a capability not otherwise followed, makes the position uncertain.
+_RE_UNKNOWN_MOVEMENT = re.compile(
+    u'(?:\x1b\\[|\x9b)(?:[\x30-\x3f]*[\x20-\x2f]*[{0}su]|\\?(?:1049|1047|47|6)[hl])'
+    u'|\x1b[78DEMc]|[\x84\x85\x8d]'.format(_MOVING_FINALS))
+
+#: Matches any decimal parameter of a sequence.
+_RE_DIGITS = re.compile(r'\d+')
+
+#: Tab stops are assumed at every 8th column.
+_TABSIZE = 8
+
+#: Bound of the position of a terminal of unknown size.
+_UNBOUNDED = 1 << 16
+
+
+class CursorTracker(object):
+    r"""
+    Model of the cursor position of a terminal, as (y, x), updated by :meth:`update`.
+
+    Each coordinate is ``None`` while it is not known, until it is set by an absolute movement, such
+    as :meth:`~.Terminal.move_yx`, or by :meth:`sync` with the result of a query:
+
+        >>> tracker = CursorTracker(term, y=0, x=0)
+        >>> tracker.update(u'abc' + term.move_down(2))
+        >>> tracker.position
+        (2, 3)
+
+    Some assumptions are made about the terminal: it wraps text at its right margin, a newline
+    also returns the carriage, as by the ``ONLCR`` output mode of a terminal not in
+    :meth:`~.Terminal.raw` mode, tab stops are every 8 columns, and the scrolling region is the
+    whole screen. Writing a wide character at the right margin is not followed exactly.
+    """
+
+    def __init__(self, term, y=None, x=None):
+        """
+        Class initializer.
+
+        :arg blessed.Terminal term: :class:`~.Terminal` instance.
+        :arg int y: Initial row of the cursor, or ``None`` when not known.
+        :arg int x: Initial column of the cursor, or ``None`` when not known.
+        """
+        self._term = term
+        self._pending = u''
+        self._saved = (None, None)
+        self._size = self._bounds = None
+        # whether the size of the terminal is to be compared, once after each update.
+        self._resized = False
+        # offset of row and column parameters of capabilities given by %i, such as 1 for
+        # ECMA-48 control sequences, and those of terminals without capabilities.
+        self._offsets = {}
+        for name in ('cursor_address', 'column_address', 'row_address'):
+            value = getattr(term, term.caps[name].attribute) if name in term.caps else u''
+            self._offsets[name] = 1 if u'%i' in value or not value else 0
+        #: Timeout in seconds of a query of the cursor position by :meth:`~.Terminal.location`,
+        #: when not known.
+        self.sync_timeout = 2.0
+        self.y, self.x = None, None
+        self.sync(y, x)
+
+    @property
+    def position(self):
+        """
+        Cursor position as (y, x), or ``None`` when not known.
+
+        The position is no longer known when the size of the terminal has changed since it was
+        last set, as the terminal may have reflowed its contents. The size is compared only once
+        after each :meth:`update`, rather than by each access.
+
+        :rtype: tuple or None
+        """
+        if self.y is None or self.x is None:
+            return None
+        if self._resized:
+            self._resized = False
+            # pylint: disable=protected-access
+            if self._size != self._term._height_and_width()[:2]:
+                self.invalidate()
+                return None
+        return self.y, min(self.x, self._bounds[1] - 1)
+
+    def sync(self, y, x):
+        """
+        Set the cursor position, such as from :meth:`~.Terminal.get_location`.
+
+        :arg int y: Row of the cursor, or ``None`` when not known.
+        :arg int x: Column of the cursor, or ``None`` when not known.
+        """
+        # pylint: disable=protected-access
+        self._size = self._term._height_and_width()[:2]
+        # a size of 0, as of a pseudo-terminal not yet sized, does not bound the position.
+        self._bounds = tuple(value or _UNBOUNDED for value in self._size)
+        self.y, self.x = y, x
+        self._resized = False
+
+    def invalidate(self):
+        """Forget the cursor position, so that it is next determined by a query."""
+        self.y, self.x = None, None
+
+    def update(self, text):
+        """
+        Follow the movement of the cursor by ``text`` written to the terminal.
+
+        :arg str text: Output written, of any length. An incomplete sequence at its end is kept
+            until completed by the following output.
+        """
+        self._resized = True
+        text = self._pending + text
+        match = _RE_INCOMPLETE.search(text, max(0, len(text) - 4096))
+        if match is not None:
+            text, self._pending = text[:match.start()], text[match.start():]
+        else:
+            self._pending = u''
+        offset = 0
+        for start, end, cap in iter_spans(self._term, text):
+            if start != offset:
+                # characters not part of any span, such as newline, not matching any capability.
+                self._text(text[offset:start])
+            offset = end
+            if cap is None:
+                self._text(text[start:end])
+                continue
+            try:
+                self._sequence(text[start:end], cap)
+            except (IndexError, ValueError):
+                # parameters of a capability not of decimal form.
+                self.invalidate()
+        if offset != len(text):
+            self._text(text[offset:])
+
+    def _advance(self, width):
+        """Move right by ``width`` cells of printed text, wrapping at the right margin."""
+        if self.x is None or not width:
+            return
+        height, columns = self._bounds
+        x = min(self.x, columns) + width
+        if x > columns:
+            # the cursor remains at the right margin, until the next character is printed.
+            lines, x = divmod(x - 1, columns)
+            x += 1
+            if self.y is not None:
+                self.y = min(self.y + lines, height - 1)
+        self.x = x
+
+    def _column(self):
+        """Return current column, without any pending wrap at the right margin."""
+        return min(self.x, self._bounds[1] - 1)
+
+    def _move(self, dy=0, dx=0):
+        """Move relative to the current position, bounded by the edges of the screen."""
+        height, columns = self._bounds
+        if dy and self.y is not None:
+            self.y = max(0, min(self.y + dy, height - 1))
+        if dx and self.x is not None:
+            self.x = max(0, min(self._column() + dx, columns - 1))
+
+    def _newline(self):
+        """Move to the start of the next line, as by newline, scrolling at the bottom."""
+        self._move(dy=1)
+        self.x = 0
+
+    def _tab(self):
+        """Move to the next tab stop."""
+        if self.x is not None:
+            column = self._column()
+            self.x = min(column + _TABSIZE - column % _TABSIZE, self._bounds[1] - 1)
+
+    def _control(self, char):
+        """Follow a single control character, not matching any capability."""
+        if char in u'\n\x0b\x0c':
+            self._newline()
+        elif char == u'\r':
+            self.x = 0
+        elif char == u'\b':
+            self._move(dx=-1)
+        elif char == u'\t':
+            self._tab()
+        elif char in u'\x1b\x84\x85\x8d\x9b':
+            # the start of a sequence that is not known.
+            self.invalidate()
+
+    def _text(self, text):
+        """Follow printable text, which may contain control characters or sequences not known."""
+        if _RE_PLAIN.match(text):
+            self._advance(text_width(text))
+            return
+        # sequences of no capability, as found by the 'regex' tokenizer within text, of which
+        # one incomplete at its end, such as a window title, is terminated by the next span.
+        match = _RE_INCOMPLETE.search(text, max(0, len(text) - 4096))
+        if match is not None:
+            text = text[:match.start()]
+        idx = 0
+        for match in _RE_ECMA48.finditer(text):
+            start = match.start()
+            if idx != start:
+                self._advance(text_width(text[idx:start]))
+            self._unknown(match.group())
+            idx = match.end()
+        if idx != len(text):
+            self._advance(text_width(text[idx:]))
+
+    def _unknown(self, text):
+        """Follow a control character or sequence of no capability."""
+        if len(text) == 1:
+            self._control(text)
+        elif _RE_UNKNOWN_MOVEMENT.match(text):
+            self.invalidate()
+
+    def _param(self, text, cap, index=0):
+        """Return parameter at ``index`` of sequence ``text`` of ``cap``, as a 0-based position."""
+        return int(_RE_DIGITS.findall(text)[index]) - self._offsets.get(cap.name, 0)
+
+    def _sequence(self, text, cap):
+        """Follow sequence ``text`` of capability ``cap``."""
+        # pylint: disable=too-many-branches
+        name = cap.name
+        if text == u'\n' or name == 'scroll_forward':
+            self._newline()
+        elif name == 'carriage_return':
+            self.x = 0
+        elif name in ('ascii_tab', 'tab'):
+            self._tab()
+        elif name in ('cursor_home', 'clear_screen'):
+            self.y, self.x = 0, 0
+        elif name == 'cursor_up':
+            self._move(dy=-1)
+        elif name == 'cursor_down':
+            self._move(dy=1)
+        elif name in ('parm_up_cursor', 'parm_down_cursor'):
+            self._move(dy=self._param(text, cap) * (-1 if name == 'parm_up_cursor' else 1))
+        elif name in ('cursor_address', 'row_address', 'column_address'):
+            height, columns = self._bounds
+            params = [max(0, self._param(text, cap, index))
+                      for index in range(2 if name == 'cursor_address' else 1)]
+            if name != 'column_address':
+                self.y = min(params[0], height - 1)
+            if name != 'row_address':
+                self.x = min(params[-1], columns - 1)
+        elif name == 'save_cursor':
+            self._saved = (self.y, self.x)
+        elif name == 'restore_cursor':
+            self.y, self.x = self._saved
+        elif name == 'unknown':
+            self._unknown(text)
+        elif name in ('enter_fullscreen', 'exit_fullscreen', 'enter_ca_mode', 'exit_ca_mode',
+                      'change_scroll_region'):
+            self.invalidate()
+        else:
+            distance = cap.horizontal_distance(text)
+            if distance:
+                self._move(dx=distance)
+            elif _RE_UNKNOWN_MOVEMENT.match(text):
+                self.invalidate()
+
+
+class _TrackingStream(object):
+    """File object that updates a :class:`CursorTracker` by each string written to ``stream``."""
+
+    def __init__(self, stream, tracker):
+        """
+        Class initializer.
+
+        :arg stream: File object written to.
+        :arg CursorTracker tracker: Model of the cursor updated.
+        """
+        self.stream = stream
+        self.tracker = tracker
+
+    def write(self, text):
+        """Write ``text`` to the stream, following its movement of the cursor."""
+        if isinstance(text, bytes):
+            self.tracker.update(text.decode('utf8', 'replace'))
+        else:
+            self.tracker.update(text)
+        return self.stream.write(text)
+
+    def __getattr__(self, attr):
+        return getattr(self.stream, attr)
@@ -0,0 +1,25 @@
+# std imports
+from typing import IO, Any, Tuple, Optional
+
+# local
+from .terminal import Terminal
+
+class CursorTracker:
+    sync_timeout: float
+    y: Optional[int]
+    x: Optional[int]
+    def __init__(
+        self, term: Terminal, y: Optional[int] = ..., x: Optional[int] = ...
+    ) -> None: ...
+    @property
+    def position(self) -> Optional[Tuple[int, int]]: ...
+    def sync(self, y: Optional[int], x: Optional[int]) -> None: ...
+    def invalidate(self) -> None: ...
+    def update(self, text: str) -> None: ...
+
+class _TrackingStream:
+    stream: IO[str]
+    tracker: CursorTracker
+    def __init__(self, stream: IO[str], tracker: CursorTracker) -> None: ...
+    def write(self, text: str) -> int: ...
+    def __getattr__(self, attr: str) -> Any: ...
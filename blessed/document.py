@@ -0,0 +1,253 @@
+"""
+Document of paragraphs wrapped lazily, and remembered for each of the widths most recently used.
+
+A view of a :class:`WrappedDocument` is positioned by paragraph, rather than by row of the whole
+document, so that when the terminal is resized, only the paragraphs of the new viewport are wrapped
+at the new width: the time taken depends on the size of the screen, rather than the document.
+"""
+# std imports
+import bisect
+import collections
+
+__all__ = ('WrappedDocument',)
+
+
+class _Layout(object):
+    """Wrapped lines and heights of the paragraphs of a :class:`WrappedDocument` at one width."""
+
+    # pylint: disable=too-few-public-methods
+    __slots__ = ('lines', 'heights', 'cumulative')
+
+    def __init__(self, count):
+        """
+        Class initializer.
+
+        :arg int count: number of paragraphs.
+        """
+        #: wrapped lines of each paragraph wrapped, by index.
+        self.lines = {}
+        #: number of wrapped lines of each paragraph, ``None`` until measured.
+        self.heights = [None] * count
+        #: first row of each paragraph, and of the end of the document, ``None`` until measured.
+        self.cumulative = None
+
+
+class WrappedDocument(object):
+    r"""
+    Paragraphs of text, of which wrapped lines are remembered for each width.
+
+    Each paragraph is wrapped by :meth:`~.Terminal.wrap` only when any of its lines are displayed,
+    and kept for each of the :attr:`maxwidths` most recently used widths:
+
+        >>> doc = WrappedDocument(term, paragraphs, subsequent_indent=u'  ')
+        >>> for line in doc.viewport(paragraph=120, offset=0, height=term.height - 1):
+        ...     print(line)
+
+    The width defaults to that of the terminal, so that a view drawn again after the terminal is
+    resized, such as by signal ``SIGWINCH``, wraps only the paragraphs that it displays.
+    """
+
+    def __init__(self, term, paragraphs=(), maxwidths=8, **kwargs):
+        r"""
+        Class initializer.
+
+        :arg blessed.Terminal term: :class:`~.Terminal` instance.
+        :arg paragraphs: Iterable of text of each paragraph, which may contain sequences.
+        :arg int maxwidths: Number of widths of which wrapped lines are kept.
+        :arg \**kwargs: See :py:class:`textwrap.TextWrapper`
+        """
+        self._term = term
+        self._paragraphs = list(paragraphs)
+        self._kwargs = kwargs
+        self._layouts = collections.OrderedDict()
+        #: Number of widths of which wrapped lines are kept, least recently used are discarded.
+        self.maxwidths = maxwidths
+
+    def __len__(self):
+        return len(self._paragraphs)
+
+    def __getitem__(self, index):
+        return self._paragraphs[index]
+
+    def __setitem__(self, index, text):
+        index = range(len(self._paragraphs))[index]
+        self._paragraphs[index] = text
+        for layout in self._layouts.values():
+            layout.lines.pop(index, None)
+            layout.heights[index] = None
+            layout.cumulative = None
+
+    def append(self, text):
+        """
+        Add paragraph ``text`` to the end of the document.
+
+        :arg str text: text of paragraph, which may contain sequences.
+        """
+        self._paragraphs.append(text)
+        for layout in self._layouts.values():
+            layout.heights.append(None)
+            layout.cumulative = None
+
+    def extend(self, paragraphs):
+        """
+        Add each of ``paragraphs`` to the end of the document.
+
+        :arg paragraphs: Iterable of text of each paragraph.
+        """
+        for text in paragraphs:
+            self.append(text)
+
+    @property
+    def widths(self):
+        """
+        Widths of which wrapped lines are kept, from least to most recently used.
+
+        :rtype: list
+        """
+        return list(self._layouts)
+
+    def _layout(self, width):
+        """Return :class:`_Layout` of ``width``, or of the terminal, as most recently used."""
+        width = self._term.width if width is None else width
+        layout = self._layouts.pop(width, None)
+        if layout is None:
+            layout = _Layout(len(self._paragraphs))
+            while self._layouts and len(self._layouts) >= self.maxwidths:
+                self._layouts.popitem(last=False)
+        self._layouts[width] = layout
+        return width, layout
+
+    def wrapped(self, index, width=None):
+        """
+        Return wrapped lines of paragraph at ``index``.
+
+        :arg int index: index of paragraph.
+        :arg int width: width of lines, default is the width of the terminal.
+        :rtype: list
+        """
+        width, layout = self._layout(width)
+        return self._wrapped(layout, index, width)
+
+    def _wrapped(self, layout, index, width):
+        """Return wrapped lines of paragraph at ``index``, as kept by ``layout``."""
+        lines = layout.lines.get(index)
+        if lines is None:
+            lines = layout.lines[index] = self._term.wrap(
+                self._paragraphs[index], width, **self._kwargs)
+            layout.heights[index] = len(lines)
+        return lines
+
+    def iter_lines(self, paragraph=0, offset=0, width=None):
+        """
+        Generator yields (paragraph, offset, line) of each wrapped line, beginning at a position.
+
+        :arg int paragraph: index of paragraph of the first line.
+        :arg int offset: index of the first line within its paragraph.
+        :arg int width: width of lines, default is the width of the terminal.
+        :rtype: Iterator[tuple(int, int, str)]
+
+        Each paragraph is wrapped only when its lines are consumed.
+        """
+        width, layout = self._layout(width)
+        for index in range(paragraph, len(self._paragraphs)):
+            lines = self._wrapped(layout, index, width)
+            for row in range(offset if index == paragraph else 0, len(lines)):
+                yield index, row, lines[row]
+
+    def viewport(self, paragraph, offset, height, width=None):
+        """
+        Return ``height`` wrapped lines, beginning at line ``offset`` of ``paragraph``.
+
+        :arg int paragraph: index of paragraph of the first line.
+        :arg int offset: index of the first line within its paragraph, which may exceed its
+            wrapped lines at a smaller width, such as after the terminal is resized: the position
+            is then that many lines from the start of the paragraph.
+        :arg int height: number of lines, fewer are returned at the end of the document.
+        :arg int width: width of lines, default is the width of the terminal.
+        :rtype: list
+        """
+        paragraph, offset = self.normalize(paragraph, offset, width)
+        lines = []
+        for _, _, line in self.iter_lines(paragraph, offset, width):
+            if len(lines) == height:
+                break
+            lines.append(line)
+        return lines
+
+    def normalize(self, paragraph, offset, width=None):
+        """
+        Return (paragraph, offset) of the line ``offset`` lines after the start of ``paragraph``.
+
+        :arg int paragraph: index of paragraph.
+        :arg int offset: number of lines after its start, may be negative, to find the position of
+            lines of the paragraphs before it.
+        :arg int width: width of lines, default is the width of the terminal.
+        :rtype: tuple(int, int)
+        :returns: position within the document, bounded by its start and end.
+        """
+        width, layout = self._layout(width)
+        count = len(self._paragraphs)
+        while offset < 0 and paragraph > 0:
+            paragraph -= 1
+            offset += len(self._wrapped(layout, paragraph, width))
+        if offset < 0 or not count:
+            return 0, 0
+        while paragraph < count - 1:
+            height = len(self._wrapped(layout, paragraph, width))
+            if offset < height:
+                break
+            paragraph, offset = paragraph + 1, offset - height
+        last = max(0, len(self._wrapped(layout, paragraph, width)) - 1) if count else 0
+        return paragraph, min(offset, last)
+
+    def _cumulative(self, width):
+        """Return layout of ``width``, of the first row of each paragraph measured."""
+        width, layout = self._layout(width)
+        if layout.cumulative is None:
+            rows, cumulative = 0, [0]
+            for index, height in enumerate(layout.heights):
+                if height is None:
+                    height = layout.heights[index] = self._term.measure(
+                        self._paragraphs[index], width, **self._kwargs)
+                rows += height
+                cumulative.append(rows)
+            layout.cumulative = cumulative
+        return layout
+
+    def height(self, width=None):
+        """
+        Return number of wrapped lines of the whole document.
+
+        :arg int width: width of lines, default is the width of the terminal.
+        :rtype: int
+
+        Paragraphs not yet wrapped at ``width`` are measured by :meth:`~.Terminal.measure`, such as
+        for the size of a scroll bar, without building their lines.
+        """
+        return self._cumulative(width).cumulative[-1]
+
+    def locate(self, row, width=None):
+        """
+        Return (paragraph, offset) of wrapped line ``row`` of the whole document.
+
+        :arg int row: index of wrapped line, bounded by the start and end of the document.
+        :arg int width: width of lines, default is the width of the terminal.
+        :rtype: tuple(int, int)
+        """
+        cumulative = self._cumulative(width).cumulative
+        if len(cumulative) == 1:
+            return 0, 0
+        row = max(0, min(row, cumulative[-1] - 1))
+        paragraph = bisect.bisect_right(cumulative, row) - 1
+        return paragraph, row - cumulative[paragraph]
+
+    def row(self, paragraph, offset=0, width=None):
+        """
+        Return index of wrapped line of the whole document, at line ``offset`` of ``paragraph``.
+
+        :arg int paragraph: index of paragraph.
+        :arg int offset: index of line within the paragraph.
+        :arg int width: width of lines, default is the width of the terminal.
+        :rtype: int
+        """
+        return self._cumulative(width).cumulative[paragraph] + offset
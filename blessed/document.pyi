@@ -0,0 +1,35 @@
+# std imports
+from typing import Any, List, Tuple, Iterable, Iterator, Optional
+
+# local
+from .terminal import Terminal
+
+class WrappedDocument:
+    maxwidths: int = ...
+    def __init__(
+        self,
+        term: Terminal,
+        paragraphs: Iterable[str] = ...,
+        maxwidths: int = ...,
+        **kwargs: Any
+    ) -> None: ...
+    def __len__(self) -> int: ...
+    def __getitem__(self, index: int) -> str: ...
+    def __setitem__(self, index: int, text: str) -> None: ...
+    def append(self, text: str) -> None: ...
+    def extend(self, paragraphs: Iterable[str]) -> None: ...
+    @property
+    def widths(self) -> List[int]: ...
+    def wrapped(self, index: int, width: Optional[int] = ...) -> List[str]: ...
+    def iter_lines(
+        self, paragraph: int = ..., offset: int = ..., width: Optional[int] = ...
+    ) -> Iterator[Tuple[int, int, str]]: ...
+    def viewport(
+        self, paragraph: int, offset: int, height: int, width: Optional[int] = ...
+    ) -> List[str]: ...
+    def normalize(
+        self, paragraph: int, offset: int, width: Optional[int] = ...
+    ) -> Tuple[int, int]: ...
+    def height(self, width: Optional[int] = ...) -> int: ...
+    def locate(self, row: int, width: Optional[int] = ...) -> Tuple[int, int]: ...
+    def row(self, paragraph: int, offset: int = ..., width: Optional[int] = ...) -> int: ...
@@ -6,6 +6,7 @@ import platform
 import six
 
 # local
+from blessed._tparm import tparm
 from blessed.colorspace import CGA_COLORS, X11_COLORNAMES_TO_RGB
 
 # isort: off
@@ -47,6 +48,12 @@ COLORS = _make_colors()
 #: 'reverse_indigo'.
 COMPOUNDABLES = set('bold underline reverse blink italic standout'.split())
 
+#: Maximum number of results of :class:`ParameterizingString` remembered.
+_RESULTS_MAXSIZE = 4096
+
+#: Most recent results of :class:`ParameterizingString`, by capability, normal, and arguments.
+_RESULTS = {}
+
 
 class ParameterizingString(six.text_type):
     r"""
@@ -87,13 +94,22 @@ class ParameterizingString(six.text_type):
         :raises curses.error: :func:`curses.tparm` raised an exception
         :rtype: :class:`FormattingString` or :class:`NullCallableString`
         :returns: Callable string for given parameters
+
+        The capability is evaluated by a function compiled once for each capability, with the
+        same result as :func:`curses.tparm`, and the most recent results are remembered.
         """
+        # only results of arguments of exactly int are remembered, 1.0 and True are equal keys.
+        key = (self, self._normal, args)
+        remembered = all(type(arg) is int for arg in args)  # pylint: disable=unidiomatic-typecheck
+        if remembered and key in _RESULTS:
+            return _RESULTS[key]
         try:
-            # Re-encode the cap, because tparm() takes a bytestring in Python
-            # 3. However, appear to be a plain Unicode string otherwise so
-            # concats work.
-            attr = curses.tparm(self.encode('latin1'), *args).decode('latin1')
-            return FormattingString(attr, self._normal)
+            result = FormattingString(tparm(self, *args), self._normal)
+            if remembered:
+                if len(_RESULTS) >= _RESULTS_MAXSIZE:
+                    _RESULTS.clear()
+                _RESULTS[key] = result
+            return result
         except TypeError as err:
             # If the first non-int (i.e. incorrect) arg was a string, suggest
             # something intelligent:
@@ -0,0 +1,290 @@
+"""Sequence-aware processing of large files and documents by a pool of processes."""
+# std imports
+import io
+import os
+import mmap
+import stat
+import locale
+import collections
+import multiprocessing
+
+# 3rd party
+import six
+
+# local
+from .sequences import Termcap, SequenceTextWrapper, strip_seqs_bytes
+
+__all__ = ('CapabilityTerminal', 'strip_seqs_file', 'wrap_parallel')
+
+#: Default size, in bytes, of each chunk of a file given to a process, extended to the end of its
+#: last line.
+CHUNK_SIZE = 1 << 24
+
+#: Default number of characters of each chunk of whole lines given to a process by
+#: :func:`wrap_parallel`.
+WRAP_CHUNK_SIZE = 1 << 18
+
+#: State of each process of the pool, set by :func:`_init_worker` or :func:`_init_wrap_worker`.
+_WORKER = {}
+
+
+class CapabilityTerminal(object):
+    """
+    Picklable stand-in of a :class:`~.Terminal`, of only what is needed to recognize its sequences.
+
+    It is given to each process of a pool by :func:`wrap_parallel` and :func:`strip_seqs_file`, in
+    place of a :class:`~.Terminal`, which is not picklable, and would set up curses again in each
+    process.
+    Any function of :mod:`blessed.sequences` that is given a terminal only to find its sequences,
+    such as :class:`~.Sequence` or :class:`~.SequenceTextWrapper`, may be given this instead.
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, term):
+        """
+        Class initializer.
+
+        :arg blessed.Terminal term: :class:`~.Terminal` instance, of which capabilities are copied.
+        """
+        # pylint: disable=protected-access
+        #: :class:`~.Termcap` of each capability, by name, as :attr:`~.Terminal.caps`.
+        self.caps = collections.OrderedDict(
+            (name, Termcap(cap.name, cap.pattern, cap.attribute))
+            for name, cap in term.caps.items())
+        #: Tokenizer of sequences, as :attr:`~.Terminal.sequence_tokenizer`.
+        self.sequence_tokenizer = term.sequence_tokenizer
+        #: Sequence that resets all attributes, as :attr:`~.Terminal.normal`.
+        self.normal = term.normal
+        self._caps_compiled_runs = term._caps_compiled_runs
+        self._caps_compiled_full = None
+        self._caps_resolved = {}
+        self._caps_compiled_bytes = {}
+
+
+def _strip_chunk(term, data, encoding):
+    """
+    Return chunk ``data`` of whole lines stripped of sequences, each line ending by a newline.
+
+    :arg blessed.Terminal term: :class:`~.Terminal` instance.
+    :arg bytes data: chunk of a file.
+    :arg str encoding: encoding of ``data``.
+    :rtype: bytes
+    """
+    if data and not data.endswith(b'\n'):
+        # only the final chunk of a file may end without newline, as by print() of each line.
+        data += b'\n'
+    return strip_seqs_bytes(term, data, encoding)
+
+
+def _iter_chunks(data, size, chunk_size):
+    """
+    Generator yields (start, end) of chunks of ``data``, each of whole lines.
+
+    :arg data: file contents, such as :class:`mmap.mmap`.
+    :arg int size: length of ``data``.
+    :arg int chunk_size: minimum size of each chunk, but the last.
+    """
+    start = 0
+    while start < size:
+        end = data.find(b'\n', start + max(chunk_size, 1) - 1)
+        end = size if end == -1 else end + 1
+        yield start, end
+        start = end
+
+
+def _iter_stream_chunks(stream, chunk_size):
+    """
+    Generator yields chunks of whole lines read from ``stream``, such as a pipe.
+
+    :arg stream: file object opened for reading bytes.
+    :arg int chunk_size: size of each read.
+    """
+    pending = b''
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            break
+        data = pending + data
+        end = data.rfind(b'\n') + 1
+        pending = data[end:]
+        if end:
+            yield data[:end]
+    if pending:
+        yield pending
+
+
+def _init_worker(term, encoding, path):
+    """
+    Initialize a process of the pool with a terminal, encoding, and mapping of ``path``.
+
+    :arg CapabilityTerminal term: capabilities of the terminal.
+    :arg str encoding: encoding of the file.
+    :arg str path: path of file to map.
+    """
+    with io.open(path, 'rb') as fobj:
+        _WORKER['data'] = mmap.mmap(fobj.fileno(), 0, access=mmap.ACCESS_READ)
+    _WORKER['term'] = term
+    _WORKER['encoding'] = encoding
+
+
+def _strip_worker_chunk(bounds):
+    """Return chunk at (start, end) ``bounds`` of the mapped file of this process, stripped."""
+    start, end = bounds
+    return _strip_chunk(_WORKER['term'], _WORKER['data'][start:end], _WORKER['encoding'])
+
+
+def strip_seqs_file(term, infile, outfile, processes=None, chunk_size=CHUNK_SIZE,
+                    encoding=None):
+    """
+    Write contents of ``infile`` to ``outfile``, stripped of terminal sequences.
+
+    :arg blessed.Terminal term: :class:`~.Terminal` instance.
+    :arg infile: file object opened for reading bytes, such as ``sys.stdin.buffer``.
+    :arg outfile: file object opened for writing bytes, such as ``sys.stdout.buffer``.
+    :arg int processes: Number of processes used to strip a regular file, default is the number
+        of CPUs. The file is processed only by the current process when *1*, or when it is not
+        found by the name of ``infile``.
+    :arg int chunk_size: Size in bytes of each chunk of the file stripped at once.
+    :arg str encoding: encoding of ``infile``, written unchanged to ``outfile``, default is that of
+        the locale, as of :data:`sys.stdin`.
+    :raises ValueError: ``encoding`` is not compatible with ASCII, such as ``'utf-16'``.
+
+    Each line is stripped as by :meth:`~.Terminal.strip_seqs`, and written followed by a
+    newline, as by :func:`print` of each line of :data:`sys.stdin`.
+
+    A regular file is mapped to memory by :mod:`mmap` and split into chunks of whole lines,
+    stripped by :func:`~.sequences.strip_seqs_bytes` in a pool of ``processes``, and written in
+    order. Any other file, such as a pipe, is read and stripped by chunks of whole lines by the
+    current process.
+    """
+    if encoding is None:
+        encoding = locale.getpreferredencoding(False)
+    if u'\x1b[m\r\n'.encode(encoding) != b'\x1b[m\r\n':
+        raise ValueError('encoding is not compatible with ASCII: {0!r}'.format(encoding))
+    try:
+        fileno = infile.fileno()
+        is_regular = stat.S_ISREG(os.fstat(fileno).st_mode)
+    except (AttributeError, OSError, ValueError):
+        is_regular = False
+
+    if not is_regular:
+        for data in _iter_stream_chunks(infile, chunk_size):
+            outfile.write(_strip_chunk(term, data, encoding))
+        return
+
+    size = os.fstat(fileno).st_size
+    if not size:
+        return
+    data = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    try:
+        chunks = list(_iter_chunks(data, size, chunk_size))
+        path = getattr(infile, 'name', None)
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        if (processes < 2 or len(chunks) < 2 or not isinstance(path, six.string_types)
+                or not os.path.isfile(path)):
+            for start, end in chunks:
+                outfile.write(_strip_chunk(term, data[start:end], encoding))
+            return
+
+        pool = multiprocessing.Pool(
+            min(processes, len(chunks)), _init_worker, (CapabilityTerminal(term), encoding, path))
+        try:
+            for result in pool.imap(_strip_worker_chunk, chunks):
+                outfile.write(result)
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+    finally:
+        data.close()
+
+
+def _wrap_lines(wrapper, lines):
+    """
+    Return wrapped lines of each of ``lines``, as by :meth:`~.Terminal.wrap`.
+
+    :arg SequenceTextWrapper wrapper: text wrapper.
+    :arg list lines: lines of text, without line endings.
+    :rtype: list
+    """
+    result = []
+    for line in lines:
+        result.extend(wrapper.wrap(line) if line.strip() else (u'',))
+    return result
+
+
+def _iter_line_chunks(lines, chunk_size):
+    """
+    Generator yields lists of whole lines of ``lines``, each of at least ``chunk_size`` characters.
+
+    :arg lines: iterable of text, any line ending of each is removed, and an item of several lines
+        is split.
+    :arg int chunk_size: minimum number of characters of each chunk, but the last.
+    """
+    chunk, size = [], 0
+    for item in lines:
+        for line in item.splitlines() or (u'',):
+            chunk.append(line)
+            size += len(line) + 1
+        if size >= chunk_size:
+            yield chunk
+            chunk, size = [], 0
+    if chunk:
+        yield chunk
+
+
+def _init_wrap_worker(term, width, kwargs):
+    """
+    Initialize a process of the pool with its own text wrapper.
+
+    :arg CapabilityTerminal term: stand-in of the terminal.
+    :arg int width: width of wrapped lines.
+    :arg dict kwargs: keyword arguments of :class:`textwrap.TextWrapper`.
+    """
+    _WORKER['wrapper'] = SequenceTextWrapper(width=width, term=term, **kwargs)
+
+
+def _wrap_worker_chunk(lines):
+    """Return wrapped lines of each of ``lines``, by the text wrapper of this process."""
+    return _wrap_lines(_WORKER['wrapper'], lines)
+
+
+def wrap_parallel(term, text, width=None, processes=None, chunk_size=WRAP_CHUNK_SIZE, **kwargs):
+    r"""
+    Text-wrap a large document by a pool of processes, returning a list of wrapped lines.
+
+    :arg blessed.Terminal term: :class:`~.Terminal` instance.
+    :arg text: text of the document, or an iterable of its lines, such as a file object.
+    :arg int width: width of wrapped lines, default is the width of the attached terminal.
+    :arg int processes: Number of processes, default is the number of CPUs. The document is
+        wrapped only by the current process when *1*, or when it is of only a single chunk.
+    :arg int chunk_size: Number of characters of whole lines wrapped by each task of the pool.
+    :arg \**kwargs: See :py:class:`textwrap.TextWrapper`
+    :rtype: list
+    :returns: Wrapped lines, as by :meth:`~.Terminal.wrap`.
+
+    The document is split into chunks of whole lines, each wrapped by a process of the pool that
+    is given only a :class:`CapabilityTerminal`, and the wrapped lines of each chunk are joined in
+    order.
+    """
+    lines = text.splitlines() if isinstance(text, six.string_types) else text
+    width = term.width if width is None else width
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    if processes > 1:
+        chunks = list(_iter_line_chunks(lines, chunk_size))
+        if len(chunks) > 1:
+            pool = multiprocessing.Pool(min(processes, len(chunks)), _init_wrap_worker,
+                                        (CapabilityTerminal(term), width, kwargs))
+            try:
+                result = []
+                for wrapped in pool.imap(_wrap_worker_chunk, chunks):
+                    result.extend(wrapped)
+                pool.close()
+            finally:
+                pool.terminate()
+                pool.join()
+            return result
+        lines = chunks[0] if chunks else ()
+    return list(term.iter_wrap(lines, width, **kwargs))
@@ -0,0 +1,33 @@
+# std imports
+from typing import IO, Any, Dict, List, Union, Iterable, Optional
+
+# local
+from .sequences import Termcap
+from .terminal import Terminal
+
+CHUNK_SIZE: int
+WRAP_CHUNK_SIZE: int
+
+class CapabilityTerminal:
+    caps: Dict[str, Termcap]
+    sequence_tokenizer: str
+    normal: str
+    def __init__(self, term: Terminal) -> None: ...
+
+def strip_seqs_file(
+    term: Terminal,
+    infile: IO[bytes],
+    outfile: IO[bytes],
+    processes: Optional[int] = ...,
+    chunk_size: int = ...,
+    encoding: Optional[str] = ...,
+) -> None: ...
+
+def wrap_parallel(
+    term: Terminal,
+    text: Union[str, Iterable[str]],
+    width: Optional[int] = ...,
+    processes: Optional[int] = ...,
+    chunk_size: int = ...,
+    **kwargs: Any
+) -> List[str]: ...
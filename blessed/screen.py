@@ -0,0 +1,593 @@
+r"""
+In-memory model of a terminal screen, for rendering output without a terminal.
+
+A :class:`Screen` is given as the ``stream`` of a :class:`~.Terminal`, so that everything written
+to it is interpreted as by a terminal emulator of the VT100 family, such as xterm, into a grid of
+cells, each of a character and its :class:`CellStyle`:
+
+    >>> screen = Screen(height=5, width=20)
+    >>> term = Terminal(kind='xterm-256color', stream=screen, force_styling=True)
+    >>> print(term.move_yx(1, 2) + term.bold_red(u'hello'), end=u'', file=term.stream)
+    >>> screen.line(1)
+    u'  hello             '
+    >>> screen.cell(1, 2)
+    Cell(char=u'h', style=CellStyle(bold=True, ..., fg=1, bg=None))
+
+Supported are printable text of any width, with automatic wrap at the right margin, control
+characters, cursor movement, erasing and insertion of characters and lines, scrolling regions,
+saving and restoring of the cursor, the alternate screen, and all attributes and colors of Select
+Graphic Rendition (SGR). Sequences are found by the ECMA-48 grammar, as by the ``'ecma48'``
+:attr:`~.Terminal.sequence_tokenizer`, and any not supported are ignored.
+"""
+# std imports
+import re
+import collections
+
+# local
+from ._width import is_narrow, iter_graphemes
+from .sequences import _RE_ECMA48, _RE_INCOMPLETE
+
+__all__ = ('Cell', 'CellStyle', 'Screen')
+
+#: Attributes and colors of a cell. Colors ``fg`` and ``bg`` are ``None`` for the default color,
+#: an :class:`int` of 0 through 255 for a color of the 256-color palette, or a tuple of (red, green,
+#: blue) for a 24-bit color.
+CellStyle = collections.namedtuple('CellStyle', (
+    'bold', 'dim', 'italic', 'underline', 'blink', 'reverse', 'invisible', 'strike', 'fg', 'bg'))
+
+#: Style of cells without any attributes, of default colors.
+DEFAULT_STYLE = CellStyle(False, False, False, False, False, False, False, False, None, None)
+
+#: A character of the screen, and its :class:`CellStyle`. The character is ``u''`` for the cell
+#: following a wide character, and may be more than one character for a grapheme cluster.
+Cell = collections.namedtuple('Cell', ('char', 'style'))
+
+#: Matches the parameters and final byte of a control sequence.
+_RE_CSI = re.compile(u'(?:\x1b\\[|\x9b)([\x30-\x3f]*)[\x20-\x2f]*([\x40-\x7e])')
+
+#: Matches parameters of SGR of only a single 24-bit or 256-palette color.
+_RE_SGR_COLOR = re.compile(r'([34])8;(?:2;(\d+);(\d+);(\d+)|5;(\d+))\Z')
+
+#: Attributes set by each parameter of SGR, by the field of :class:`CellStyle` and its value.
+_SGR_ATTRIBUTES = {
+    1: (('bold', True),),
+    2: (('dim', True),),
+    3: (('italic', True),),
+    4: (('underline', True),),
+    5: (('blink', True),),
+    6: (('blink', True),),
+    7: (('reverse', True),),
+    8: (('invisible', True),),
+    9: (('strike', True),),
+    21: (('underline', True),),
+    22: (('bold', False), ('dim', False)),
+    23: (('italic', False),),
+    24: (('underline', False),),
+    25: (('blink', False),),
+    27: (('reverse', False),),
+    28: (('invisible', False),),
+    29: (('strike', False),),
+    39: (('fg', None),),
+    49: (('bg', None),),
+}
+
+#: Maximum number of transitions of style by SGR remembered by each :class:`Screen`.
+_SGR_CACHE_MAXSIZE = 4096
+
+#: Tab stops are at every 8th column.
+_TABSIZE = 8
+
+
+def _apply_sgr(style, params):
+    """
+    Return :class:`CellStyle` of ``style`` changed by the parameters of a sequence of SGR.
+
+    :arg CellStyle style: current style.
+    :arg str params: parameters of the sequence, such as ``u'1;38;5;196'``, or ``u''`` for reset.
+    :rtype: CellStyle
+    """
+    # pylint: disable=too-many-branches,protected-access
+    match = _RE_SGR_COLOR.match(params)
+    if match is not None:
+        # the most frequent, a single color, as of term.color_rgb(), or term.on_color(n)
+        layer, red, green, blue, index = match.groups()
+        color = int(index) if index is not None else (int(red), int(green), int(blue))
+        return style._replace(**{'fg' if layer == u'3' else 'bg': color})
+
+    values = []
+    for param in params.split(u';'):
+        if param.isdigit():
+            values.append(int(param))
+        elif u':' in param:
+            # sub-parameters of an extended color, '38:2::255:0:0' or '38:5:196'
+            subparams = [int(sub) if sub.isdigit() else 0 for sub in param.split(u':')]
+            if len(subparams) > 5 and subparams[1] == 2:
+                del subparams[2]
+            values.append(subparams)
+        else:
+            values.append(0)
+
+    changes = {}
+    idx, count = 0, len(values)
+    while idx < count:
+        value, extended = values[idx], None
+        idx += 1
+        if isinstance(value, list):
+            value, extended = value[0], value[1:]
+        if value == 0:
+            style, changes = DEFAULT_STYLE, {}
+        elif value in (38, 48):
+            if extended is None:
+                # parameters following, '38;5;196' or '38;2;255;0;0'
+                extended = values[idx:idx + 4]
+                idx += 2 if extended[:1] == [5] else 4
+            color = None
+            if extended[:1] == [5] and len(extended) > 1:
+                color = extended[1]
+            elif extended[:1] == [2] and len(extended) > 3:
+                color = tuple(extended[1:4])
+            changes['fg' if value == 38 else 'bg'] = color
+        elif 30 <= value <= 37 or 90 <= value <= 97:
+            changes['fg'] = value - 30 if value < 90 else value - 82
+        elif 40 <= value <= 47 or 100 <= value <= 107:
+            changes['bg'] = value - 40 if value < 100 else value - 92
+        else:
+            changes.update(_SGR_ATTRIBUTES.get(value, ()))
+    return style._replace(**changes) if changes else style
+
+
+class Screen(object):
+    """
+    Grid of cells of a terminal screen, written as the ``stream`` of a :class:`~.Terminal`.
+
+    Each row is a pair of lists, of the characters of its cells, and of their :class:`CellStyle`.
+    A newline also returns the carriage, as by the ``ONLCR`` output mode of a terminal, unless
+    ``onlcr`` is ``False``.
+
+    The size of the screen is the size of a :class:`~.Terminal` of which it is the ``stream``.
+    """
+
+    def __init__(self, height=24, width=80, onlcr=True):
+        """
+        Class initializer.
+
+        :arg int height: Number of rows.
+        :arg int width: Number of columns.
+        :arg bool onlcr: Whether a newline also returns the carriage.
+        """
+        assert height > 0 and width > 0, (height, width)
+        self._height, self._width = height, width
+        self.onlcr = onlcr
+        self._sgr_cache = {}
+        self.reset()
+
+    def reset(self):
+        """Clear the screen, and reset the cursor, style, and modes, as by ``'\\x1bc'``."""
+        # pylint: disable=attribute-defined-outside-init
+        self._chars, self._styles = self._blank_rows(self._height, DEFAULT_STYLE)
+        self._primary = None
+        self._style = DEFAULT_STYLE
+        self._y = self._x = 0
+        self._wrap_pending = False
+        self._saved = (0, 0, DEFAULT_STYLE)
+        self._top, self._bottom = 0, self._height - 1
+        self._pending = u''
+        #: Whether text is wrapped at the right margin, set by DEC private mode 7.
+        self.autowrap = True
+        #: Whether the cursor is visible, set by DEC private mode 25.
+        self.cursor_visible = True
+
+    def _blank_rows(self, count, style):
+        """Return (chars, styles) of ``count`` blank rows of ``style``."""
+        width = self._width
+        return ([[u' '] * width for _ in range(count)],
+                [[style] * width for _ in range(count)])
+
+    @property
+    def height(self):
+        """Number of rows of the screen."""
+        return self._height
+
+    @property
+    def width(self):
+        """Number of columns of the screen."""
+        return self._width
+
+    @property
+    def cursor(self):
+        """
+        Cursor position as (y, x).
+
+        :rtype: tuple
+        """
+        return self._y, self._x
+
+    @property
+    def style(self):
+        """
+        Style of text written next.
+
+        :rtype: CellStyle
+        """
+        return self._style
+
+    @property
+    def alternate(self):
+        """Whether the alternate screen is displayed."""
+        return self._primary is not None
+
+    def resize(self, height, width):
+        """
+        Change the size of the screen, keeping the top-left of its contents.
+
+        :arg int height: Number of rows.
+        :arg int width: Number of columns.
+        """
+        assert height > 0 and width > 0, (height, width)
+        for chars, styles in ((self._chars, self._styles), self._primary or ([], [])):
+            for row in chars:
+                row[width:] = []
+                row.extend([u' '] * (width - len(row)))
+            for row in styles:
+                row[width:] = []
+                row.extend([DEFAULT_STYLE] * (width - len(row)))
+            del chars[height:], styles[height:]
+            chars.extend([u' '] * width for _ in range(height - len(chars)))
+            styles.extend([DEFAULT_STYLE] * width for _ in range(height - len(styles)))
+        self._height, self._width = height, width
+        self._top, self._bottom = 0, height - 1
+        self._y, self._x = min(self._y, height - 1), min(self._x, width - 1)
+        self._wrap_pending = False
+
+    def line(self, y):
+        """
+        Return the characters of row ``y``.
+
+        :arg int y: Row, counted from 0.
+        :rtype: str
+        """
+        return u''.join(self._chars[y])
+
+    @property
+    def display(self):
+        """
+        Characters of each row.
+
+        :rtype: list
+        """
+        return [u''.join(row) for row in self._chars]
+
+    def cell(self, y, x):
+        """
+        Return :class:`Cell` at row ``y`` and column ``x``.
+
+        :arg int y: Row, counted from 0.
+        :arg int x: Column, counted from 0.
+        :rtype: Cell
+        """
+        return Cell(self._chars[y][x], self._styles[y][x])
+
+    def __str__(self):
+        return u'\n'.join(self.display)
+
+    # stream interface
+
+    def write(self, text):
+        """
+        Interpret ``text`` as output to a terminal.
+
+        :arg str text: Output, of any length. An incomplete sequence at its end is kept until
+            completed by the following output.
+        """
+        text = self._pending + text
+        match = _RE_INCOMPLETE.search(text, max(0, len(text) - 4096))
+        if match is not None:
+            text, self._pending = text[:match.start()], text[match.start():]
+        else:
+            self._pending = u''
+        idx = 0
+        sgr_cache = self._sgr_cache
+        for match in _RE_ECMA48.finditer(text):
+            start = match.start()
+            if idx != start:
+                self._text(text[idx:start])
+            sequence = match.group()
+            # a sequence of SGR applied to the current style before, as most are.
+            style = sgr_cache.get((self._style, sequence))
+            if style is None:
+                self._sequence(sequence)
+            else:
+                self._style = style
+            idx = match.end()
+        if idx != len(text):
+            self._text(text[idx:])
+
+    def flush(self):
+        """Do nothing, all output is interpreted when written."""
+
+    # printable text
+
+    def _text(self, text):
+        """Write printable ``text`` at the cursor, in the current style."""
+        if len(text) == 1 and not self._wrap_pending and u' ' <= text <= u'~':
+            y, x = self._y, self._x
+            chars = self._chars[y]
+            if chars[x] != u'' and (x + 1 == self._width or chars[x + 1] != u''):
+                chars[x], self._styles[y][x] = text, self._style
+                if x + 1 == self._width:
+                    self._wrap_pending = self.autowrap
+                else:
+                    self._x = x + 1
+                return
+        if not is_narrow(text):
+            for grapheme, width in iter_graphemes(text):
+                self._grapheme(grapheme, width)
+            return
+        width, style = self._width, self._style
+        while text:
+            if self._wrap_pending:
+                self._wrap()
+            y, x = self._y, self._x
+            count = min(len(text), width - x)
+            chars = self._chars[y]
+            if chars[x] == u'' and x:
+                # overwrites the second cell of a wide character.
+                chars[x - 1] = u' '
+            chars[x:x + count] = text[:count]
+            self._styles[y][x:x + count] = [style] * count
+            x += count
+            if x < width and chars[x] == u'':
+                chars[x] = u' '
+            text = text[count:]
+            if x == width:
+                self._x = width - 1
+                self._wrap_pending = self.autowrap
+            else:
+                self._x = x
+
+    def _grapheme(self, grapheme, width):
+        """Write a single ``grapheme`` of given ``width`` at the cursor."""
+        if not width:
+            # combined with the preceding character
+            y, x = self._y, self._x
+            if not self._wrap_pending:
+                x -= 1
+            if x >= 0:
+                if self._chars[y][x] == u'' and x:
+                    x -= 1
+                self._chars[y][x] += grapheme
+            return
+        if self._wrap_pending or (width == 2 and self._x == self._width - 1):
+            if self.autowrap:
+                self._wrap()
+            elif width == 2:
+                return
+        y, x = self._y, self._x
+        chars, styles = self._chars[y], self._styles[y]
+        if chars[x] == u'' and x:
+            chars[x - 1] = u' '
+        chars[x], styles[x] = grapheme, self._style
+        if width == 2:
+            chars[x + 1], styles[x + 1] = u'', self._style
+        if x + width < self._width and chars[x + width] == u'':
+            chars[x + width] = u' '
+        if x + width == self._width:
+            self._wrap_pending = self.autowrap
+        else:
+            self._x = x + width
+
+    def _wrap(self):
+        """Move to the start of the next line, when text is written beyond the right margin."""
+        self._wrap_pending = False
+        self._x = 0
+        self._index()
+
+    # movement
+
+    def _index(self):
+        """Move down one line, scrolling the region at its bottom margin."""
+        if self._y == self._bottom:
+            self._scroll_up(1)
+        elif self._y < self._height - 1:
+            self._y += 1
+
+    def _reverse_index(self):
+        """Move up one line, scrolling the region at its top margin."""
+        if self._y == self._top:
+            self._scroll_down(1)
+        elif self._y > 0:
+            self._y -= 1
+
+    def _move_to(self, y=None, x=None):
+        """Move to row ``y`` and column ``x``, counted from 0, either may be ``None``."""
+        self._wrap_pending = False
+        if y is not None:
+            self._y = max(0, min(y, self._height - 1))
+        if x is not None:
+            self._x = max(0, min(x, self._width - 1))
+
+    def _move_vertical(self, distance):
+        """Move by ``distance`` rows, stopping at the margin of the scrolling region."""
+        y = self._y
+        if distance < 0:
+            self._move_to(y=max(y + distance, self._top if y >= self._top else 0))
+        else:
+            self._move_to(y=min(y + distance, self._bottom if y <= self._bottom else
+                                self._height - 1))
+
+    # erasing and scrolling
+
+    def _blank_style(self):
+        """Return style of erased cells, of the current background color."""
+        if self._style.bg is None:
+            return DEFAULT_STYLE
+        return DEFAULT_STYLE._replace(bg=self._style.bg)
+
+    def _erase(self, y, start, end):
+        """Erase columns ``start`` to ``end`` of row ``y``."""
+        chars, styles = self._chars[y], self._styles[y]
+        if end < self._width and chars[end] == u'':
+            chars[end] = u' '
+        if start and chars[start] == u'':
+            chars[start - 1] = u' '
+        chars[start:end] = [u' '] * (end - start)
+        styles[start:end] = [self._blank_style()] * (end - start)
+
+    def _scroll_up(self, count, top=None):
+        """Scroll rows ``top`` to bottom margin up by ``count``, blank rows enter the bottom."""
+        top = self._top if top is None else top
+        bottom = self._bottom + 1
+        count = min(count, bottom - top)
+        chars, styles = self._blank_rows(count, self._blank_style())
+        self._chars[top:bottom] = self._chars[top + count:bottom] + chars
+        self._styles[top:bottom] = self._styles[top + count:bottom] + styles
+
+    def _scroll_down(self, count, top=None):
+        """Scroll rows ``top`` to bottom margin down by ``count``, blank rows enter the top."""
+        top = self._top if top is None else top
+        bottom = self._bottom + 1
+        count = min(count, bottom - top)
+        chars, styles = self._blank_rows(count, self._blank_style())
+        self._chars[top:bottom] = chars + self._chars[top:bottom - count]
+        self._styles[top:bottom] = styles + self._styles[top:bottom - count]
+
+    # sequences
+
+    def _sequence(self, text):
+        """Interpret a single control character or sequence."""
+        # pylint: disable=too-many-branches
+        if len(text) == 1:
+            char = text
+            if char in u'\n\x0b\x0c\x84\x85':
+                self._wrap_pending = False
+                self._index()
+                if (self.onlcr and char == u'\n') or char == u'\x85':
+                    self._x = 0
+            elif char == u'\r':
+                self._move_to(x=0)
+            elif char == u'\b':
+                self._move_to(x=self._x - 1)
+            elif char == u'\t':
+                self._move_to(x=self._x + _TABSIZE - self._x % _TABSIZE)
+            elif char == u'\x8d':
+                self._reverse_index()
+            return
+        match = _RE_CSI.match(text)
+        if match is not None:
+            self._control_sequence(text, *match.groups())
+            return
+        final = text[-1]
+        if len(text) != 2:
+            # control strings, such as window titles, and character set designations.
+            return
+        if final == u'7':
+            self._saved = (self._y, self._x, self._style)
+        elif final == u'8':
+            y, x, self._style = self._saved
+            self._move_to(y, x)
+        elif final in u'DE':
+            self._sequence(u'\x84' if final == u'D' else u'\x85')
+        elif final == u'M':
+            self._reverse_index()
+        elif final == u'c':
+            self.reset()
+
+    def _control_sequence(self, text, params, final):
+        """Interpret control sequence ``text`` of ``params`` and ``final`` byte."""
+        # pylint: disable=too-many-branches,too-many-statements
+        if final == u'm':
+            if len(self._sgr_cache) >= _SGR_CACHE_MAXSIZE:
+                self._sgr_cache.clear()
+            style = self._sgr_cache[(self._style, text)] = _apply_sgr(self._style, params)
+            self._style = style
+            return
+        if params[:1] in (u'?', u'>', u'<', u'='):
+            if final in u'hl':
+                self._private_modes(params[1:], final == u'h')
+            return
+        args = [int(arg) if arg.isdigit() else 0 for arg in params.split(u';')]
+        num = args[0] or 1
+        y, x = self._y, self._x
+        if final == u'A':
+            self._move_vertical(-num)
+        elif final in u'Be':
+            self._move_vertical(num)
+        elif final in u'Ca':
+            self._move_to(x=x + num)
+        elif final == u'D':
+            self._move_to(x=x - num)
+        elif final in u'EF':
+            self._move_vertical(num if final == u'E' else -num)
+            self._move_to(x=0)
+        elif final in u'G`':
+            self._move_to(x=num - 1)
+        elif final == u'd':
+            self._move_to(y=num - 1)
+        elif final in u'Hf':
+            self._move_to(num - 1, ((args[1] if len(args) > 1 else 0) or 1) - 1)
+        elif final == u'J':
+            if args[0] in (0, 1):
+                self._erase(y, *((x, self._width) if args[0] == 0 else (0, x + 1)))
+                rows = range(y + 1, self._height) if args[0] == 0 else range(y)
+            else:
+                rows = range(self._height)
+            for row in rows:
+                self._erase(row, 0, self._width)
+        elif final == u'K':
+            self._erase(y, *{0: (x, self._width), 1: (0, x + 1)}.get(args[0], (0, self._width)))
+        elif final in u'LM':
+            if self._top <= y <= self._bottom:
+                if final == u'L':
+                    self._scroll_down(num, top=y)
+                else:
+                    self._scroll_up(num, top=y)
+                self._move_to(x=0)
+        elif final in u'P@':
+            num = min(num, self._width - x)
+            chars, styles = self._chars[y], self._styles[y]
+            if final == u'P':
+                del chars[x:x + num], styles[x:x + num]
+                chars.extend([u' '] * num)
+                styles.extend([self._blank_style()] * num)
+            else:
+                chars[x:x] = [u' '] * num
+                styles[x:x] = [self._blank_style()] * num
+                del chars[self._width:], styles[self._width:]
+            self._wrap_pending = False
+        elif final == u'X':
+            self._erase(y, x, min(x + num, self._width))
+        elif final in u'ST':
+            if final == u'S':
+                self._scroll_up(num)
+            else:
+                self._scroll_down(num)
+        elif final == u'r':
+            top, bottom = args[0] or 1, (args[1] if len(args) > 1 else 0) or self._height
+            if top < bottom <= self._height:
+                self._top, self._bottom = top - 1, bottom - 1
+                self._move_to(0, 0)
+        elif final == u's' and not params:
+            self._saved = (y, x, self._style)
+        elif final == u'u' and not params:
+            y, x, self._style = self._saved
+            self._move_to(y, x)
+
+    def _private_modes(self, params, enable):
+        """Set or reset DEC private modes of ``params``."""
+        for mode in params.split(u';'):
+            if mode == u'7':
+                self.autowrap = enable
+            elif mode == u'25':
+                self.cursor_visible = enable
+            elif mode in (u'47', u'1047', u'1049'):
+                if mode == u'1049' and enable:
+                    self._saved = (self._y, self._x, self._style)
+                if enable and self._primary is None:
+                    self._primary = (self._chars, self._styles)
+                    self._chars, self._styles = self._blank_rows(self._height, DEFAULT_STYLE)
+                elif not enable and self._primary is not None:
+                    self._chars, self._styles = self._primary
+                    self._primary = None
+                if mode == u'1049' and not enable:
+                    y, x, self._style = self._saved
+                    self._move_to(y, x)
@@ -0,0 +1,48 @@
+# std imports
+from typing import List, Tuple, Union, Optional, NamedTuple
+
+_Color = Optional[Union[int, Tuple[int, int, int]]]
+
+class CellStyle(NamedTuple):
+    bold: bool
+    dim: bool
+    italic: bool
+    underline: bool
+    blink: bool
+    reverse: bool
+    invisible: bool
+    strike: bool
+    fg: _Color
+    bg: _Color
+
+DEFAULT_STYLE: CellStyle
+
+class Cell(NamedTuple):
+    char: str
+    style: CellStyle
+
+class Screen:
+    onlcr: bool
+    autowrap: bool
+    cursor_visible: bool
+    def __init__(
+        self, height: int = ..., width: int = ..., onlcr: bool = ...
+    ) -> None: ...
+    def reset(self) -> None: ...
+    @property
+    def height(self) -> int: ...
+    @property
+    def width(self) -> int: ...
+    @property
+    def cursor(self) -> Tuple[int, int]: ...
+    @property
+    def style(self) -> CellStyle: ...
+    @property
+    def alternate(self) -> bool: ...
+    def resize(self, height: int, width: int) -> None: ...
+    def line(self, y: int) -> str: ...
+    @property
+    def display(self) -> List[str]: ...
+    def cell(self, y: int, x: int) -> Cell: ...
+    def write(self, text: str) -> None: ...
+    def flush(self) -> None: ...
@@ -3,16 +3,79 @@
 # std imports
 import re
 import math
+import bisect
+import codecs
 import textwrap
+import collections
+from array import array
+
+# isort: off
+try:
+    from itertools import accumulate
+except ImportError:
+    # accumulate was added in Python 3.2
+    def accumulate(values):
+        """Generator yields the cumulative sum of ``values``."""
+        total = 0
+        for value in values:
+            total += value
+            yield total
+# isort: on
 
 # 3rd party
 import six
-from wcwidth import wcwidth
 
 # local
+from blessed._width import is_narrow, text_width, iter_graphemes
 from blessed._capabilities import CAPABILITIES_CAUSE_MOVEMENT
 
-__all__ = ('Sequence', 'SequenceTextWrapper', 'iter_parse', 'measure_length')
+__all__ = ('Sequence', 'SequenceCache', 'SequenceParser', 'SequenceTextWrapper', 'StrippedText',
+           'StyledText', 'iter_parse', 'iter_spans', 'measure_length', 'strip_seqs_bytes')
+
+#: Any single ECMA-48 control function: a control sequence (CSI), a control string (OSC, DCS, SOS,
+#: PM, or APC) terminated by ST, or BEL as used by xterm, any other escape sequence, or a single C0
+#: or C1 control character, which includes an escape that does not begin a valid sequence.
+_RE_ECMA48 = re.compile(
+    r'(?:\x1b\[|\x9b)[\x30-\x3f]*[\x20-\x2f]*[\x40-\x7e]'
+    r'|(?:\x1b[\]PX^_]|[\x90\x98\x9d\x9e\x9f])[^\x07\x1b\x9c]*(?:\x07|\x1b\\|\x9c)'
+    r'|\x1b[\x20-\x2f]*[\x30-\x7e]'
+    r'|[\x00-\x1f\x7f-\x9f]')
+
+#: Any incomplete ECMA-48 control function at the end of a string: a lone escape, a control
+#: sequence without its final byte, a control string without its terminator, or an escape
+#: sequence of only intermediate bytes.
+_RE_INCOMPLETE = re.compile(
+    r'(?:(?:\x1b\[|\x9b)[\x30-\x3f]*[\x20-\x2f]*'
+    r'|(?:\x1b[\]PX^_]|[\x90\x98\x9d\x9e\x9f])[^\x07\x1b\x9c]*\x1b?'
+    r'|\x1b[\x20-\x2f]*)\Z')
+
+#: Matches a string without any C0 or C1 control characters, which cannot contain any sequence.
+_RE_PLAIN = re.compile(r'[^\x00-\x1f\x7f-\x9f]*\Z')
+
+#: Matches a sequence of Select Graphic Rendition (SGR), and its parameters.
+_RE_SGR = re.compile(u'\x1b\\[([0-9;:]*)m')
+
+#: Error handler for lines decoded and encoded by :func:`strip_seqs_bytes`, so that any bytes not
+#: valid in the given encoding are preserved.
+_BYTES_ERRORS = 'surrogateescape' if six.PY3 else 'replace'
+
+#: Maximum number of sequences remembered by :func:`_resolve_termcap` for each terminal.
+_RESOLVED_MAXSIZE = 1024
+
+#: Horizontal distance of capabilities that move the cursor by a fixed amount.
+_FIXED_DISTANCE = {
+    'cursor_left': -1,
+    'backspace': -1,
+    'cursor_right': 1,
+    'tab': 8,
+    'ascii_tab': 8,
+}
+
+#: Direction of capabilities that move the cursor by their parameter.
+_PARM_DISTANCE_UNIT = {
+    'parm_left_cursor': -1,
+    'parm_right_cursor': 1,
+}
 
 
 class Termcap(object):
@@ -65,20 +128,11 @@ class Termcap(object):
 
         :returns: 0 except for matching '
         """
-        value = {
-            'cursor_left': -1,
-            'backspace': -1,
-            'cursor_right': 1,
-            'tab': 8,
-            'ascii_tab': 8,
-        }.get(self.name)
+        value = _FIXED_DISTANCE.get(self.name)
         if value is not None:
             return value
 
-        unit = {
-            'parm_left_cursor': -1,
-            'parm_right_cursor': 1
-        }.get(self.name)
+        unit = _PARM_DISTANCE_UNIT.get(self.name)
         if unit is not None:
             value = int(self.re_compiled.match(text).group(1))
             return unit * value
@@ -140,18 +194,48 @@ class Termcap(object):
         return cls(name, pattern, attribute)
 
 
+def _cumulative(values):
+    """
+    Return list of the cumulative sum of ``values``, beginning with 0.
+
+    :arg Iterable[int] values: integers to sum.
+    :rtype: list
+    """
+    result = [0]
+    result.extend(accumulate(values))
+    return result
+
+
 class SequenceTextWrapper(textwrap.TextWrapper):
     """Docstring overridden."""
 
-    def __init__(self, width, term, **kwargs):
+    def __init__(self, width, term, carry_styles=False, **kwargs):
         """
         Class initializer.
 
         This class supports the :meth:`~.Terminal.wrap` method.
+
+        :arg bool carry_styles: When ``True``, each wrapped line begins with the sequences of
+            Select Graphic Rendition (SGR) in effect where it begins, and ends with
+            :attr:`~.Terminal.normal` when any are in effect where it ends, so that any line may be
+            displayed without those before it.
         """
         self.term = term
+        #: Whether the sequences of style in effect are carried to each wrapped line.
+        self.carry_styles = carry_styles
         textwrap.TextWrapper.__init__(self, width, **kwargs)
 
+    def _split(self, text):
+        """
+        Split ``text`` into chunks, as :meth:`textwrap.TextWrapper._split`.
+
+        Text without any hyphen is split only at whitespace, as by
+        :attr:`~textwrap.TextWrapper.wordsep_simple_re`, with the same result.
+        """
+        if self.break_on_hyphens and u'-' not in text:
+            return [chunk for chunk in self.wordsep_simple_re.split(text) if chunk]
+        return textwrap.TextWrapper._split(self, text)
+
     def _wrap_chunks(self, chunks):
         """
         Sequence-aware variant of :meth:`textwrap.TextWrapper._wrap_chunks`.
@@ -165,80 +249,327 @@ class SequenceTextWrapper(textwrap.TextWrapper):
         also break consider sequences part of a "word" that may be broken by hyphen (``-``), where
         this implementation corrects both.
         """
+        text = u''.join(chunks)
+        rows = self._iter_rows(chunks)
+        if self.carry_styles and self.term.normal and u'\x1b[' in text:
+            rows = self._iter_styles(text, rows)
+        else:
+            rows = ((start, end, u'', u'') for start, end in rows)
         lines = []
+        for start, end, opening, closing in rows:
+            indent = self.subsequent_indent if lines else self.initial_indent
+            lines.append(indent + opening + text[start:end] + closing)
+        return lines
+
+    def _iter_styles(self, text, rows):
+        """
+        Generator yields (start, end, opening, closing) of each of ``rows`` of ``text``.
+
+        :arg str text: text of the chunks wrapped.
+        :arg rows: iterable of (start, end) offsets into ``text`` of each wrapped line.
+
+        The opening sequences are those of SGR in effect at the start of a row, since the last
+        that resets all attributes, and closing is :attr:`~.Terminal.normal` when any are in effect
+        at its end. A sequence repeated is moved to the end, rather than kept twice.
+        """
+        normal = self.term.normal
+        matches = _RE_SGR.finditer(text)
+        match = next(matches, None)
+        state = []
+        for start, end in rows:
+            opening = None
+            for position in (start, end):
+                while match is not None and match.start() < position:
+                    sequence, params = match.group(0, 1)
+                    if normal.endswith(sequence) or not params.strip(u'0;'):
+                        state = []
+                    elif params.split(u';')[0] in (u'', u'0'):
+                        state = [sequence]
+                    else:
+                        if sequence in state:
+                            state.remove(sequence)
+                        state.append(sequence)
+                    match = next(matches, None)
+                if opening is None:
+                    opening = u''.join(state)
+            yield start, end, opening, normal if state else u''
+
+    def measure(self, text, offsets=False):
+        """
+        Return number of lines of :meth:`wrap`, without building them.
+
+        :arg str text: a single line of text, which may contain terminal sequences.
+        :arg bool offsets: When ``True``, return the offset into ``text`` of the start of each
+            wrapped line, instead of their number. When tabs are expanded, the offset of a line
+            that begins within an expanded tab is that of the tab.
+        :rtype: int or list
+        """
+        if self._fits(text):
+            return [0] if offsets else 1
+        chunks = self._split_chunks(text)
+        if not offsets:
+            if self.fix_sentence_endings:
+                self._fix_sentence_endings(chunks)
+            return sum(1 for _ in self._iter_rows(chunks))
+        lengths = [len(chunk) for chunk in chunks]
+        if self.fix_sentence_endings:
+            self._fix_sentence_endings(chunks)
+        starts = [start for start, _ in self._iter_rows(chunks)]
+        if lengths != [len(chunk) for chunk in chunks]:
+            # map offsets of the text of sentence endings fixed to those of ``text``.
+            bounds, raw_bounds = _cumulative(len(chunk) for chunk in chunks), _cumulative(lengths)
+            for row, start in enumerate(starts):
+                index = bisect.bisect_right(bounds, start) - 1
+                starts[row] = raw_bounds[index] + min(start - bounds[index], lengths[index])
+        if self.expand_tabs and u'\t' in text:
+            # map offsets of the text of tabs expanded to those of ``text``.
+            tabsize, positions = getattr(self, 'tabsize', 8), []
+            for index, char in enumerate(text):
+                count = (tabsize - len(positions) % tabsize if tabsize > 0 else 0
+                         ) if char == u'\t' else 1
+                positions.extend((index,) * count)
+            positions.append(len(text))
+            starts = [positions[start] for start in starts]
+        return starts
+
+    def wrap(self, text):
+        """
+        Sequence-aware :meth:`textwrap.TextWrapper.wrap`.
+
+        :arg str text: a single line of text, which may contain terminal sequences.
+        :rtype: list
+        """
+        if self._fits(text) and not (self.drop_whitespace and text[-1].isspace()):
+            return [self.initial_indent + text]
+        return textwrap.TextWrapper.wrap(self, text)
+
+    def _fits(self, text):
+        """
+        Return whether ``text`` is a single wrapped line, without splitting it into chunks.
+
+        :arg str text: a single line of text.
+        :rtype: bool
+        :returns: ``True`` when ``text`` is without sequences or whitespace other than space, is
+            not only whitespace, and fits entirely after the initial indent.
+        """
+        return bool(not self.fix_sentence_endings and isinstance(self.width, int)
+                    and text.strip() and _RE_PLAIN.match(text)
+                    and text_width(text) + len(self.initial_indent) <= self.width)
+
+    def _measure_chunks(self, chunks):
+        """
+        Return the length of each of ``chunks``, and whether each is only whitespace.
+
+        :arg list chunks: chunks of text, as by :meth:`~textwrap.TextWrapper._split_chunks`.
+        :rtype: tuple(list, list)
+        """
+        if _RE_PLAIN.match(u''.join(chunks)):
+            # text without sequences, measured without parsing.
+            widths = (list(map(len, chunks)) if is_narrow(u''.join(chunks))
+                      else list(map(text_width, chunks)))
+            return widths, [not chunk.strip() for chunk in chunks]
+        widths, blanks = [], []
+        for chunk in chunks:
+            if _RE_PLAIN.match(chunk):
+                widths.append(text_width(chunk))
+                blanks.append(not chunk.strip())
+            else:
+                seq = Sequence(chunk, self.term)
+                widths.append(seq.length())
+                blanks.append(seq.strip() == u'')
+        return widths, blanks
+
+    def _iter_rows(self, chunks):
+        """
+        Generator yields (start, end) of each wrapped line of ``chunks``.
+
+        :arg list chunks: chunks of text, as by :meth:`~textwrap.TextWrapper._split_chunks`.
+        :raises ValueError: ``self.width`` is not a positive integer
+        :rtype: Iterator[tuple(int, int)]
+        :returns: offsets of each wrapped line, without indent, into ``u''.join(chunks)``.
+
+        Each chunk is measured only once, and the whole chunks that fit a line are found by
+        bisection of their cumulative lengths.
+        """
+        # pylint: disable=too-many-locals,too-many-branches,too-many-statements
         if self.width <= 0 or not isinstance(self.width, int):
             raise ValueError(
                 "invalid width {0!r}({1!r}) (must be integer > 0)"
                 .format(self.width, type(self.width)))
 
-        term = self.term
         drop_whitespace = not hasattr(self, 'drop_whitespace'
                                       ) or self.drop_whitespace
-        chunks.reverse()
-        while chunks:
-            cur_line = []
-            cur_len = 0
-            indent = self.subsequent_indent if lines else self.initial_indent
+        widths, blanks = self._measure_chunks(chunks)
+        lengths = list(map(len, chunks))
+        cumulative = _cumulative(widths)
+        bounds = cumulative if widths == lengths else _cumulative(lengths)
+        count, rows = len(chunks), 0
+        # the next chunk, and offset into it of the remainder of a long word already broken,
+        # of length and whether only whitespace ``partial``.
+        index, start, partial = 0, 0, None
+        while index < count:
+            cur_len, pieces = 0, 0
+            indent = self.subsequent_indent if rows else self.initial_indent
             width = self.width - len(indent)
-            if drop_whitespace and (
-                    Sequence(chunks[-1], term).strip() == '' and lines):
-                del chunks[-1]
-            while chunks:
-                chunk_len = Sequence(chunks[-1], term).length()
-                if cur_len + chunk_len > width:
-                    break
-                cur_line.append(chunks.pop())
-                cur_len += chunk_len
-            if chunks and Sequence(chunks[-1], term).length() > width:
-                self._handle_long_word(chunks, cur_line, cur_len, width)
-            if drop_whitespace and (
-                    cur_line and Sequence(cur_line[-1], term).strip() == ''):
-                del cur_line[-1]
-            if cur_line:
-                lines.append(indent + u''.join(cur_line))
-        return lines
-
-    def _handle_long_word(self, reversed_chunks, cur_line, cur_len, width):
+            if drop_whitespace and rows and (partial[1] if start else blanks[index]):
+                index, start = index + 1, 0
+            row_start = row_end = bounds[index] + start if index < count else bounds[count]
+            # offset and whether only whitespace of the last piece of the line
+            last = None
+            if start and partial[0] <= width:
+                cur_len, pieces, last = partial[0], 1, (row_end, partial[1])
+                index, start, row_end = index + 1, 0, bounds[index + 1]
+            if not start and index < count:
+                stop = bisect.bisect_right(
+                    cumulative, cumulative[index] + width - cur_len, index + 1) - 1
+                if stop > index:
+                    cur_len += cumulative[stop] - cumulative[index]
+                    pieces += stop - index
+                    last = (bounds[stop - 1], blanks[stop - 1])
+                    index, row_end = stop, bounds[stop]
+            if index < count and (partial[0] if start else widths[index]) > width:
+                # Figure out when indent is larger than the specified width, and make
+                # sure at least one character is stripped off on every pass
+                space_left = 1 if width < 1 else width - cur_len
+                chunk = chunks[index]
+                if self.break_long_words:
+                    # put as much of the next chunk onto the current line as will fit.
+                    end = start + self._split_long_word(chunk[start:], space_left, not pieces)
+                    piece_blank = (blanks[index] if (start, end) == (0, lengths[index])
+                                   else not Sequence(chunk[start:end], self.term).strip())
+                    pieces, last = pieces + 1, (row_end, piece_blank)
+                    row_end += end - start
+                    if end == start == lengths[index]:
+                        # an empty remainder that does not fit a line of no width.
+                        index, start = index + 1, 0
+                    else:
+                        # the remainder is kept as a chunk, even when empty, as by textwrap.
+                        start = end
+                        partial = tuple(values[0] for values in
+                                        self._measure_chunks([chunk[start:]]))
+                elif not pieces:
+                    # Otherwise, the long word is preserved intact, on a line of its own.
+                    pieces, last = 1, (row_end, partial[1] if start else blanks[index])
+                    index, start, row_end = index + 1, 0, bounds[index + 1]
+            if drop_whitespace and pieces and last[1]:
+                pieces, row_end = pieces - 1, last[0]
+            if pieces:
+                rows += 1
+                yield row_start, row_end
+
+    def _split_long_word(self, chunk, space_left, first):
         """
-        Sequence-aware :meth:`textwrap.TextWrapper._handle_long_word`.
+        Return offset into ``chunk`` of the most text of a long word that fits ``space_left``.
+
+        :arg str chunk: a word longer than the width of a line.
+        :arg int space_left: cells remaining on the current line.
+        :arg bool first: whether the word begins the line, at least a single character, or
+            grapheme cluster, is then given.
+        :rtype: int
 
         This simply ensures that word boundaries are not broken mid-sequence, as standard python
         textwrap would incorrectly determine the length of a string containing sequences, and may
         also break consider sequences part of a "word" that may be broken by hyphen (``-``), where
         this implementation corrects both.
+
+        The word is measured by a single pass over its sequences and grapheme clusters, unless it
+        contains movement to the left, such as backspace, of which the length of each prefix is
+        measured as by :meth:`Sequence.padd`.
         """
-        # Figure out when indent is larger than the specified width, and make
-        # sure at least one character is stripped off on every pass
-        space_left = 1 if width < 1 else width - cur_len
-        # If we're allowed to break long words, then do so: put as much
-        # of the next chunk onto the current line as will fit.
-
-        if self.break_long_words:
-            term = self.term
-            chunk = reversed_chunks[-1]
-            idx = nxt = 0
-            for text, _ in iter_parse(term, chunk):
-                nxt += len(text)
+        term = self.term
+        # pylint: disable=protected-access
+        spans = Sequence(chunk, term)._spans
+        idx = nxt = 0
+        if spans.length is not None:
+            bounds, widths, length = spans.bounds, spans.widths, 0
+            for index, cap in enumerate(spans.caps):
+                start, end = bounds[index * 2], bounds[index * 2 + 1]
+                if not cap and is_narrow(chunk[start:end]):
+                    # each character is a single cell
+                    if length + end - start > space_left:
+                        nxt += max(0, space_left - length)
+                        return nxt or int(first)
+                    nxt = idx = nxt + end - start
+                    length += end - start
+                    continue
+                # a grapheme cluster of emoji is not broken
+                pieces = (((chunk[start:end], widths[index]),) if cap
+                          else iter_graphemes(chunk[start:end]))
+                for piece, width in pieces:
+                    nxt += len(piece)
+                    length += width
+                    if length > space_left:
+                        return nxt if first and not idx else idx
+                    idx = nxt
+            return idx
+        for text, cap in iter_parse(term, chunk, coalesce=True):
+            pieces = [text] if cap else [grapheme for grapheme, _ in iter_graphemes(text)]
+            for piece in pieces:
+                nxt += len(piece)
                 if Sequence(chunk[:nxt], term).length() > space_left:
-                    break
+                    return nxt if first and not idx else idx
                 idx = nxt
-            cur_line.append(chunk[:idx])
-            reversed_chunks[-1] = chunk[idx:]
+        return idx
 
-        # Otherwise, we have to preserve the long word intact.  Only add
-        # it to the current line if there's nothing already there --
-        # that minimizes how much we violate the width constraint.
-        elif not cur_line:
-            cur_line.append(reversed_chunks.pop())
 
-        # If we're not allowed to break long words, and there's already
-        # text on the current line, do nothing.  Next time through the
-        # main loop of _wrap_chunks(), we'll wind up here again, but
-        # cur_len will be zero, so the next line will be entirely
-        # devoted to the long word that we can't handle right now.
+SequenceTextWrapper.__doc__ = textwrap.TextWrapper.__doc__
 
 
-SequenceTextWrapper.__doc__ = textwrap.TextWrapper.__doc__
+class _SpanIndex(object):
+    """
+    Compact index of the sequences and runs of text of a :class:`Sequence`.
+
+    This is built only once for each :class:`Sequence`, on first use by any of its
+    sequence-aware methods, see :attr:`Sequence._spans`.
+    """
+    # pylint: disable=too-few-public-methods
+    __slots__ = ('bounds', 'widths', 'caps', 'length', 'padded')
+
+    def __init__(self, term, text):
+        """
+        Class initializer.
+
+        :arg blessed.Terminal term: :class:`~.Terminal` instance.
+        :arg str text: A string that may contain sequences.
+        """
+        #: start and end offsets of each span, as ``(start, end, start, end, ...)``.
+        self.bounds = array('I')
+        #: printable width of each run of text, or horizontal distance of each sequence.
+        self.widths = array('i')
+        #: :class:`Termcap` of each sequence, or ``None`` for each run of text.
+        self.caps = []
+        #: whether ``text`` is unchanged by :meth:`Sequence.padd`.
+        self.padded = True
+
+        length = 0
+        offset = 0
+        for start, end, cap in iter_spans(term, text):
+            if cap is None:
+                width = text_width(text[start:end])
+                if length is not None:
+                    length += width
+            else:
+                width = cap.horizontal_distance(text[start:end])
+                if width:
+                    self.padded = False
+                if width < 0:
+                    # distance "overstrikes" characters, not cells, by padd()
+                    length = None
+                elif length is not None:
+                    length += width
+            if start != offset:
+                # characters skipped by the tokenizer are also removed by padd()
+                self.padded = False
+            offset = end
+            self.bounds.append(start)
+            self.bounds.append(end)
+            self.widths.append(width)
+            self.caps.append(cap)
+        if offset != len(text):
+            self.padded = False
+
+        #: printable length, or ``None`` when it must be measured after :meth:`Sequence.padd`.
+        self.length = length
 
 
 class Sequence(six.text_type):
@@ -248,6 +579,11 @@ class Sequence(six.text_type):
     This unicode-derived class understands the effect of escape sequences
     of printable length, allowing a properly implemented :meth:`rjust`,
     :meth:`ljust`, :meth:`center`, and :meth:`length`.
+
+    The sequences of a string are parsed only once, on first use of any of these methods, and
+    shared by all of them. A :class:`Sequence` given to :class:`Sequence` of the same terminal
+    is returned as-is, so that methods such as :meth:`~.Terminal.length` of the
+    :class:`~.Terminal` also share it.
     """
 
     def __new__(cls, sequence_text, term):
@@ -258,10 +594,25 @@ class Sequence(six.text_type):
         :arg str sequence_text: A string that may contain sequences.
         :arg blessed.Terminal term: :class:`~.Terminal` instance.
         """
+        # pylint: disable=protected-access,unidiomatic-typecheck
+        if type(sequence_text) is cls and sequence_text._term is term:
+            return sequence_text
         new = six.text_type.__new__(cls, sequence_text)
         new._term = term
+        new._span_index = None
         return new
 
+    @property
+    def _spans(self):
+        """
+        Index of sequences and text, parsed on first use.
+
+        :rtype: _SpanIndex
+        """
+        if self._span_index is None:
+            self._span_index = _SpanIndex(self._term, self)
+        return self._span_index
+
     def ljust(self, width, fillchar=u' '):
         """
         Return string containing sequences, left-adjusted.
@@ -319,22 +670,97 @@ class Sequence(six.text_type):
         :rtype: str
         :returns: String truncated to at most ``width`` printable characters.
         """
-        output = ""
+        spans = self._spans
+        if not spans.padded:
+            return Sequence(self.padd(), self._term).truncate(width)
+
+        output = []
         current_width = 0
         target_width = int(width)
-        parsed_seq = iter_parse(self._term, self.padd())
+        bounds, widths, caps = spans.bounds, spans.widths, spans.caps
 
         # Retain all text until non-cap width reaches desired width
-        for text, cap in parsed_seq:
+        for idx, cap in enumerate(caps):
+            text = self[bounds[idx * 2]:bounds[idx * 2 + 1]]
+            if not cap and current_width + widths[idx] > target_width:
+                pos = 0
+                for grapheme, grapheme_width in iter_graphemes(text):
+                    current_width += grapheme_width
+                    if current_width > target_width:
+                        break
+                    pos += len(grapheme)
+                output.append(text[:pos])
+
+                # Return with remaining caps appended
+                output.extend(self[bounds[_idx * 2]:bounds[_idx * 2 + 1]]
+                              for _idx in range(idx + 1, len(caps)) if caps[_idx])
+                break
             if not cap:
-                # use wcwidth clipped to 0 because it can sometimes return -1
-                current_width += max(wcwidth(text), 0)
-                if current_width > target_width:
-                    break
-            output += text
+                current_width += widths[idx]
+            output.append(text)
 
-        # Return with remaining caps appended
-        return output + ''.join(text for text, cap in parsed_seq if cap)
+        return u''.join(output)
+
+    def slice_cells(self, start, stop=None):
+        """
+        Return the printable cells from column ``start`` to ``stop`` in a sequence-aware manner.
+
+        All sequences remain in place, those before and after the range of columns included,
+        so that the style active at ``start`` is also active for the slice. A wide character
+        that is only partly within the range is replaced by a space for each of its cells that
+        are. Horizontal Sequences are first expanded by :meth:`padd`.
+
+        :arg int start: First column, counted from 0.
+        :arg int stop: Column following the last, or ``None`` for all columns to the end.
+        :rtype: str
+        :returns: String of the printable characters within columns ``start`` to ``stop``.
+        """
+        spans = self._spans
+        if not spans.padded:
+            return Sequence(self.padd(), self._term).slice_cells(start, stop)
+
+        start = max(int(start), 0)
+        stop = None if stop is None else max(int(stop), start)
+        output = []
+        column = 0
+        bounds, widths = spans.bounds, spans.widths
+        # whether the most recent printable character was kept, zero-width characters that
+        # follow it, such as combining marks, are kept with it.
+        kept = False
+        for idx, cap in enumerate(spans.caps):
+            text = self[bounds[idx * 2]:bounds[idx * 2 + 1]]
+            if cap:
+                output.append(text)
+                continue
+
+            next_column = column + widths[idx]
+            if start <= column and (stop is None or next_column <= stop):
+                # run of text entirely within range
+                output.append(text)
+                kept = kept if column == next_column else True
+            elif next_column <= start or (stop is not None and column >= stop):
+                # run of text entirely outside of range
+                kept = kept if column == next_column else False
+            else:
+                for grapheme, width in iter_graphemes(text):
+                    if not width:
+                        if kept:
+                            output.append(grapheme)
+                        continue
+                    grapheme_stop = column + width
+                    kept = start <= column and (stop is None or grapheme_stop <= stop)
+                    if kept:
+                        output.append(grapheme)
+                    else:
+                        # cells of a wide character partly within range are filled by spaces
+                        visible = (grapheme_stop if stop is None else min(grapheme_stop, stop)
+                                   ) - max(column, start)
+                        if visible > 0:
+                            output.append(u' ' * visible)
+                    column = grapheme_stop
+            column = next_column
+
+        return u''.join(output)
 
     def length(self):
         r"""
@@ -362,8 +788,11 @@ class Sequence(six.text_type):
             as ``term.clear`` will not give accurate returns, it is not
             considered lengthy (a length of 0).
         """
-        # because control characters may return -1, "clip" their length to 0.
-        return sum(max(wcwidth(w_char), 0) for w_char in self.padd(strip=True))
+        spans = self._spans
+        if spans.length is None:
+            # because control characters may return -1, "clip" their length to 0.
+            spans.length = text_width(self.padd(strip=True))
+        return spans.length
 
     def strip(self, chars=None):
         """
@@ -404,6 +833,55 @@ class Sequence(six.text_type):
         """
         return self.padd(strip=True)
 
+    def strip_seqs_map(self):
+        r"""
+        Return ``text`` stripped of its terminal sequences, with the offset of each character.
+
+        :rtype: StrippedText
+        :returns: Text as by :meth:`strip_seqs`, with the offset in this string, and column, of
+            each of its characters.
+
+        Spaces of horizontal movement, such as of ``term.cuf(5)``, are given the offset of their
+        sequence, and characters erased by movement to the left, such as by ``'\b'``, are removed,
+        as by :meth:`strip_seqs`.
+        """
+        # as padd(strip=True), gathering chunks of offsets with chunks of text.
+        chunks, lengths = [], []
+        spans = self._spans
+        bounds, widths = spans.bounds, spans.widths
+        for idx, cap in enumerate(spans.caps):
+            start, end = bounds[idx * 2], bounds[idx * 2 + 1]
+            if not cap:
+                chunks.append((self[start:end], range(start, end)))
+                lengths.append(end - start)
+                continue
+            value = widths[idx]
+            if value > 0:
+                chunks.append((u' ' * value, (start,) * value))
+                lengths.append(value)
+            elif value < 0:
+                while chunks and lengths[-1] <= -value:
+                    value += lengths.pop()
+                    chunks.pop()
+                if chunks:
+                    lengths[-1] += value
+
+        texts, offsets, columns = [], array('I'), array('I')
+        for (text, chunk_offsets), length in zip(chunks, lengths):
+            texts.append(text[:length])
+            offsets.extend(chunk_offsets[:length])
+        text = u''.join(texts)
+        offsets.append(len(self))
+        column = previous = 0
+        for grapheme, width in iter_graphemes(text):
+            if width:
+                previous = column
+                column += width
+            # a zero-width character is of the column of the character it follows.
+            columns.extend((previous,) * len(grapheme))
+        columns.append(column)
+        return StrippedText(six.text_type(self), text, offsets, columns)
+
     def padd(self, strip=False):
         """
         Return non-destructive horizontal movement as destructive spacing.
@@ -412,37 +890,666 @@ class Sequence(six.text_type):
         :rtype: str
         :returns: Text adjusted for horizontal movement
         """
-        outp = ''
-        for text, cap in iter_parse(self._term, self):
+        spans = self._spans
+        if spans.padded and not strip:
+            return six.text_type(self)
+
+        # Output is gathered as chunks, and their lengths: movement to the left discards whole
+        # chunks, or shortens the length of the last one, so that it is not copied until joined.
+        chunks, lengths = [], []
+        bounds, widths = spans.bounds, spans.widths
+        for idx, cap in enumerate(spans.caps):
+            start, end = bounds[idx * 2], bounds[idx * 2 + 1]
             if not cap:
-                outp += text
+                chunks.append(self[start:end])
+                lengths.append(end - start)
                 continue
 
-            value = cap.horizontal_distance(text)
+            value = widths[idx]
             if value > 0:
-                outp += ' ' * value
+                chunks.append(' ' * value)
+                lengths.append(value)
             elif value < 0:
-                outp = outp[:value]
+                while chunks and lengths[-1] <= -value:
+                    value += lengths.pop()
+                    chunks.pop()
+                if chunks:
+                    lengths[-1] += value
             elif not strip:
-                outp += text
-        return outp
+                chunks.append(self[start:end])
+                lengths.append(end - start)
+        return u''.join(chunk if len(chunk) == length else chunk[:length]
+                        for chunk, length in zip(chunks, lengths))
+
+
+class StrippedText(collections.namedtuple('StrippedText', ('raw', 'text', 'offsets', 'columns'))):
+    r"""
+    Text stripped of sequences, mapped to the string it was stripped of.
+
+    Returned by :meth:`~.Terminal.strip_seqs_map`, so that what is searched for in the text
+    displayed may be found, or highlighted, in the string that displays it:
+
+        >>> stripped = term.strip_seqs_map(term.red(u'Hello') + u', world')
+        >>> stripped.text
+        u'Hello, world'
+        >>> start = stripped.text.index(u'o, w')
+        >>> stripped.highlight([(start, start + 4)], term.standout, term.no_standout)
+        u'\x1b[31mHell\x1b[7mo\x1b(B\x1b[m, w\x1b[27morld'
+
+    .. py:attribute:: raw
+
+        The string of text and sequences.
+
+    .. py:attribute:: text
+
+        The string stripped of sequences, as by :meth:`~.Terminal.strip_seqs`.
+
+    .. py:attribute:: offsets
+
+        :class:`array.array` of the offset in :attr:`raw` of each character of :attr:`text`,
+        followed by the length of :attr:`raw`.
+
+    .. py:attribute:: columns
+
+        :class:`array.array` of the column of each character of :attr:`text`, followed by its
+        printable width. Characters of a grapheme cluster, and combining characters, are of the
+        same column as the character they follow.
+    """
+
+    __slots__ = ()
+
+    def column_index(self, column):
+        """
+        Return index in :attr:`text` of the character displayed at ``column``.
+
+        :arg int column: Column, counted from 0.
+        :rtype: int
+        :returns: Index of the first character of the column, also of a wide character that
+            occupies it and the column before, or the length of :attr:`text` for any column beyond.
+        """
+        columns = self.columns
+        if column >= columns[-1]:
+            return len(self.text)
+        idx = bisect.bisect_right(columns, max(int(column), 0)) - 1
+        return bisect.bisect_left(columns, columns[idx])
+
+    def highlight(self, ranges, begin, end):
+        """
+        Return :attr:`raw` with sequences inserted around ranges of characters of :attr:`text`.
+
+        :arg ranges: Iterable of (start, stop) indices of :attr:`text`, such as of each match of a
+            search. Any range that overlaps one before it is ignored.
+        :arg str begin: Sequence inserted before the first character of each range.
+        :arg str end: Sequence inserted after the last character of each range. It should only
+            undo ``begin``, such as ``term.no_standout`` for ``term.standout``, so that the style
+            of :attr:`raw` continues.
+        :rtype: str
+        """
+        raw, text, offsets = self.raw, self.text, self.offsets
+        output, position = [], 0
+        for start, stop in sorted(ranges):
+            start, stop = max(start, 0), min(stop, len(text))
+            if stop <= start or offsets[start] < position:
+                continue
+            raw_start, raw_stop = offsets[start], offsets[stop - 1]
+            # a character of raw, rather than a space of movement, ends after it.
+            if raw[raw_stop] == text[stop - 1]:
+                raw_stop += 1
+            output.extend((raw[position:raw_start], begin, raw[raw_start:raw_stop], end))
+            position = raw_stop
+        output.append(raw[position:])
+        return u''.join(output)
+
+
+#: Statistics of a :class:`SequenceCache`, as returned by :meth:`SequenceCache.cache_info`.
+CacheInfo = collections.namedtuple('CacheInfo', ('hits', 'misses', 'evictions',
+                                                 'maxsize', 'currsize'))
+
+
+class SequenceCache(object):
+    """
+    A size-bounded, least-recently-used cache of results of sequence-aware methods.
+
+    Each :class:`~.Terminal` has one, :attr:`~.Terminal.sequence_cache`, that remembers the results
+    of :meth:`~.Terminal.length`, :meth:`~.Terminal.strip_seqs`, :meth:`~.Terminal.strip`,
+    :meth:`~.Terminal.lstrip`, :meth:`~.Terminal.rstrip`, :meth:`~.Terminal.truncate`, and
+    :meth:`~.Terminal.slice_cells` by their arguments, so that the same strings measured again are
+    not parsed again. Only strings of at most :attr:`maxlength` characters are remembered, so that
+    large strings, such as of files, are not kept alive by the cache.
+
+    The number of hits, misses, and evictions are counted, to help choose a :attr:`maxsize` suited
+    to an application:
+
+        >>> term.sequence_cache.cache_info()
+        CacheInfo(hits=21802, misses=1199, evictions=175, maxsize=1024, currsize=1024)
+    """
+
+    def __init__(self, maxsize=1024, maxlength=256):
+        """
+        Class initializer.
+
+        :arg int maxsize: Maximum number of results remembered, ``0`` disables the cache.
+        :arg int maxlength: Maximum length of strings of which results are remembered.
+        """
+        self._entries = collections.OrderedDict()
+        self._maxsize = 0
+        #: Maximum length of strings of which results are remembered, longer are not cached.
+        self.maxlength = maxlength
+        #: Number of results found in the cache.
+        self.hits = 0
+        #: Number of results not found in the cache.
+        self.misses = 0
+        #: Number of results discarded, as the least recently used, to remain within maxsize.
+        self.evictions = 0
+        self.maxsize = maxsize
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __getitem__(self, key):
+        try:
+            value = self._entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            raise
+        # re-inserted as the most recently used
+        self._entries[key] = value
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        if self._maxsize:
+            self._entries[key] = value
+            self._evict()
+
+    @property
+    def maxsize(self):
+        """
+        Maximum number of results remembered.
+
+        When ``0``, the cache is disabled. Assigning a smaller value discards the least recently
+        used results.
+        """
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        assert isinstance(value, int) and value >= 0, value
+        self._maxsize = value
+        self._evict()
+
+    def _evict(self):
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def cache_info(self):
+        """
+        Return statistics of this cache.
+
+        :rtype: CacheInfo
+        :returns: named tuple of ``hits``, ``misses``, ``evictions``, ``maxsize``, and ``currsize``.
+        """
+        return CacheInfo(self.hits, self.misses, self.evictions,
+                         self._maxsize, len(self._entries))
+
+    def clear(self):
+        """Discard all results, statistics are retained."""
+        self._entries.clear()
+
+
+@six.python_2_unicode_compatible
+class StyledText(object):
+    """
+    Text of known printable width, that may contain sequences, concatenated without measuring.
+
+    A :class:`StyledText` is a rope of fragments, each measured once by :meth:`~.Terminal.length`
+    when it is made, or by a given ``width``. Adding a :class:`StyledText` and another, or any
+    string, makes a new :class:`StyledText` of both, of the sum of their widths, without copying
+    or measuring their text again:
+
+        >>> line = StyledText(term, term.red(u'error')) + u': ' + term.bold(u'コン')
+        >>> line.width
+        11
+        >>> print(line.ljust(term.width))
+
+    The string of all fragments is joined only on first use, by :func:`str`. The width of each
+    fragment is kept, so that :meth:`truncate` and :meth:`slice_cells` measure only the fragments at
+    the boundaries of their result. Fragments should each be whole, such that none ends by part
+    of a sequence or grapheme cluster continued by the next.
+    """
+
+    __slots__ = ('_term', '_text', '_parts', '_width')
+
+    def __init__(self, term, text=u'', width=None):
+        """
+        Class initializer.
+
+        :arg blessed.Terminal term: :class:`~.Terminal` instance.
+        :arg str text: String that may contain sequences.
+        :arg int width: Printable width of ``text``, when already known, otherwise it is measured
+            by :meth:`~.Terminal.length`.
+        """
+        self._term = term
+        self._text = six.text_type(text)
+        self._parts = ()
+        self._width = term.length(self._text) if width is None else int(width)
+
+    @classmethod
+    def _join(cls, term, parts):
+        """Return :class:`StyledText` of ``parts``, a sequence of :class:`StyledText`."""
+        node = cls.__new__(cls)
+        node._term = term
+        node._text = None
+        node._parts = tuple(parts)
+        node._width = sum(part._width for part in node._parts)
+        return node
+
+    @property
+    def width(self):
+        """
+        Printable width, the sum of the widths of all fragments.
+
+        :rtype: int
+        """
+        return self._width
+
+    def length(self):
+        """
+        Return printable width, as :attr:`width`.
+
+        :rtype: int
+        """
+        return self._width
+
+    def fragments(self):
+        """
+        Generator yields (text, width) of each fragment, in order.
+
+        :rtype: Iterator[tuple(str, int)]
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node._parts:
+                stack.extend(reversed(node._parts))
+            else:
+                yield node._text, node._width
+
+    def __str__(self):
+        if self._text is None:
+            self._text = u''.join(text for text, _ in self.fragments())
+        return self._text
+
+    def __repr__(self):
+        return '<StyledText width={0} {1!r}>'.format(self._width, six.text_type(self))
+
+    def __eq__(self, other):
+        if isinstance(other, (StyledText, six.text_type)):
+            return six.text_type(self) == six.text_type(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        return hash(six.text_type(self))
+
+    def _coerce(self, other):
+        """Return ``other``, a :class:`StyledText` or string, as a :class:`StyledText`."""
+        if isinstance(other, StyledText):
+            return other
+        if isinstance(other, six.string_types):
+            return StyledText(self._term, other)
+        return None
+
+    def __add__(self, other):
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return StyledText._join(self._term, (self, other))
+
+    def __radd__(self, other):
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return StyledText._join(self._term, (other, self))
+
+    def ljust(self, width, fillchar=u' '):
+        """
+        Return :class:`StyledText` left-adjusted, as by :meth:`Sequence.ljust`.
+
+        :arg int width: Total width given to left-adjust text.
+        :arg str fillchar: String for padding right-of text.
+        :rtype: StyledText
+        """
+        padding = int(max(0.0, float(int(width) - self._width)) / float(len(fillchar)))
+        if not padding:
+            return self
+        return self + fillchar * padding
+
+    def rjust(self, width, fillchar=u' '):
+        """
+        Return :class:`StyledText` right-adjusted, as by :meth:`Sequence.rjust`.
+
+        :arg int width: Total width given to right-adjust text.
+        :arg str fillchar: String for padding left-of text.
+        :rtype: StyledText
+        """
+        padding = int(max(0.0, float(int(width) - self._width)) / float(len(fillchar)))
+        if not padding:
+            return self
+        return fillchar * padding + self
+
+    def truncate(self, width):
+        """
+        Return :class:`StyledText` truncated, as by :meth:`Sequence.truncate`.
+
+        Fragments within ``width`` are kept whole, only the fragment at ``width`` is truncated, and
+        only the sequences of those that follow are kept.
+
+        :arg int width: The printable width to truncate to.
+        :rtype: StyledText
+        """
+        remaining, term, parts = max(int(width), 0), self._term, []
+        if remaining >= self._width:
+            return self
+        for text, text_width in self.fragments():
+            if text_width <= remaining:
+                parts.append(StyledText(term, text, text_width))
+            else:
+                text = term.truncate(text, remaining)
+                parts.append(StyledText(term, text, term.length(text) if remaining else 0))
+            remaining = max(remaining - text_width, 0)
+        return StyledText._join(term, parts)
+
+    def slice_cells(self, start, stop=None):
+        """
+        Return :class:`StyledText` of columns ``start`` to ``stop``.
+
+        As by :meth:`Sequence.slice_cells`, but only the fragments at ``start`` and ``stop`` are
+        sliced, those between are kept whole, and only the sequences of those outside of the range
+        are kept.
+
+        :arg int start: First column, counted from 0.
+        :arg int stop: Column following the last, or ``None`` for all columns to the end.
+        :rtype: StyledText
+        """
+        start = max(int(start), 0)
+        stop = self._width if stop is None else min(max(int(stop), start), self._width)
+        term, parts, offset = self._term, [], 0
+        for text, text_width in self.fragments():
+            first, last = max(start - offset, 0), min(stop - offset, text_width)
+            if first == 0 and last == text_width:
+                parts.append(StyledText(term, text, text_width))
+            else:
+                last = max(last, first)
+                parts.append(StyledText(term, term.slice_cells(text, first, last), last - first))
+            offset += text_width
+        return StyledText._join(term, parts)
+
+
+def _iter_spans_regex(term, text):
+    """
+    Tokenizer for :func:`iter_spans` by regular expression of all known capabilities.
+
+    Each position of ``text`` is tried against the pattern of every :class:`Termcap` of ``term``,
+    any characters not matching are yielded as plain text.
+    """
+    # pylint: disable=protected-access
+    caps = term.caps
+    run_start = run_end = 0
+    for match in term._caps_compiled_runs.finditer(text):
+        start, end = match.span()
+        name = match.lastgroup
+        if name in ('TEXT', 'MISMATCH'):
+            # join with any preceding text, such as a control character not matching.
+            if start != run_end:
+                if run_start != run_end:
+                    yield run_start, run_end, None
+                run_start = start
+            run_end = end
+            continue
+        if run_start != run_end:
+            yield run_start, run_end, None
+        run_start = run_end = end
+        yield start, end, caps[name]
+    if run_start != run_end:
+        yield run_start, run_end, None
+
+
+def _iter_spans_ecma48(term, text):
+    """
+    Tokenizer for :func:`iter_spans` by the ECMA-48 grammar of control functions.
+
+    Sequence boundaries are found in a single scan of ``text``, only the sequences found are
+    resolved to a :class:`Termcap` of ``term``, by :func:`_resolve_termcap`.
+    """
+    idx = 0
+    for match in _RE_ECMA48.finditer(text):
+        start, end = match.span()
+        if idx != start:
+            yield idx, start, None
+        yield start, end, _resolve_termcap(term, match.group())
+        idx = end
+    if idx != len(text):
+        yield idx, len(text), None
+
+
+def _resolve_termcap(term, text):
+    r"""
+    Return :class:`Termcap` of ``term`` matching the whole of sequence ``text``.
+
+    Sequences of valid ECMA-48 form that do not match any capability of ``term``, such as
+    ``'\x1b[?2004h'`` or ``'\x1b]0;title\x07'``, are given a :class:`Termcap` of name
+    ``'unknown'``, which does not move the cursor.
+
+    :arg blessed.Terminal term: :class:`~.Terminal` instance.
+    :arg str text: a single, complete sequence.
+    :rtype: blessed.sequences.Termcap
+    """
+    # pylint: disable=protected-access
+    resolved = term._caps_resolved
+    try:
+        return resolved[text]
+    except KeyError:
+        pass
+
+    if term._caps_compiled_full is None:
+        term._caps_compiled_full = re.compile(u'(?:{0})\\Z'.format(
+            u'|'.join(cap.named_pattern for cap in term.caps.values())))
+    match = term._caps_compiled_full.match(text)
+    if match is not None:
+        cap = term.caps[match.lastgroup]
+    else:
+        cap = Termcap(u'unknown', re.escape(text), u'')
+
+    # sequences of arbitrary text may be found, such as OSC window titles, keep this bounded.
+    if len(resolved) >= _RESOLVED_MAXSIZE:
+        resolved.clear()
+    resolved[text] = cap
+    return cap
+
+
+#: Tokenizers available for :attr:`~.Terminal.sequence_tokenizer`.
+SEQUENCE_TOKENIZERS = {'regex': _iter_spans_regex,
+                       'ecma48': _iter_spans_ecma48}
 
 
-def iter_parse(term, text):
+def iter_spans(term, text):
+    """
+    Generator yields (start, end, capability) for sequences and text of ``text``.
+
+    value for ``capability`` may be ``None``, where ``text[start:end]`` is
+    the longest possible run of characters that are not part of any sequence.
+    Otherwise, ``text[start:end]`` is a full matching sequence of given
+    capability.
+
+    ``text`` is tokenized by the engine named by :attr:`~.Terminal.sequence_tokenizer`.
+    """
+    return SEQUENCE_TOKENIZERS[term.sequence_tokenizer](term, text)
+
+
+def iter_parse(term, text, coalesce=False):
     """
     Generator yields (text, capability) for characters of ``text``.
 
     value for ``capability`` may be ``None``, where ``text`` is
     :class:`str` of length 1.  Otherwise, ``text`` is a full
     matching sequence of given capability.
+
+    When ``coalesce`` is ``True``, where ``capability`` is ``None``, ``text``
+    is instead the longest possible run of characters that are not part of
+    any sequence, as yielded by :func:`iter_spans`.
     """
-    for match in term._caps_compiled_any.finditer(text):  # pylint: disable=protected-access
-        name = match.lastgroup
-        value = match.group(name)
-        if name == 'MISMATCH':
-            yield (value, None)
+    for start, end, cap in iter_spans(term, text):
+        if cap is None and not coalesce:
+            for char in text[start:end]:
+                yield char, None
+        else:
+            yield text[start:end], cap
+
+
+class SequenceParser(object):
+    r"""
+    Incremental parser of a stream of text containing sequences, such as output of a subprocess.
+
+    Each chunk of the stream given to :meth:`feed` is parsed as by :func:`iter_parse`, with
+    ``coalesce=True``, except for any incomplete sequence at its end, which is kept until it is
+    completed by the following chunk:
+
+        >>> parser = SequenceParser(term)
+        >>> list(parser.feed(u'abc\x1b['))
+        [(u'abc', None)]
+        >>> list(parser.feed(u'31mdef'))
+        [(u'\x1b[31m', <Termcap set_a_attributes1:'\x1b\\[\\d+m'>), (u'def', None)]
+
+    Sequences are found incomplete by the ECMA-48 grammar. At most ``max_pending`` characters are
+    kept between chunks, so that a stream is parsed in constant memory: an incomplete sequence of
+    any greater length, such as an unterminated control string, is parsed as text.
+
+    A stream of bytes should be decoded first, such as by :func:`codecs.getincrementaldecoder`.
+    """
+
+    def __init__(self, term, max_pending=4096):
+        """
+        Class initializer.
+
+        :arg blessed.Terminal term: :class:`~.Terminal` instance.
+        :arg int max_pending: Maximum length of an incomplete sequence kept between chunks.
+        """
+        self._term = term
+        self._pending = u''
+        self.max_pending = max_pending
+
+    @property
+    def pending(self):
+        """
+        Incomplete sequence kept from the end of the most recent chunk.
+
+        :rtype: str
+        """
+        return self._pending
+
+    def feed(self, chunk):
+        """
+        Parse the next chunk of the stream.
+
+        :arg str chunk: Next chunk of the stream.
+        :rtype: Iterator[tuple(str, Termcap)]
+        :returns: Iterator of (text, capability) for the chunk, as by :func:`iter_parse`, following
+            any incomplete sequence kept from the previous chunk, and preceding any incomplete
+            sequence at its end.
+        """
+        text = self._pending + chunk
+        match = _RE_INCOMPLETE.search(text, max(0, len(text) - self.max_pending))
+        if match is not None:
+            text, self._pending = text[:match.start()], text[match.start():]
         else:
-            yield value, term.caps[name]
+            self._pending = u''
+        return iter_parse(self._term, text, coalesce=True)
+
+    def flush(self):
+        """
+        Parse any incomplete sequence kept at the end of the stream.
+
+        :rtype: Iterator[tuple(str, Termcap)]
+        :returns: Iterator of (text, capability) for the incomplete sequence, as by
+            :func:`iter_parse`.
+        """
+        text, self._pending = self._pending, u''
+        return iter_parse(self._term, text, coalesce=True)
+
+
+def _encode_pattern(pattern, encoding):
+    """Return ``pattern`` encoded by ``encoding``, or ``None`` if not of its characters."""
+    try:
+        return pattern.encode(encoding)
+    except UnicodeEncodeError:
+        # a sequence of 8-bit controls, such as u'\x9b', may not be written in ASCII.
+        return None
+
+
+def _compile_bytes_patterns(term, encoding):
+    """
+    Return patterns of bytes matching sequences of ``term`` encoded by ``encoding``.
+
+    :arg blessed.Terminal term: :class:`~.Terminal` instance.
+    :arg str encoding: encoding of the bytes matched.
+    :rtype: tuple
+    :returns: pattern matching any sequence, except those that match a newline, and pattern
+        matching any sequence of horizontal movement, compiled on first use of each encoding.
+    """
+    # pylint: disable=protected-access
+    encoding = codecs.lookup(encoding).name
+    if encoding not in term._caps_compiled_bytes:
+        caps = [cap for cap in term.caps.values() if not cap.re_compiled.match(u'\n')]
+        moving = [cap for cap in caps
+                  if cap.name in _FIXED_DISTANCE or cap.name in _PARM_DISTANCE_UNIT]
+        compiled = []
+        for group in (caps, moving):
+            patterns = [_encode_pattern(cap.pattern, encoding) for cap in group]
+            compiled.append(re.compile(b'|'.join(filter(None, patterns)) or b'(?!)'))
+        term._caps_compiled_bytes[encoding] = tuple(compiled)
+    return term._caps_compiled_bytes[encoding]
+
+
+def strip_seqs_bytes(term, data, encoding='utf8'):
+    r"""
+    Return bytes ``data`` stripped of terminal sequences, line by line.
+
+    Each line is stripped as by :meth:`~.Terminal.strip_seqs`, and newlines are retained.
+    Sequences are removed directly from ``data`` by a pattern of bytes of the capabilities of
+    ``term``, as found by its ``'regex'`` :attr:`~.Terminal.sequence_tokenizer`. Only lines
+    containing horizontal movement, such as ``\b`` or ``term.move_left(2)``, are decoded by
+    ``encoding`` to be adjusted by :meth:`Sequence.padd`.
+
+    :arg blessed.Terminal term: :class:`~.Terminal` instance.
+    :arg bytes data: encoded text that may contain sequences, such as contents of a log file.
+    :arg str encoding: encoding of ``data``, compatible with ASCII, such as ``'utf8'``.
+    :rtype: bytes
+    :returns: ``data`` with terminal sequences removed.
+    """
+    pattern, moving = _compile_bytes_patterns(term, encoding)
+    output, offset = [], 0
+    for match in moving.finditer(data):
+        if match.start() < offset:
+            # line already adjusted
+            continue
+        start = data.rfind(b'\n', 0, match.start()) + 1
+        end = data.find(b'\n', match.end())
+        if end == -1:
+            end = len(data)
+        output.append(pattern.sub(b'', data[offset:start]))
+        line = data[start:end].decode(encoding, _BYTES_ERRORS)
+        output.append(Sequence(line, term).strip_seqs().encode(encoding, _BYTES_ERRORS))
+        offset = end
+    output.append(pattern.sub(b'', data[offset:]))
+    return b''.join(output)
 
 
 def measure_length(text, term):
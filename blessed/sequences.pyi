@@ -1,6 +1,21 @@
 # std imports
 import textwrap
-from typing import Any, Type, Tuple, Pattern, TypeVar, Iterator, Optional, SupportsIndex
+from array import array
+from typing import (Any,
+                    Dict,
+                    List,
+                    Type,
+                    Hashable,
+                    Tuple,
+                    Pattern,
+                    Union,
+                    TypeVar,
+                    Callable,
+                    Iterable,
+                    Iterator,
+                    Optional,
+                    NamedTuple,
+                    SupportsIndex)
 
 # local
 from .terminal import Terminal
@@ -34,7 +49,11 @@ class Termcap:
 
 class SequenceTextWrapper(textwrap.TextWrapper):
     term: Terminal = ...
-    def __init__(self, width: int, term: Terminal, **kwargs: Any) -> None: ...
+    carry_styles: bool = ...
+    def __init__(
+        self, width: int, term: Terminal, carry_styles: bool = ..., **kwargs: Any
+    ) -> None: ...
+    def measure(self, text: str, offsets: bool = ...) -> Union[int, List[int]]: ...
 
 class Sequence(str):
     def __new__(cls: Type[_T], sequence_text: str, term: Terminal) -> _T: ...
@@ -42,14 +61,89 @@ class Sequence(str):
     def rjust(self, width: SupportsIndex, fillchar: str = ...) -> str: ...
     def center(self, width: SupportsIndex, fillchar: str = ...) -> str: ...
     def truncate(self, width: SupportsIndex) -> str: ...
+    def slice_cells(
+        self, start: SupportsIndex, stop: Optional[SupportsIndex] = ...
+    ) -> str: ...
     def length(self) -> int: ...
     def strip(self, chars: Optional[str] = ...) -> str: ...
     def lstrip(self, chars: Optional[str] = ...) -> str: ...
     def rstrip(self, chars: Optional[str] = ...) -> str: ...
     def strip_seqs(self) -> str: ...
+    def strip_seqs_map(self) -> StrippedText: ...
     def padd(self, strip: bool = ...) -> str: ...
 
-def iter_parse(
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+class SequenceCache:
+    hits: int = ...
+    misses: int = ...
+    evictions: int = ...
+    maxlength: int = ...
+    def __init__(self, maxsize: int = ..., maxlength: int = ...) -> None: ...
+    def __len__(self) -> int: ...
+    def __contains__(self, key: Hashable) -> bool: ...
+    def __getitem__(self, key: Hashable) -> Any: ...
+    def __setitem__(self, key: Hashable, value: Any) -> None: ...
+    @property
+    def maxsize(self) -> int: ...
+    @maxsize.setter
+    def maxsize(self, value: int) -> None: ...
+    def cache_info(self) -> CacheInfo: ...
+    def clear(self) -> None: ...
+
+class StrippedText(NamedTuple):
+    raw: str
+    text: str
+    offsets: array[int]
+    columns: array[int]
+    def column_index(self, column: int) -> int: ...
+    def highlight(
+        self, ranges: Iterable[Tuple[int, int]], begin: str, end: str
+    ) -> str: ...
+
+class StyledText:
+    def __init__(
+        self, term: Terminal, text: str = ..., width: Optional[int] = ...
+    ) -> None: ...
+    @property
+    def width(self) -> int: ...
+    def length(self) -> int: ...
+    def fragments(self) -> Iterator[Tuple[str, int]]: ...
+    def __eq__(self, other: object) -> bool: ...
+    def __ne__(self, other: object) -> bool: ...
+    def __hash__(self) -> int: ...
+    def __add__(self, other: Union[StyledText, str]) -> StyledText: ...
+    def __radd__(self, other: Union[StyledText, str]) -> StyledText: ...
+    def ljust(self, width: SupportsIndex, fillchar: str = ...) -> StyledText: ...
+    def rjust(self, width: SupportsIndex, fillchar: str = ...) -> StyledText: ...
+    def truncate(self, width: SupportsIndex) -> StyledText: ...
+    def slice_cells(
+        self, start: SupportsIndex, stop: Optional[SupportsIndex] = ...
+    ) -> StyledText: ...
+
+SEQUENCE_TOKENIZERS: Dict[
+    str, Callable[[Terminal, str], Iterator[Tuple[int, int, Optional[Termcap]]]]
+]
+
+def iter_spans(
     term: Terminal, text: str
+) -> Iterator[Tuple[int, int, Optional[Termcap]]]: ...
+def iter_parse(
+    term: Terminal, text: str, coalesce: bool = ...
 ) -> Iterator[Tuple[str, Optional[Termcap]]]: ...
+
+class SequenceParser:
+    max_pending: int = ...
+    def __init__(self, term: Terminal, max_pending: int = ...) -> None: ...
+    @property
+    def pending(self) -> str: ...
+    def feed(self, chunk: str) -> Iterator[Tuple[str, Optional[Termcap]]]: ...
+    def flush(self) -> Iterator[Tuple[str, Optional[Termcap]]]: ...
+
+def strip_seqs_bytes(term: Terminal, data: bytes, encoding: str = ...) -> bytes: ...
 def measure_length(text: str, term: Terminal) -> int: ...
@@ -0,0 +1,223 @@
+r"""
+Removal of sequences of Select Graphic Rendition (SGR) that do not change the output displayed.
+
+Text composed of many formatted strings, such as ``term.red(u'a') + term.red(u'b')``, repeats the
+same attributes, and resets, for each fragment. A :class:`SGRFilter` follows the attributes and
+colors of text as a :class:`~.style.Style`, and writes only the change of style, by
+:meth:`.Style.diff`, before the text that is displayed in it:
+
+    >>> filter_sgr(u'\x1b[31ma\x1b[m' + u'\x1b[31mb\x1b[m' + u'\x1b[m')
+    u'\x1b[31mab\x1b[m'
+
+A stream is filtered by :class:`SGRFilterStream`, such as the ``stream`` of a :class:`~.Terminal`.
+Attributes not of a :class:`~.style.Style`, such as overline, are written as given, and the
+sequences that follow them until all attributes are reset.
+"""
+# std imports
+import re
+
+# local
+from .style import DEFAULT, Style
+from .screen import _RE_CSI, _apply_sgr
+from .sequences import _RE_ECMA48, _RE_INCOMPLETE
+
+__all__ = ('SGRFilter', 'SGRFilterStream', 'filter_sgr')
+
+#: Matches parameters of SGR of only the attributes and colors of a :class:`~.style.Style`.
+_RE_MODELED = re.compile(
+    r'(?:(?:[0-57-9]|2[2-57-9]|[39][0-7]|[34]9|4[0-7]|10[0-7]'
+    r'|[34]8;(?:5;\d{1,3}|2;\d{1,3};\d{1,3};\d{1,3}))(?:;(?!\Z)|\Z))*\Z')
+
+#: Matches a sequence that neither changes, nor displays, the style: cursor movement, carriage
+#: return, backspace, shift in and out, and designation of character sets.
+_RE_NEUTRAL = re.compile(u'(?:(?:\x1b\\[|\x9b)[0-9;]*[A-H`df]|[\r\b\x0e\x0f]'
+                         u'|\x1b[()*+\\-./][\x30-\x7e])\\Z')
+
+#: Maximum number of styles changed by parameters of SGR remembered.
+_CHANGES_MAXSIZE = 4096
+
+#: Style changed by parameters of SGR, by (style, params).
+_CHANGES = {}
+
+
+def _change_style(style, params):
+    """
+    Return :class:`~.style.Style` of ``style`` changed by the parameters of a sequence of SGR.
+
+    :arg Style style: current style.
+    :arg str params: parameters of the sequence, such as ``u'1;31'``.
+    :rtype: Style
+    :returns: ``None`` if any parameter is not of an attribute or color of a Style.
+    """
+    key = (style, params)
+    try:
+        return _CHANGES[key]
+    except KeyError:
+        pass
+    changed = None
+    if _RE_MODELED.match(params):
+        try:
+            changed = Style.from_cell_style(_apply_sgr(style.cell_style, params))
+        except ValueError:
+            # a color of the 256-color palette, or of red, green, or blue, greater than 255.
+            pass
+    if len(_CHANGES) >= _CHANGES_MAXSIZE:
+        _CHANGES.clear()
+    _CHANGES[key] = changed
+    return changed
+
+
+class SGRFilter(object):
+    """
+    Removes sequences of SGR that do not change the output displayed, of text given in parts.
+
+    Each part given to :meth:`feed` returns its filtered text. A sequence incomplete at the end of a
+    part is kept until completed by the following part.
+    """
+
+    def __init__(self, style=DEFAULT):
+        """
+        Class initializer.
+
+        :arg Style style: style of the terminal before any text given.
+        """
+        #: Style written, ``None`` while attributes not of a :class:`~.style.Style` are set.
+        self.written = style
+        #: Style of the text given, ``None`` as of :attr:`written`.
+        self.style = style
+        self._saved = style
+        self._incomplete = u''
+
+    def feed(self, text):
+        """
+        Return ``text`` of only the sequences of SGR that change the output displayed.
+
+        :arg str text: any part of output to a terminal.
+        :rtype: str
+        """
+        text = self._incomplete + text
+        match = _RE_INCOMPLETE.search(text, max(0, len(text) - 4096))
+        if match is not None:
+            text, self._incomplete = text[:match.start()], text[match.start():]
+        else:
+            self._incomplete = u''
+        output, idx = [], 0
+        for match in _RE_ECMA48.finditer(text):
+            start = match.start()
+            if idx != start:
+                output.append(self.flush())
+                output.append(text[idx:start])
+            output.append(self._sequence(match.group()))
+            idx = match.end()
+        if idx != len(text):
+            output.append(self.flush())
+            output.append(text[idx:])
+        return u''.join(output)
+
+    def flush(self):
+        """
+        Return sequence that changes the style written to that of the text given.
+
+        :rtype: str
+        """
+        if self.style is self.written:
+            return u''
+        sequence = self.written.diff(self.style)
+        self.written = self.style
+        return sequence
+
+    def close(self):
+        """
+        Return sequence that changes the style written to that of the text given, at its end.
+
+        :rtype: str
+        :returns: as :meth:`flush`, followed by any sequence incomplete at the end of the text.
+        """
+        sequence, self._incomplete = self.flush() + self._incomplete, u''
+        return sequence
+
+    def _sequence(self, sequence):
+        """Return ``sequence``, as it should be written, following its change of style."""
+        if _RE_NEUTRAL.match(sequence):
+            return sequence
+        match = _RE_CSI.match(sequence)
+        if match is not None and match.group(2) == u'm' and match.group(1)[:1] not in (
+                u'<', u'=', u'>', u'?'):
+            params = match.group(1)
+            if self.style is not None:
+                style = _change_style(self.style, params)
+                if style is not None:
+                    self.style = style
+                    return u''
+            elif params[:1] in (u'', u'0') or params[:2] == u'0;':
+                # all attributes are reset, their style is known again.
+                self.style = self.written = _change_style(DEFAULT, params)
+                if self.style is not None:
+                    return sequence
+            flushed = self.flush() if self.style is not None else u''
+            self.style = self.written = None
+            return flushed + sequence
+        flushed = self.flush()
+        if sequence == u'\x1b7':
+            self._saved = self.written
+        elif sequence == u'\x1b8':
+            self.style = self.written = self._saved
+        elif sequence == u'\x1bc':
+            self.style = self.written = DEFAULT
+        return flushed + sequence
+
+
+def filter_sgr(text, style=DEFAULT):
+    r"""
+    Return ``text`` of only the sequences of SGR that change the output displayed.
+
+    :arg str text: output to a terminal.
+    :arg Style style: style of the terminal before ``text``.
+    :rtype: str
+
+    Repeated resets, colors selected again, and attributes reset before any text is displayed in
+    them are removed, and the remaining changes of each style are written by the shortest sequence:
+
+        >>> filter_sgr(u'\x1b[1m\x1b[m\x1b[31mred\x1b[m\x1b[31m red\x1b[m')
+        u'\x1b[31mred red\x1b[m'
+
+    Text displayed by the result is of the same attributes and colors as ``text``, and the terminal
+    is left in the same style at its end.
+    """
+    sgr_filter = SGRFilter(style)
+    return sgr_filter.feed(text) + sgr_filter.close()
+
+
+class SGRFilterStream(object):
+    """File object that writes text to ``stream`` by a :class:`SGRFilter`."""
+
+    def __init__(self, stream, style=DEFAULT):
+        """
+        Class initializer.
+
+        :arg stream: File object written to.
+        :arg Style style: style of the terminal before any text written.
+        """
+        self.stream = stream
+        self.filter = SGRFilter(style)
+
+    def write(self, text):
+        """
+        Write ``text`` to the stream, of only the sequences of SGR that change its output.
+
+        :arg str text: output to a terminal.
+        :rtype: int
+        :returns: length of ``text``, all of which is written or kept by the filter.
+        """
+        self.stream.write(self.filter.feed(text))
+        return len(text)
+
+    def flush(self):
+        """Write the style of the text written, and flush the stream."""
+        sequence = self.filter.flush()
+        if sequence:
+            self.stream.write(sequence)
+        return self.stream.flush()
+
+    def __getattr__(self, attr):
+        return getattr(self.stream, attr)
@@ -0,0 +1,23 @@
+# std imports
+from typing import IO, Any, Optional
+
+# local
+from .style import Style
+
+class SGRFilter:
+    written: Optional[Style]
+    style: Optional[Style]
+    def __init__(self, style: Style = ...) -> None: ...
+    def feed(self, text: str) -> str: ...
+    def flush(self) -> str: ...
+    def close(self) -> str: ...
+
+def filter_sgr(text: str, style: Style = ...) -> str: ...
+
+class SGRFilterStream:
+    stream: IO[str]
+    filter: SGRFilter
+    def __init__(self, stream: IO[str], style: Style = ...) -> None: ...
+    def write(self, text: str) -> int: ...
+    def flush(self) -> None: ...
+    def __getattr__(self, attr: str) -> Any: ...
@@ -0,0 +1,291 @@
+r"""
+Interned, hashable values of attributes and colors of text, rendered as Select Graphic Rendition.
+
+A :class:`Style` is the whole state of text attributes and colors: a bitmask of attributes, such
+as :data:`BOLD`, and a foreground and background color. Equal styles are the same object, so they
+are compared, hashed, and used as keys of a dict as cheaply as an :class:`int`:
+
+    >>> Style(BOLD, fg=1) is Style.parse('bold_red')
+    True
+    >>> (Style(BOLD) + Style(fg=1, bg=4)).sgr
+    u'\x1b[0;1;31;44m'
+
+Colors are ``None`` for the default color, an :class:`int` of 0 through 255 for a color of the
+256-color palette, or a tuple of (red, green, blue) for a 24-bit color, as of a
+:class:`~.screen.CellStyle`. A style is given to a terminal by :meth:`~.Terminal.style`.
+"""
+# local
+from .colorspace import CGA_COLORS, X11_COLORNAMES_TO_RGB
+from .formatters import split_compound
+
+__all__ = ('ATTRIBUTES', 'BLINK', 'BOLD', 'DEFAULT', 'DIM', 'INVISIBLE', 'ITALIC', 'REVERSE',
+           'STRIKE', 'Style', 'UNDERLINE')
+
+#: Names of attributes of a :class:`Style`, by bit, as the fields of :class:`~.screen.CellStyle`.
+ATTRIBUTES = ('bold', 'dim', 'italic', 'underline', 'blink', 'reverse', 'invisible', 'strike')
+
+#: Bit of each attribute of :attr:`Style.bits`.
+BOLD, DIM, ITALIC, UNDERLINE, BLINK, REVERSE, INVISIBLE, STRIKE = (
+    1 << index for index in range(len(ATTRIBUTES)))
+
+#: Parameter of SGR that sets each attribute, by bit.
+_SGR_ON = ((BOLD, u'1'), (DIM, u'2'), (ITALIC, u'3'), (UNDERLINE, u'4'), (BLINK, u'5'),
+           (REVERSE, u'7'), (INVISIBLE, u'8'), (STRIKE, u'9'))
+
+#: Parameter of SGR that resets each attribute, by bit. Parameter 22 resets both bold and dim.
+_SGR_OFF = {BOLD: u'22', DIM: u'22', ITALIC: u'23', UNDERLINE: u'24', BLINK: u'25',
+            REVERSE: u'27', INVISIBLE: u'28', STRIKE: u'29'}
+
+#: Palette index of each CGA color name.
+_CGA_INDEX = {'black': 0, 'red': 1, 'green': 2, 'yellow': 3,
+              'blue': 4, 'magenta': 5, 'cyan': 6, 'white': 7}
+assert set(_CGA_INDEX) == CGA_COLORS
+
+#: Bit of each attribute name of a compound formatter, such as ``'bold'`` of ``'bold_red'``.
+_NAMED_BITS = dict(zip(ATTRIBUTES, (BOLD, DIM, ITALIC, UNDERLINE, BLINK, REVERSE, INVISIBLE,
+                                    STRIKE)), standout=REVERSE, normal=0)
+
+#: Every style, by (bits, fg, bg).
+_INTERNED = {}
+
+#: Maximum number of sequences remembered by :meth:`Style.diff`.
+_TRANSITIONS_MAXSIZE = 4096
+
+#: Sequences of SGR from one style to another, by (from, to).
+_TRANSITIONS = {}
+
+
+def _color_params(color, base):
+    """
+    Return parameters of SGR that set ``color``.
+
+    :arg color: color of a :class:`Style`.
+    :arg int base: *30* for the foreground color, *40* for the background color.
+    :rtype: str
+    """
+    if color is None:
+        return u'{0}'.format(base + 9)
+    if isinstance(color, tuple):
+        return u'{0};2;{1};{2};{3}'.format(base + 8, *color)
+    if color < 8:
+        return u'{0}'.format(base + color)
+    if color < 16:
+        return u'{0}'.format(base + 60 + color - 8)
+    return u'{0};5;{1}'.format(base + 8, color)
+
+
+def _check_color(color):
+    """Return ``color`` of a :class:`Style`, as a tuple when of red, green, and blue."""
+    if color is None:
+        return None
+    if isinstance(color, int) and not isinstance(color, bool) and 0 <= color <= 255:
+        return color
+    if isinstance(color, (tuple, list)) and len(color) == 3 and all(
+            isinstance(value, int) and 0 <= value <= 255 for value in color):
+        return tuple(color)
+    raise ValueError('color must be None, 0 through 255, or (red, green, blue): '
+                     '{0!r}'.format(color))
+
+
+class Style(object):
+    """
+    Attributes and colors of text, interned: equal styles are the same object.
+
+    Styles are combined by ``+``, of which the attributes of both are set, and the colors of the
+    right operand are used, but for those of the default color:
+
+        >>> Style.parse('bold_red') + Style.parse('underline_on_blue')
+        Style(bits=BOLD|UNDERLINE, fg=1, bg=4)
+    """
+
+    __slots__ = ('_bits', '_fg', '_bg', '_sgr')
+
+    def __new__(cls, bits=0, fg=None, bg=None):
+        """
+        Return the style of ``bits``, ``fg``, and ``bg``.
+
+        :arg int bits: attributes, any of :data:`BOLD`, :data:`DIM`, :data:`ITALIC`,
+            :data:`UNDERLINE`, :data:`BLINK`, :data:`REVERSE`, :data:`INVISIBLE`, and
+            :data:`STRIKE`, combined by ``|``.
+        :arg fg: foreground color, ``None`` for the default color, 0 through 255 of the
+            256-color palette, or a tuple of (red, green, blue).
+        :arg bg: background color, as ``fg``.
+        :raises ValueError: ``bits`` or a color is not valid.
+        :rtype: Style
+        """
+        if (not isinstance(bits, int) or isinstance(bits, bool)
+                or not 0 <= bits < 1 << len(ATTRIBUTES)):
+            raise ValueError('bits must be of attributes BOLD through STRIKE: '
+                             '{0!r}'.format(bits))
+        fg, bg = _check_color(fg), _check_color(bg)
+        key = (bits, fg, bg)
+        if key not in _INTERNED:
+            style = object.__new__(cls)
+            for name, value in (('_bits', bits), ('_fg', fg), ('_bg', bg), ('_sgr', None)):
+                object.__setattr__(style, name, value)
+            _INTERNED[key] = style
+        return _INTERNED[key]
+
+    @classmethod
+    def parse(cls, name):
+        """
+        Return the style of a compound formatter, such as ``'bold_red_on_bright_blue'``.
+
+        :arg str name: attribute names, CGA or X11 color names, any prefixed by ``on_`` for the
+            background, or ``bright_`` for CGA colors 8 through 15, joined by ``_``. Color names
+            of X11 are of their (red, green, blue).
+        :raises ValueError: ``name`` is not of attributes and colors.
+        :rtype: Style
+        """
+        bits, colors = 0, {'fg': None, 'bg': None}
+        for segment in split_compound(name):
+            if segment in _NAMED_BITS:
+                bits |= _NAMED_BITS[segment]
+                continue
+            layer = 'fg'
+            if segment.startswith('on_'):
+                layer, segment = 'bg', segment[3:]
+            offset = 0
+            if segment.startswith('bright_'):
+                offset, segment = 8, segment[7:]
+                if segment not in _CGA_INDEX:
+                    raise ValueError('not a CGA color: {0!r} of {1!r}'.format(segment, name))
+            if segment in _CGA_INDEX:
+                colors[layer] = _CGA_INDEX[segment] + offset
+            elif segment in X11_COLORNAMES_TO_RGB:
+                colors[layer] = tuple(X11_COLORNAMES_TO_RGB[segment])
+            else:
+                raise ValueError('not an attribute or color: {0!r} of {1!r}'.format(
+                    segment, name))
+        return cls(bits, colors['fg'], colors['bg'])
+
+    @classmethod
+    def from_cell_style(cls, cell_style):
+        """
+        Return the style of :class:`~.screen.CellStyle` ``cell_style``.
+
+        :arg CellStyle cell_style: attributes and colors of a cell of a :class:`~.screen.Screen`.
+        :rtype: Style
+        """
+        bits = sum(1 << index for index, name in enumerate(ATTRIBUTES)
+                   if getattr(cell_style, name))
+        return cls(bits, cell_style.fg, cell_style.bg)
+
+    @property
+    def bits(self):
+        """Attributes, as a bitmask of :data:`BOLD` through :data:`STRIKE`."""
+        return self._bits
+
+    @property
+    def fg(self):
+        """Foreground color, ``None`` for the default color."""
+        return self._fg
+
+    @property
+    def bg(self):
+        """Background color, ``None`` for the default color."""
+        return self._bg
+
+    @property
+    def attributes(self):
+        """
+        Names of attributes set, of :data:`ATTRIBUTES`.
+
+        :rtype: tuple
+        """
+        return tuple(name for index, name in enumerate(ATTRIBUTES) if self._bits & 1 << index)
+
+    @property
+    def cell_style(self):
+        """
+        Attributes and colors, as a :class:`~.screen.CellStyle`.
+
+        :rtype: CellStyle
+        """
+        from .screen import CellStyle  # pylint: disable=import-outside-toplevel
+        return CellStyle(*([bool(self._bits & 1 << index) for index in range(len(ATTRIBUTES))]
+                           + [self._fg, self._bg]))
+
+    @property
+    def sgr(self):
+        r"""
+        Sequence of SGR that sets this style, from any other, rendered once.
+
+        All attributes are reset by the sequence, such as ``u'\x1b[0;1;31m'``, but for the
+        default style, of only ``u'\x1b[m'``.
+
+        :rtype: str
+        """
+        if self._sgr is None:
+            params = [u'0'] + [param for bit, param in _SGR_ON if self._bits & bit]
+            if self._fg is not None:
+                params.append(_color_params(self._fg, 30))
+            if self._bg is not None:
+                params.append(_color_params(self._bg, 40))
+            object.__setattr__(self, '_sgr', u'\x1b[{0}m'.format(
+                u';'.join(params) if len(params) > 1 else u''))
+        return self._sgr
+
+    def diff(self, target):
+        r"""
+        Return the shortest sequence of SGR that changes this style to ``target``.
+
+        :arg Style target: style to change to.
+        :rtype: str
+        :returns: ``u''`` when ``target`` is this style, otherwise the parameters that change
+            only the attributes and colors that differ, such as ``u'\x1b[22;34m'``, or the
+            :attr:`sgr` of ``target``, when shorter.
+        """
+        if target is self:
+            return u''
+        key = (self, target)
+        try:
+            return _TRANSITIONS[key]
+        except KeyError:
+            pass
+        params = []
+        removed, added = self._bits & ~target.bits, target.bits & ~self._bits
+        if removed & (BOLD | DIM):
+            # parameter 22 resets both, set again any remaining.
+            added |= target.bits & (BOLD | DIM)
+        params.extend(param for bit, param in _SGR_ON if added & bit)
+        params[:0] = sorted(set(param for bit, param in _SGR_OFF.items() if removed & bit))
+        if target.fg != self._fg:
+            params.append(_color_params(target.fg, 30))
+        if target.bg != self._bg:
+            params.append(_color_params(target.bg, 40))
+        sequence = u'\x1b[{0}m'.format(u';'.join(params))
+        if len(target.sgr) <= len(sequence):
+            sequence = target.sgr
+        if len(_TRANSITIONS) >= _TRANSITIONS_MAXSIZE:
+            _TRANSITIONS.clear()
+        _TRANSITIONS[key] = sequence
+        return sequence
+
+    def __add__(self, other):
+        """
+        Return style of attributes of both, and the colors of ``other``, but for default colors.
+
+        :arg Style other: style combined.
+        :rtype: Style
+        """
+        if not isinstance(other, Style):
+            return NotImplemented
+        key = (self._bits | other.bits,
+               self._fg if other.fg is None else other.fg,
+               self._bg if other.bg is None else other.bg)
+        return _INTERNED.get(key) or Style(*key)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Style is immutable')
+
+    def __reduce__(self):
+        return Style, (self._bits, self._fg, self._bg)
+
+    def __repr__(self):
+        bits = u'|'.join(name.upper() for name in self.attributes) or u'0'
+        return u'Style(bits={0}, fg={1!r}, bg={2!r})'.format(bits, self._fg, self._bg)
+
+
+#: Style of default attributes and colors.
+DEFAULT = Style()
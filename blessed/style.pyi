@@ -0,0 +1,42 @@
+# std imports
+from typing import Any, Tuple, Union, Optional
+
+# local
+from .screen import CellStyle
+
+_Color = Optional[Union[int, Tuple[int, int, int]]]
+
+ATTRIBUTES: Tuple[str, ...]
+BOLD: int
+DIM: int
+ITALIC: int
+UNDERLINE: int
+BLINK: int
+REVERSE: int
+INVISIBLE: int
+STRIKE: int
+
+class Style:
+    def __new__(cls, bits: int = ..., fg: _Color = ..., bg: _Color = ...) -> Style: ...
+    @classmethod
+    def parse(cls, name: str) -> Style: ...
+    @classmethod
+    def from_cell_style(cls, cell_style: CellStyle) -> Style: ...
+    @property
+    def bits(self) -> int: ...
+    @property
+    def fg(self) -> _Color: ...
+    @property
+    def bg(self) -> _Color: ...
+    @property
+    def attributes(self) -> Tuple[str, ...]: ...
+    @property
+    def cell_style(self) -> CellStyle: ...
+    @property
+    def sgr(self) -> str: ...
+    def diff(self, target: Style) -> str: ...
+    def __add__(self, other: Style) -> Style: ...
+    def __setattr__(self, name: str, value: Any) -> None: ...
+    def __reduce__(self) -> Tuple[Any, ...]: ...
+
+DEFAULT: Style
@@ -18,13 +18,24 @@ import collections
 
 # local
 from .color import COLOR_DISTANCE_ALGORITHMS
+from .cursor import CursorTracker, _TrackingStream
+from ._width import is_narrow, text_width
 from .keyboard import (_time_left,
                        _read_until,
                        resolve_sequence,
                        get_keyboard_codes,
                        get_leading_prefixes,
                        get_keyboard_sequences)
-from .sequences import Termcap, Sequence, SequenceTextWrapper
+from .sequences import (_RE_PLAIN,
+                        SEQUENCE_TOKENIZERS,
+                        Termcap,
+                        Sequence,
+                        SequenceCache,
+                        StyledText,
+                        SequenceTextWrapper,
+                        iter_spans)
+from .style import Style
+from .screen import Screen
 from .colorspace import RGB_256TABLE
 from .formatters import (COLORS,
                          COMPOUNDABLES,
@@ -71,6 +82,9 @@ else:
 
 _CUR_TERM = None  # See comments at end of file
 
+#: Capability of each attribute of a :class:`~.Style`, by bit, see :data:`.style.ATTRIBUTES`.
+_STYLE_CAPNAMES = ('bold', 'dim', 'sitm', 'smul', 'blink', 'rev', 'invis', 'smxx')
+
 
 class Terminal(object):
     """
@@ -158,6 +172,8 @@ class Terminal(object):
         self._line_buffered = True
 
         self._stream = stream
+        # a Screen given as stream is of its own size, see '_height_and_width'.
+        self._screen = stream if isinstance(stream, Screen) else None
         self._keyboard_fd = None
         self._init_descriptor = None
         self._is_a_tty = False
@@ -303,6 +319,33 @@ class Terminal(object):
             '({0})'.format(cap.pattern) for name, cap in self.caps.items()
         ) + '|(.)')
 
+        # as '_caps_compiled_any', but for 'iter_spans', where a run of text
+        # not beginning any sequence is matched by group 'TEXT'. All known
+        # sequences begin by a C0 or C1 control character.
+        self._caps_compiled_runs = re.compile('|'.join(
+            cap.named_pattern for name, cap in self.caps.items()
+        ) + r'|(?P<TEXT>[^\x00-\x1f\x7f-\x9f]+)|(?P<MISMATCH>.)')
+
+        # for the 'ecma48' tokenizer, sequences are resolved to 'self.caps' by
+        # a full match of this pattern, compiled on first use, and remembered.
+        self._caps_compiled_full = None
+        self._caps_resolved = {}
+        self._sequence_tokenizer = 'regex'
+        self._sequence_cache = SequenceCache()
+
+        # for 'strip_seqs_bytes', patterns of bytes compiled on first use, by encoding.
+        self._caps_compiled_bytes = {}
+
+        # software model of the cursor position, enabled by 'track_cursor'.
+        self._cursor_tracker = None
+
+        # instances of SequenceTextWrapper by their arguments, reused by 'wrap' and 'measure'.
+        self._wrappers = {}
+
+        # sequences of each Style, by Style or name, rendered by 'style'.
+        self._styles = {}
+        self._styles_sgr = None
+
     def __init__keycodes(self):
         # Initialize keyboard data determined by capability.
         # Build database of int code <=> KEY_NAME.
@@ -488,7 +531,12 @@ class Terminal(object):
 
             .. note:: the peculiar (height, width, width, height) order, which
                matches the return order of TIOCGWINSZ!
+
+        When :attr:`stream` is a :class:`~.screen.Screen`, its size is returned instead.
         """
+        if self._screen is not None:
+            return WINSZ(ws_row=self._screen.height, ws_col=self._screen.width,
+                         ws_xpixel=0, ws_ypixel=0)
         for fd in (self._init_descriptor, sys.__stdout__):
             try:
                 if fd is not None:
@@ -529,7 +577,12 @@ class Terminal(object):
         simply want to restore your place after doing some manual cursor
         movement.
 
-        Calls cannot be nested: only one should be entered at a time.
+        Calls cannot be nested: only one should be entered at a time, unless :attr:`track_cursor`
+        is enabled. Then, the position is saved by the :attr:`cursor_tracker`, and restored by
+        :meth:`move_yx` rather than ``restore``, so that calls may be nested. The position is
+        queried by :meth:`get_location` only when it is not known, and, should the terminal not
+        respond within :attr:`~.CursorTracker.sync_timeout`, or not have a keyboard, saved and
+        restored by the terminal.
 
         .. note:: The argument order *(x, y)* differs from the return value order *(y, x)*
             of :meth:`get_location`, or argument order *(y, x)* of :meth:`move`. This is
@@ -539,7 +592,11 @@ class Terminal(object):
         #         Invalid argument name "x"
 
         # Save position and move to the requested column, row, or both:
-        self.stream.write(self.save)
+        saved, tracker = (-1, -1), self._cursor_tracker
+        if tracker is not None and (self._keyboard_fd is not None or tracker.position):
+            saved = self.get_location(timeout=tracker.sync_timeout)
+        if saved == (-1, -1):
+            self.stream.write(self.save)
         if x is not None and y is not None:
             self.stream.write(self.move(y, x))
         elif x is not None:
@@ -551,7 +608,10 @@ class Terminal(object):
             yield
         finally:
             # Restore original cursor position:
-            self.stream.write(self.restore)
+            if saved == (-1, -1):
+                self.stream.write(self.restore)
+            else:
+                self.stream.write(self.move_from(None, saved))
             self.stream.flush()
 
     def get_location(self, timeout=None):
@@ -585,6 +645,9 @@ class Terminal(object):
             ...
             >>> assert given_x == result_x, (given_x, result_x)
             >>> assert given_y == result_y, (given_y, result_y)
+
+        When :attr:`track_cursor` is enabled, the position is answered by the
+        :attr:`cursor_tracker` without a query, while it is known.
         """
         # Local lines attached by termios and remote login protocols such as
         # ssh and telnet both provide a means to determine the window
@@ -602,6 +665,11 @@ class Terminal(object):
         # >  u8   terminal answerback description
         # >  u7   cursor position request (equiv. to VT100/ANSI/ECMA-48 DSR 6)
         # >  u6   cursor position report (equiv. to ANSI/ECMA-48 CPR)
+        tracker = self._cursor_tracker
+        position = tracker and tracker.position
+        if position:
+            return position
+
         query_str = self.u7 or u'\x1b[6n'
         response_str = getattr(self, self.caps['cursor_report'].attribute) or u'\x1b[%i%d;%dR'
 
@@ -650,6 +718,8 @@ class Terminal(object):
                 if u'%i' in response_str:
                     row -= 1
                     col -= 1
+                if tracker is not None:
+                    tracker.sync(row, col)
                 return row, col
 
         finally:
@@ -731,6 +801,96 @@ class Terminal(object):
         """
         return self.move(y, x)
 
+    def move_from(self, cur, target, line=None):
+        """
+        Return the shortest sequence that moves the cursor from ``cur`` to ``target``.
+
+        :arg tuple cur: current position as (y, x), or ``None`` for that of the
+            :attr:`cursor_tracker`, if any. The cursor is moved by :meth:`move_yx` when the
+            position is not known.
+        :arg tuple target: position as (y, x).
+        :arg str line: Text displayed in the row of ``target``, from its first column, that may be
+            printed again to move the cursor to the right, when it is of the current attributes,
+            and of only characters of width 1.
+        :rtype: str
+        :returns: Sequence of fewest characters, of those of absolute movement, by
+            :meth:`move_yx`, :meth:`move_x`, or :meth:`move_y`, of relative movement, such as by
+            :attr:`move_right` or :attr:`move_up`, each from the current position, from the
+            first column after a carriage return, or from the home position.
+
+        Such as of a renderer that writes only the cells changed, over a slow connection:
+
+            >>> term.move_from((10, 40), (11, 2))
+            u'\r\n\x1b[2C'
+            >>> term.move_from((11, 0), (11, 2), line=u'ok, done')
+            u'ok'
+
+        A newline is written only after a carriage return, or in the first column, so that the
+        column is the same whether or not the terminal returns the carriage for each newline.
+        """
+        if not self._does_styling:
+            return u''
+        if cur is None and self._cursor_tracker is not None:
+            cur = self._cursor_tracker.position
+        y, x = target
+        if cur is None:
+            return self.move_yx(y, x)
+        if tuple(cur) == (y, x):
+            return u''
+        if line is not None and not (len(line) >= x and _RE_PLAIN.match(line[:x])
+                                     and is_narrow(line[:x])):
+            line = None
+        plans = [self.move_yx(y, x)]
+        starts = [(u'', cur[0], cur[1])]
+        starts.extend((prefix, y0, 0) for prefix, y0 in ((self.cr, cur[0]), (self.home, 0)) if prefix)
+        for prefix, y0, x0 in starts:
+            vertical = self._move_vertical(y0, y, newline=x0 == 0)
+            horizontal = self._move_horizontal(x0, x, line)
+            if vertical is not None and horizontal is not None:
+                plans.append(prefix + vertical + horizontal)
+        plans = [plan for plan in plans if plan]
+        return min(plans, key=len) if plans else u''
+
+    def _move_vertical(self, y0, y, newline):
+        """
+        Return the shortest sequence that moves the cursor from row ``y0`` to ``y``, or ``None``.
+
+        :arg int y0: current row.
+        :arg int y: target row.
+        :arg bool newline: whether the cursor is of the first column, so that a newline may
+            move it down, whether or not the carriage is also returned.
+        :rtype: str or None
+        """
+        if y == y0:
+            return u''
+        distance = abs(y - y0)
+        one, many = (self.cud1, self.cud) if y > y0 else (self.cuu1, self.cuu)
+        if one == u'\n' and not newline:
+            one = u''
+        moves = [move for move in (one * distance, many(distance), self.move_y(y)) if move]
+        return min(moves, key=len) if moves else None
+
+    def _move_horizontal(self, x0, x, line):
+        """
+        Return the shortest sequence that moves the cursor from column ``x0`` to ``x``, or ``None``.
+
+        :arg int x0: current column.
+        :arg int x: target column.
+        :arg str line: text displayed in the row, printed again to move right, or ``None``.
+        :rtype: str or None
+        """
+        if x == x0:
+            return u''
+        distance = abs(x - x0)
+        if x > x0:
+            one, many = self.cuf1, self.cuf
+            reprint = line[x0:x] if line is not None else u''
+        else:
+            one, many, reprint = self.cub1, self.cub, u''
+        moves = [move for move in (reprint, one * distance, many(distance), self.move_x(x))
+                 if move]
+        return min(moves, key=len) if moves else None
+
     @property
     def move_left(self):
         """Move cursor 1 cells to the left, or callable string for n>1 cells."""
@@ -844,6 +1004,72 @@ class Terminal(object):
 
         return NullCallableString()
 
+    def style(self, style):
+        r"""
+        Provides callable formatting string that sets a :class:`~.Style` of attributes and colors.
+
+        :arg style: :class:`~.Style`, or name of a compound formatter, such as ``'bold_red'``.
+        :rtype: :class:`FormattingString` or :class:`NullCallableString`
+        :raises ValueError: ``style`` is a name not of attributes and colors.
+        :returns: Callable string that resets all attributes, and sets those of ``style``.
+
+        The sequence of each style is rendered only once: when the terminal's capabilities are
+        of ANSI Select Graphic Rendition, as of most terminals, it is that of :attr:`.Style.sgr`,
+        such as ``u'\x1b[0;1;31m'``, without looking up each capability. Colors not supported
+        by the terminal are converted to the nearest supported color, as by
+        :meth:`rgb_downconvert`.
+        """
+        if not self.does_styling:
+            return NullCallableString()
+        try:
+            return self._styles[style]
+        except KeyError:
+            pass
+        value = style if isinstance(style, Style) else Style.parse(style)
+        if value not in self._styles:
+            self._styles[value] = FormattingString(self._render_style(value), self.normal)
+        self._styles[style] = self._styles[value]
+        return self._styles[style]
+
+    def _render_style(self, style):
+        """Return sequence that resets all attributes, and sets those of :class:`~.Style`."""
+        fg, bg = self._style_color(style.fg), self._style_color(style.bg)
+        if self._styles_sgr is None:
+            # capabilities of ANSI Select Graphic Rendition, such as of xterm
+            self._styles_sgr = (self.normal.endswith((u'\x1b[m', u'\x1b[0m'))
+                                and self.bold == u'\x1b[1m'
+                                and self.color(1) == u'\x1b[31m')
+        if self._styles_sgr:
+            return Style(style.bits, fg, bg).sgr
+        sequence = [self.normal]
+        sequence.extend(getattr(self, capname) for index, capname in enumerate(_STYLE_CAPNAMES)
+                        if style.bits & 1 << index)
+        if isinstance(fg, tuple):
+            sequence.append(self.color_rgb(*fg))
+        elif fg is not None:
+            sequence.append(self.color(fg))
+        if isinstance(bg, tuple):
+            sequence.append(self.on_color_rgb(*bg))
+        elif bg is not None:
+            sequence.append(self.on_color(bg))
+        return u''.join(sequence)
+
+    def _style_color(self, color):
+        """Return color of a :class:`~.Style` supported by this terminal, ``None`` if none."""
+        if color is None or not self.number_of_colors:
+            return None
+        if isinstance(color, tuple):
+            if self.number_of_colors == 1 << 24:
+                return color
+        elif color < self.number_of_colors:
+            return color
+        else:
+            color = RGB_256TABLE[color]
+        # nearest of only the colors supported, 'rgb_downconvert' may return the next.
+        fn_distance = COLOR_DISTANCE_ALGORITHMS[self.color_distance_algorithm]
+        return min(range(min(self.number_of_colors, len(RGB_256TABLE))),
+                   key=lambda idx: fn_distance(RGB_256TABLE[idx], color))
+
     def rgb_downconvert(self, red, green, blue):
         """
         Translate an RGB color to a color code of the terminal's color depth.
@@ -967,6 +1193,97 @@ class Terminal(object):
         self._color_distance_algorithm = value
         self.__clear_color_capabilities()
 
+    @property
+    def sequence_tokenizer(self):
+        r"""
+        Tokenizer used to find sequences in text by :func:`~.sequences.iter_spans`.
+
+        The default, ``'regex'``, tries the pattern of every known capability at each position of
+        the text, and any unknown sequences are measured as printable characters.
+
+        Option ``'ecma48'`` finds the boundaries of all sequences in a single scan by the `ECMA-48`_
+        grammar of control functions, and only then resolves each sequence found to its capability.
+        This is much faster for long strings, and sequences unknown to the terminfo database, such
+        as ``'\x1b[?2004h'``, or window titles, are also measured as a length of *0*.
+
+        .. _ECMA-48: https://www.ecma-international.org/publications-and-standards/standards/ecma-48/
+        """
+        return self._sequence_tokenizer
+
+    @sequence_tokenizer.setter
+    def sequence_tokenizer(self, value):
+        assert value in SEQUENCE_TOKENIZERS
+        self._sequence_tokenizer = value
+        self._sequence_cache.clear()
+
+    @property
+    def sequence_cache(self):
+        """
+        Read-only property: cache of results of sequence-aware methods.
+
+        :rtype: ~.sequences.SequenceCache
+
+        Results of :meth:`length`, :meth:`strip_seqs`, :meth:`strip`, :meth:`lstrip`,
+        :meth:`rstrip`, :meth:`truncate`, and :meth:`slice_cells` are remembered for the 1024 most
+        recently used arguments of strings of at most 256 characters. Its size may be changed, or
+        the cache disabled by a size of *0*::
+
+            >>> term.sequence_cache.maxsize = 0
+        """
+        return self._sequence_cache
+
+    @property
+    def track_cursor(self):
+        """
+        Whether the cursor position is followed by a :class:`~.CursorTracker`, default ``False``.
+
+        When enabled, the :attr:`stream` is wrapped so that output written to it updates the
+        :attr:`cursor_tracker`, and :meth:`get_location` answers without a query of the terminal
+        while the position is known. Output must be written to :attr:`stream` to be followed::
+
+            >>> term.track_cursor = True
+            >>> print(term.move_yx(5, 0) + u'hello', end=u'', file=term.stream)
+            >>> term.get_location()
+            (5, 5)
+        """
+        return self._cursor_tracker is not None
+
+    @track_cursor.setter
+    def track_cursor(self, value):
+        if value and self._cursor_tracker is None:
+            self._cursor_tracker = CursorTracker(self)
+            self._stream = _TrackingStream(self._stream, self._cursor_tracker)
+        elif not value and self._cursor_tracker is not None:
+            self._stream = self._stream.stream
+            self._cursor_tracker = None
+
+    @property
+    def cursor_tracker(self):
+        """
+        Read-only property: model of the cursor position, when :attr:`track_cursor` is enabled.
+
+        :rtype: ~.cursor.CursorTracker or None
+        """
+        return self._cursor_tracker
+
+    def _sequence_call(self, name, text, *args):
+        """
+        Return result of :class:`~.Sequence` method ``name`` for ``text``, by the sequence cache.
+
+        :arg str name: method name of :class:`~.Sequence`
+        :arg str text: String that may contain sequences.
+        :arg args: positional arguments of the method, used with ``name`` and ``text`` as key.
+        """
+        cache = self._sequence_cache
+        if not cache.maxsize or len(text) > cache.maxlength:
+            return getattr(Sequence(text, self), name)(*args)
+        key = (name, text) + args
+        try:
+            return cache[key]
+        except KeyError:
+            result = cache[key] = getattr(Sequence(text, self), name)(*args)
+            return result
+
     @property
     def _foreground_color(self):
         """
@@ -1006,6 +1323,26 @@ class Terminal(object):
             width = self.width
         return Sequence(text, self).ljust(width, fillchar)
 
+    def ljust_many(self, texts, width=None, fillchar=u' '):
+        """
+        Left-align each of ``texts``, which may contain terminal sequences.
+
+        :arg texts: Iterable of strings to be aligned, such as the cells of a column of a table
+        :arg int width: Total width to fill with each aligned text. If
+            unspecified, the whole width of the terminal is filled.
+        :arg str fillchar: String for padding the right of each text
+        :rtype: list
+        :returns: List of each of ``texts``, left-aligned by ``width``, as by :meth:`ljust`.
+
+        Each text is measured as by :meth:`lengths`.
+        """
+        if width is None:
+            width = self.width
+        texts = list(texts)
+        width, fill_length = int(width), len(fillchar)
+        return [u''.join((text, fillchar * (max(0, width - length) // fill_length)))
+                for text, length in zip(texts, self.lengths(texts))]
+
     def rjust(self, text, width=None, fillchar=u' '):
         """
         Right-align ``text``, which may contain terminal sequences.
@@ -1050,7 +1387,27 @@ class Terminal(object):
         """
         if width is None:
             width = self.width
-        return Sequence(text, self).truncate(width)
+        return self._sequence_call('truncate', text, int(width))
+
+    def slice_cells(self, text, start, stop=None):
+        r"""
+        Return printable cells of ``text`` from column ``start`` to ``stop``, retaining sequences.
+
+        :arg str text: Text to slice
+        :arg int start: First column, counted from 0
+        :arg int stop: Column following the last, or ``None`` for all columns to the end
+        :rtype: str
+        :returns: ``text`` of only the printable characters within columns ``start`` to ``stop``
+
+        All terminal sequences remain, so that the slice is displayed in the same style as those
+        same columns of ``text``. A wide character only partly within the columns is replaced by
+        spaces, such as for horizontal scrolling of a viewport:
+
+        >>> term.slice_cells(u'\x1b[31mコンニチハ\x1b[m', 3, 7)
+        u'\x1b[31m ニ \x1b[m'
+        """
+        return self._sequence_call('slice_cells', text, int(start),
+                                   None if stop is None else int(stop))
 
     def length(self, text):
         u"""
@@ -1071,8 +1428,31 @@ class Terminal(object):
             "movement sequence" because it would move the cursor to
             (y, x)(0, 0), are evaluated as a printable length of
             *0*.
+
+        The length of a :class:`~.StyledText` is its :attr:`~.StyledText.width`, known without
+        measuring its text again.
+        """
+        if isinstance(text, StyledText):
+            return text.width
+        return self._sequence_call('length', text)
+
+    def lengths(self, texts):
+        """
+        Return printable length of each of ``texts``, which may contain sequences.
+
+        :arg texts: Iterable of strings to measure, such as the cells of a column of a table
+        :rtype: list
+        :returns: List of the printable length of each of ``texts``, as by :meth:`length`.
+
+        Any text without control characters, and so without sequences, is measured directly by
+        the printable width of its characters, and only the remaining are measured by
+        :meth:`length`:
+
+        >>> term.lengths([u'name', term.bold(u'コンニチハ'), u'x'])
+        [4, 10, 1]
         """
-        return Sequence(text, self).length()
+        length, plain = self.length, _RE_PLAIN.match
+        return [text_width(text) if plain(text) else length(text) for text in texts]
 
     def strip(self, text, chars=None):
         r"""
@@ -1084,7 +1464,7 @@ class Terminal(object):
         >>> term.strip(u' \x1b[0;3m xyz ')
         u'xyz'
         """
-        return Sequence(text, self).strip(chars)
+        return self._sequence_call('strip', text, chars)
 
     def rstrip(self, text, chars=None):
         r"""
@@ -1096,7 +1476,7 @@ class Terminal(object):
         >>> term.rstrip(u' \x1b[0;3m xyz ')
         u'  xyz'
         """
-        return Sequence(text, self).rstrip(chars)
+        return self._sequence_call('rstrip', text, chars)
 
     def lstrip(self, text, chars=None):
         r"""
@@ -1108,7 +1488,7 @@ class Terminal(object):
         >>> term.lstrip(u' \x1b[0;3m xyz ')
         u'xyz '
         """
-        return Sequence(text, self).lstrip(chars)
+        return self._sequence_call('lstrip', text, chars)
 
     def strip_seqs(self, text):
         r"""
@@ -1126,9 +1506,42 @@ class Terminal(object):
             (such as ``\b`` or ``term.cuf(5)``) are replaced by destructive
             space or erasing.
         """
-        return Sequence(text, self).strip_seqs()
+        return self._sequence_call('strip_seqs', text)
 
-    def split_seqs(self, text, maxsplit=0):
+    def strip_seqs_map(self, text):
+        r"""
+        Return ``text`` stripped of its terminal sequences, mapped to the offsets of ``text``.
+
+        :arg str text: String that may contain sequences.
+        :rtype: ~.sequences.StrippedText
+        :returns: Text as by :meth:`strip_seqs`, with the offset in ``text``, and column, of each
+            of its characters, so that a search of the text displayed may be highlighted in one
+            pass:
+
+        >>> stripped = term.strip_seqs_map(term.red(u'Hello') + u', world')
+        >>> start = stripped.text.index(u'o, w')
+        >>> stripped.offsets[start], stripped.columns[start]
+        (9, 4)
+        >>> stripped.highlight([(start, start + 4)], term.standout, term.no_standout)
+        u'\x1b[31mHell\x1b[7mo\x1b(B\x1b[m, w\x1b[27morld'
+        """
+        return Sequence(text, self).strip_seqs_map()
+
+    def strip_seqs_many(self, texts):
+        """
+        Return each of ``texts`` stripped of only its terminal sequences.
+
+        :arg texts: Iterable of strings, such as the cells of a column of a table
+        :rtype: list
+        :returns: List of each of ``texts`` with terminal sequences removed, as by
+            :meth:`strip_seqs`.
+
+        Any text without control characters, and so without sequences, is returned unchanged.
+        """
+        strip_seqs, plain = self.strip_seqs, _RE_PLAIN.match
+        return [text if plain(text) else strip_seqs(text) for text in texts]
+
+    def split_seqs(self, text, maxsplit=0, coalesce=False):
         r"""
         Return ``text`` split by individual character elements and sequences.
 
@@ -1136,6 +1549,9 @@ class Terminal(object):
         :arg int maxsplit: When maxsplit is nonzero, at most maxsplit splits
             occur, and the remainder of the string is returned as the final element
             of the list (same meaning is argument for :func:`re.split`).
+        :arg bool coalesce: When ``True``, text is split only by sequences, each
+            run of characters between them is a single element, as found by
+            :func:`~.sequences.iter_spans`.
         :rtype: list[str]
         :returns: List of sequences and individual characters
 
@@ -1144,7 +1560,19 @@ class Terminal(object):
 
         >>> term.split_seqs(term.underline(u'xyz'), 1)
         ['\x1b[4m', r'xyz\x1b(B\x1b[m']
+
+        >>> term.split_seqs(term.underline(u'xyz'), coalesce=True)
+        ['\x1b[4m', 'xyz', '\x1b(B', '\x1b[m']
         """
+        if coalesce:
+            result = []
+            for idx, (start, end, _) in enumerate(iter_spans(self, text)):
+                if maxsplit and idx == maxsplit:
+                    result.append(text[start:])
+                    break
+                result.append(text[start:end])
+            return result
+
         pattern = self._caps_unnamed_any
         result = []
         for idx, match in enumerate(re.finditer(pattern, text)):
@@ -1171,15 +1599,100 @@ class Terminal(object):
         :returns: List of wrapped lines
 
         See :class:`textwrap.TextWrapper` for keyword arguments that can
-        customize wrapping behaviour.
+        customize wrapping behaviour. Keyword argument ``carry_styles=True``
+        begins each wrapped line with the colors and attributes in effect
+        where it begins, and ends it with :attr:`normal`, so that any line
+        may be displayed, or cached, apart from those before it:
+
+            >>> term.wrap(term.red(u'red paragraph of text'), 9, carry_styles=True)
+            [u'\x1b[31mred\x1b(B\x1b[m', u'\x1b[31mparagraph\x1b(B\x1b[m', ...]
+        """
+        return list(self.iter_wrap(text.splitlines(), width, **kwargs))
+
+    def iter_wrap(self, lines, width=None, index=False, **kwargs):
+        r"""
+        Text-wrap an iterable of lines, yielding each wrapped line.
+
+        :arg lines: Lines of text, such as a file object opened for reading text, or a list of
+            strings. Any line ending of each is removed, and an item containing several lines is
+            wrapped as each of them.
+        :arg int width: width of wrapped lines, default is the width of the attached terminal.
+        :arg bool index: When ``True``, yield ``(index, line)``, where ``index`` is that of the
+            item of ``lines`` wrapped, such as the line number of a file, counted from *0*.
+        :arg \**kwargs: See :py:class:`textwrap.TextWrapper`
+        :rtype: Iterator[str]
+        :returns: Wrapped lines, as by :meth:`wrap`.
+
+        Each line is read and wrapped only as the wrapped lines before it are consumed, so that
+        the first wrapped lines of a large file are available at once, and memory used is
+        bounded by its longest line:
+
+            >>> with open('server.log') as fin:
+            ...     for number, line in term.iter_wrap(fin, index=True):
+            ...         print(term.bright_black(str(number + 1).rjust(6)), line)
+        """
+        wrapper = self._get_wrapper(width, kwargs)
+        for number, item in enumerate(lines):
+            for line in item.splitlines() or (u'',):
+                for wrapped in wrapper.wrap(line) if line.strip() else (u'',):
+                    yield (number, wrapped) if index else wrapped
+
+    def _get_wrapper(self, width, kwargs):
+        """
+        Return :class:`~.SequenceTextWrapper` of given arguments, reused by each call.
+
+        :arg int width: width of wrapped lines, or ``None`` for the width of the terminal.
+        :arg dict kwargs: keyword arguments of :class:`textwrap.TextWrapper`.
+        :rtype: SequenceTextWrapper
         """
         width = self.width if width is None else width
-        wrapper = SequenceTextWrapper(width=width, term=self, **kwargs)
-        lines = []
-        for line in text.splitlines():
-            lines.extend(iter(wrapper.wrap(line)) if line.strip() else (u'',))
+        try:
+            key = (width, tuple(sorted(kwargs.items())))
+            return self._wrappers[key]
+        except TypeError:
+            # an argument that is not hashable
+            return SequenceTextWrapper(width=width, term=self, **kwargs)
+        except KeyError:
+            pass
+        if len(self._wrappers) >= 64:
+            self._wrappers.clear()
+        wrapper = self._wrappers[key] = SequenceTextWrapper(width=width, term=self, **kwargs)
+        return wrapper
+
+    def measure(self, text, width=None, offsets=False, **kwargs):
+        r"""
+        Return number of lines of text wrapped by :meth:`wrap`, without building them.
 
-        return lines
+        :arg str text: text, which may contain terminal sequences.
+        :arg int width: width of wrapped lines, default is the width of the attached terminal.
+        :arg bool offsets: When ``True``, return the offset into ``text`` of the start of each
+            wrapped line, instead of their number.
+        :arg \**kwargs: See :py:class:`textwrap.TextWrapper`
+        :rtype: int or list
+        :returns: ``len(term.wrap(text, width, **kwargs))``, or a list of offsets.
+
+            >>> term.measure(u'hello world, hello!', 12)
+            2
+            >>> term.measure(u'hello world, hello!', 12, offsets=True)
+            [0, 13]
+
+        This is useful to find the height of text that is displayed only in part, such as by a
+        scrolling view. An empty line is a single line, of the offset of its start.
+        """
+        wrapper = self._get_wrapper(width, kwargs)
+        starts = []
+        rows = offset = 0
+        for line in text.splitlines(True):
+            content = line.splitlines()[0]
+            if not content.strip():
+                rows += 1
+                starts.append(offset)
+            elif offsets:
+                starts.extend(offset + start for start in wrapper.measure(content, offsets=True))
+            else:
+                rows += wrapper.measure(content)
+            offset += len(line)
+        return starts if offsets else rows
 
     def getch(self):
         """
@@ -1,9 +1,20 @@
 # std imports
-from typing import IO, Any, List, Tuple, Union, Optional, OrderedDict, ContextManager
+from typing import (IO,
+                    Any,
+                    List,
+                    Tuple,
+                    Union,
+                    Iterable,
+                    Iterator,
+                    Optional,
+                    OrderedDict,
+                    ContextManager)
 
 # local
+from .style import Style
+from .cursor import CursorTracker
 from .keyboard import Keystroke
-from .sequences import Termcap
+from .sequences import Termcap, StrippedText, SequenceCache
 from .formatters import (FormattingString,
                          NullCallableString,
                          ParameterizingString,
@@ -45,6 +56,12 @@ class Terminal:
     def hidden_cursor(self) -> ContextManager[None]: ...
     def move_xy(self, x: int, y: int) -> ParameterizingString: ...
     def move_yx(self, y: int, x: int) -> ParameterizingString: ...
+    def move_from(
+        self,
+        cur: Optional[Tuple[int, int]],
+        target: Tuple[int, int],
+        line: Optional[str] = ...,
+    ) -> str: ...
     @property
     def move_left(self) -> FormattingOtherString: ...
     @property
@@ -60,6 +77,9 @@ class Terminal:
     def on_color(self) -> Union[NullCallableString, ParameterizingString]: ...
     def on_color_rgb(self, red: int, green: int, blue: int) -> FormattingString: ...
     def formatter(self, value: str) -> Union[NullCallableString, FormattingString]: ...
+    def style(
+        self, style: Union[Style, str]
+    ) -> Union[NullCallableString, FormattingString]: ...
     def rgb_downconvert(self, red: int, green: int, blue: int) -> int: ...
     @property
     def normal(self) -> str: ...
@@ -74,9 +94,24 @@ class Terminal:
     def color_distance_algorithm(self) -> str: ...
     @color_distance_algorithm.setter
     def color_distance_algorithm(self, value: str) -> None: ...
+    @property
+    def sequence_tokenizer(self) -> str: ...
+    @sequence_tokenizer.setter
+    def sequence_tokenizer(self, value: str) -> None: ...
+    @property
+    def sequence_cache(self) -> SequenceCache: ...
+    @property
+    def track_cursor(self) -> bool: ...
+    @track_cursor.setter
+    def track_cursor(self, value: bool) -> None: ...
+    @property
+    def cursor_tracker(self) -> Optional[CursorTracker]: ...
     def ljust(
         self, text: str, width: Optional[int] = ..., fillchar: str = ...
     ) -> str: ...
+    def ljust_many(
+        self, texts: Iterable[str], width: Optional[int] = ..., fillchar: str = ...
+    ) -> List[str]: ...
     def rjust(
         self, text: str, width: Optional[int] = ..., fillchar: str = ...
     ) -> str: ...
@@ -84,15 +119,37 @@ class Terminal:
         self, text: str, width: Optional[int] = ..., fillchar: str = ...
     ) -> str: ...
     def truncate(self, text: str, width: Optional[int] = ...) -> str: ...
+    def slice_cells(
+        self, text: str, start: int, stop: Optional[int] = ...
+    ) -> str: ...
     def length(self, text: str) -> int: ...
+    def lengths(self, texts: Iterable[str]) -> List[int]: ...
     def strip(self, text: str, chars: Optional[str] = ...) -> str: ...
     def rstrip(self, text: str, chars: Optional[str] = ...) -> str: ...
     def lstrip(self, text: str, chars: Optional[str] = ...) -> str: ...
     def strip_seqs(self, text: str) -> str: ...
-    def split_seqs(self, text: str, maxsplit: int) -> List[str]: ...
+    def strip_seqs_many(self, texts: Iterable[str]) -> List[str]: ...
+    def strip_seqs_map(self, text: str) -> StrippedText: ...
+    def split_seqs(
+        self, text: str, maxsplit: int = ..., coalesce: bool = ...
+    ) -> List[str]: ...
     def wrap(
         self, text: str, width: Optional[int] = ..., **kwargs: Any
     ) -> List[str]: ...
+    def iter_wrap(
+        self,
+        lines: Iterable[str],
+        width: Optional[int] = ...,
+        index: bool = ...,
+        **kwargs: Any
+    ) -> Iterator[Union[str, Tuple[int, str]]]: ...
+    def measure(
+        self,
+        text: str,
+        width: Optional[int] = ...,
+        offsets: bool = ...,
+        **kwargs: Any
+    ) -> Union[int, List[int]]: ...
     def getch(self) -> str: ...
     def ungetch(self, text: str) -> None: ...
     def kbhit(self, timeout: Optional[float] = ...) -> bool: ...
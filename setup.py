@@ -44,11 +44,19 @@ setuptools.setup(
         'blessed': [
             'py.typed',
             '_capabilities.pyi',
+            '_tparm.pyi',
+            '_width.pyi',
             'color.pyi',
             'colorspace.pyi',
+            'cursor.pyi',
+            'document.pyi',
             'formatters.pyi',
             'keyboard.pyi',
+            'parallel.pyi',
+            'screen.pyi',
             'sequences.pyi',
+            'sgr.pyi',
+            'style.pyi',
             'terminal.pyi',
             'win_terminal.pyi',
         ],
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""Tests for the software model of the cursor position."""
+# 3rd party
+import six
+import pytest
+
+# local
+from blessed.terminal import WINSZ
+
+from .accessories import TestTerminal, as_subprocess
+
+
+@pytest.mark.parametrize('tokenizer', ['regex', 'ecma48'])
+def test_cursor_tracker_movement(tokenizer):
+    """CursorTracker follows text and capabilities that move the cursor."""
+    @as_subprocess
+    def child(tokenizer):
+        from blessed.cursor import CursorTracker
+        term = TestTerminal(stream=six.StringIO(), force_styling=True)
+        term.sequence_tokenizer = tokenizer
+        height, width = 24, 80
+        term._height_and_width = lambda: WINSZ(height, width, 0, 0)
+        tracker = CursorTracker(term)
+        assert tracker.position is None
+        tracker.update(u'abc')
+        assert tracker.position is None
+
+        tracker.update(term.move_yx(5, 10) + u'abc')
+        assert tracker.position == (5, 13)
+        tracker.update(term.red(u'コン') + u'\b' + term.move_left(2) + term.move_right)
+        assert tracker.position == (5, 15)
+        tracker.update(term.move_up(2) + u'\t' + term.move_down(1))
+        assert tracker.position == (4, 16)
+        tracker.update(term.move_x(3) + u'x\r\n\n' + term.move_y(7))
+        assert tracker.position == (7, 0)
+        tracker.update(term.save + term.home + u'abc' + term.restore)
+        assert tracker.position == (7, 0)
+
+        # wrapped at the right margin, and scrolled at the bottom.
+        tracker.update(term.move_yx(height - 2, width - 2) + u'ab')
+        assert tracker.position == (height - 2, width - 1)
+        tracker.update(u'c')
+        assert tracker.position == (height - 1, 1)
+        tracker.update(u'x' * (width * 2) + u'\n')
+        assert tracker.position == (height - 1, 0)
+        tracker.update(term.move_left(5) + term.move_up(height * 2))
+        assert tracker.position == (0, 0)
+
+        # a sequence split by writes.
+        seq = term.move_yx(3, 4)
+        tracker.update(seq[:2])
+        tracker.update(seq[2:] + u'a')
+        assert tracker.position == (3, 5)
+
+        # unknown movement makes the position uncertain, until set.
+        tracker.update(u'\x1b[2E')
+        assert tracker.position is None
+        tracker.update(u'abc' + term.move_y(2))
+        assert tracker.position is None
+        tracker.update(term.move_x(6))
+        assert tracker.position == (2, 6)
+        tracker.update(term.enter_fullscreen)
+        assert tracker.position is None
+
+        # an unknown sequence that does not move the cursor does not.
+        tracker.sync(1, 1)
+        tracker.update(u'\x1b[?2004h\x1b]0;title\x07' + term.bold + u'\x1b[53mab\x1b[?25l')
+        assert tracker.position == (1, 3)
+        tracker.update(u'\x1b[?1049h')
+        assert tracker.position is None
+
+        # leaving the alternate screen restores the cursor of the main screen, not known.
+        tracker.sync(0, 0)
+        tracker.update(term.move_yx(10, 10))
+        tracker.update(term.enter_fullscreen + term.move_yx(3, 3))
+        assert tracker.position == (3, 3)
+        tracker.update(term.exit_fullscreen)
+        assert tracker.position is None
+
+    child(tokenizer)
+
+
+def test_cursor_tracker_resize():
+    """The position is not known once written to after the terminal is resized."""
+    @as_subprocess
+    def child():
+        from blessed.cursor import CursorTracker
+        term = TestTerminal(stream=six.StringIO(), force_styling=True)
+        term._height_and_width = lambda: WINSZ(24, 80, 0, 0)
+        tracker = CursorTracker(term, y=1, x=2)
+        assert tracker.position == (1, 2)
+        term._height_and_width = lambda: WINSZ(24, 81, 0, 0)
+        assert tracker.position == (1, 2)
+
+        # the size is compared once after each update, rather than by each access.
+        calls = []
+        term._height_and_width = lambda: calls.append(1) or WINSZ(24, 81, 0, 0)
+        tracker.update(u'x')
+        assert tracker.position is None
+        tracker.sync(1, 2)
+        tracker.update(u'x')
+        for _ in range(3):
+            assert tracker.position == (1, 3)
+        assert len(calls) == 3
+
+    child()
+
+
+def test_track_cursor():
+    """get_location() answers by the tracker, and location() may be nested."""
+    @as_subprocess
+    def child():
+        stream = six.StringIO()
+        term = TestTerminal(stream=stream, force_styling=True)
+        term._height_and_width = lambda: WINSZ(24, 80, 0, 0)
+        assert not term.track_cursor
+        assert term.cursor_tracker is None
+
+        term.track_cursor = True
+        assert term.track_cursor
+        assert term.stream is not stream
+        term.stream.write(term.move_yx(3, 4) + u'hello')
+        assert stream.getvalue() == term.move_yx(3, 4) + u'hello'
+        assert term.get_location() == (3, 9)
+
+        with term.location(x=0, y=0):
+            term.stream.write(u'outer')
+            with term.location(x=1, y=10):
+                term.stream.write(u'inner')
+                assert term.get_location() == (10, 6)
+            assert term.get_location() == (0, 5)
+        assert term.get_location() == (3, 9)
+        assert term.save not in stream.getvalue()
+        # restored by the shortest movement from the position known.
+        assert stream.getvalue().endswith(
+            term.move_from((10, 6), (0, 5)) + term.move_from((0, 5), (3, 9)))
+
+        # position not known, without keyboard to query: saved by the terminal.
+        term.cursor_tracker.invalidate()
+        with term.location(x=0, y=0):
+            pass
+        assert stream.getvalue().endswith(term.save + term.move_yx(0, 0) + term.restore)
+
+        term.track_cursor = False
+        assert term.stream is stream
+        assert term.cursor_tracker is None
+
+    child()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""Tests for WrappedDocument, paragraphs wrapped lazily for each width."""
+# local
+from blessed.terminal import WINSZ
+
+from .accessories import TestTerminal, as_subprocess
+
+
+def test_wrapped_document_viewport():
+    """Only paragraphs of the viewport are wrapped, and kept for each width."""
+    @as_subprocess
+    def child():
+        from blessed.document import WrappedDocument
+        term = TestTerminal(force_styling=True)
+        term._height_and_width = lambda: WINSZ(24, 10, 0, 0)
+        paragraphs = [term.red(u'paragraph {0} of words'.format(n)) for n in range(1000)]
+        doc = WrappedDocument(term, paragraphs, maxwidths=2)
+        assert len(doc) == 1000 and doc[5] == paragraphs[5]
+
+        lines = doc.viewport(500, 1, 3)
+        assert [term.strip_seqs(line) for line in lines] == [u'500 of', u'words', u'paragraph']
+        assert doc.viewport(500, 1, 3, width=80) == paragraphs[501:504]
+        assert term.strip_seqs(doc.viewport(500, 1, 3, width=11)[0]) == u'500 of'
+        assert doc.widths == [80, 11]
+        assert sorted(doc._layouts[11].lines) == [500, 501]
+
+        # a position beyond a paragraph is that many lines after its start
+        assert doc.normalize(500, 4) == (501, 1)
+        assert doc.normalize(500, -1) == (499, 2)
+        assert doc.normalize(0, -5) == (0, 0)
+        assert doc.normalize(999, 10) == (999, 2)
+        assert doc.viewport(999, 1, 5) == doc.wrapped(999)[1:]
+
+        assert doc.height() == sum(len(term.wrap(text, 10)) for text in paragraphs)
+        assert doc.locate(doc.row(700, 2)) == (700, 2)
+        assert doc.locate(doc.height() + 5) == (999, 2)
+        assert list(doc.iter_lines(999, 2)) == [(999, 2, doc.wrapped(999)[2])]
+
+        doc[500] = u'replaced'
+        doc.append(u'the end')
+        assert doc.viewport(500, 0, 2) == [u'replaced', doc.wrapped(501)[0]]
+        assert doc.wrapped(-1) == [u'the end'] and doc.height() == doc.row(1000) + 1
+
+    child()
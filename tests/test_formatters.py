@@ -22,6 +22,16 @@ else:
     import jinxed as curses
 
 
+def patch_tparm(monkeypatch, function):
+    """Replace curses.tparm by ``function``, given every capability uncompiled, and forgotten."""
+    import blessed._tparm
+    import blessed.formatters
+    monkeypatch.setattr(curses, 'tparm', function)
+    monkeypatch.setattr(blessed.formatters, '_RESULTS', {})
+    monkeypatch.setattr(blessed._tparm, '_PROGRAMS', {})
+    monkeypatch.setattr(blessed._tparm, 'compile_tparm', lambda cap: None)
+
+
 def fn_tparm(*args):
     """Mock tparm function"""
     return u'~'.join(
@@ -34,7 +44,7 @@ def test_parameterizing_string_args_unspecified(monkeypatch):
     from blessed.formatters import ParameterizingString, FormattingString
     # first argument to tparm() is the sequence name, returned as-is;
     # subsequent arguments are usually Integers.
-    monkeypatch.setattr(curses, 'tparm', fn_tparm)
+    patch_tparm(monkeypatch, fn_tparm)
 
     # given,
     pstr = ParameterizingString(u'')
@@ -63,7 +73,7 @@ def test_parameterizing_string_args(monkeypatch):
 
     # first argument to tparm() is the sequence name, returned as-is;
     # subsequent arguments are usually Integers.
-    monkeypatch.setattr(curses, 'tparm', fn_tparm)
+    patch_tparm(monkeypatch, fn_tparm)
 
     # given,
     pstr = ParameterizingString(u'cap', u'norm', u'seq-name')
@@ -93,7 +103,7 @@ def test_parameterizing_string_type_error(monkeypatch):
     def tparm_raises_TypeError(*args):
         raise TypeError('custom_err')
 
-    monkeypatch.setattr(curses, 'tparm', tparm_raises_TypeError)
+    patch_tparm(monkeypatch, tparm_raises_TypeError)
 
     # given,
     pstr = ParameterizingString(u'cap', u'norm', u'cap-name')
@@ -327,7 +337,7 @@ def test_resolve_attribute_non_compoundables(monkeypatch):
     monkeypatch.setattr(blessed.formatters,
                         'resolve_capability',
                         resolve_cap)
-    monkeypatch.setattr(curses, 'tparm', fn_tparm)
+    patch_tparm(monkeypatch, fn_tparm)
 
     term = mock.Mock()
     term.normal = 'seq-normal'
@@ -353,7 +363,7 @@ def test_resolve_attribute_recursive_compoundables(monkeypatch):
     monkeypatch.setattr(blessed.formatters,
                         'resolve_capability',
                         resolve_cap)
-    monkeypatch.setattr(curses, 'tparm', fn_tparm)
+    patch_tparm(monkeypatch, fn_tparm)
     monkeypatch.setattr(curses, 'COLOR_RED', 6502)
     monkeypatch.setattr(curses, 'COLOR_BLUE', 6800)
 
@@ -443,7 +453,7 @@ def test_pickled_parameterizing_string(monkeypatch):
 
     # first argument to tparm() is the sequence name, returned as-is;
     # subsequent arguments are usually Integers.
-    monkeypatch.setattr(curses, 'tparm', fn_tparm)
+    patch_tparm(monkeypatch, fn_tparm)
 
     # given,
     pstr = ParameterizingString(u'seqname', u'norm', u'cap-name')
@@ -475,7 +485,7 @@ def test_tparm_returns_null(monkeypatch):
     def tparm(*args):
         raise curses.error("tparm() returned NULL")
 
-    monkeypatch.setattr(curses, 'tparm', tparm)
+    patch_tparm(monkeypatch, tparm)
 
     term = mock.Mock()
     term.normal = 'seq-normal'
@@ -495,7 +505,7 @@ def test_tparm_other_exception(monkeypatch):
     def tparm(*args):
         raise curses.error("unexpected error in tparm()")
 
-    monkeypatch.setattr(curses, 'tparm', tparm)
+    patch_tparm(monkeypatch, tparm)
 
     term = mock.Mock()
     term.normal = 'seq-normal'
@@ -37,6 +37,54 @@ def test_length_cjk():
     child()
 
 
+def test_width_table_agrees_with_wcwidth():
+    """Widths of the table are those of wcwidth, clipped to 0."""
+    from wcwidth import wcwidth
+    from blessed._width import char_width, text_width
+    codepoints = itertools.chain(range(0x3000), range(0xfe00, 0x10000, 7),
+                                 range(0x1f300, 0x1f700, 3) if sys.maxunicode > 0xffff else ())
+    for codepoint in codepoints:
+        char = six.unichr(codepoint)
+        assert char_width(char) == max(wcwidth(char), 0), hex(codepoint)
+        assert text_width(u'ab' + char) == 2 + max(wcwidth(char), 0), hex(codepoint)
+    assert text_width(u'') == 0
+    assert text_width(u'h\xe9llo w\xf6rld') == 11
+    assert text_width(u'e\u0301') == 1
+    assert text_width(u'\x00\x1b\x7f') == 0
+    assert text_width(u'コンニチハ') == 10
+
+
+@pytest.mark.skipif(sys.maxunicode <= 0xffff, reason="requires a 'wide' build of python")
+def test_length_grapheme_clusters():
+    """Grapheme clusters of emoji are measured as a whole."""
+    @as_subprocess
+    def child():
+        from blessed._width import _CLUSTER_WIDTHS, iter_graphemes
+        term = TestTerminal(force_styling=True)
+        family = u'\U0001F468‍\U0001F469‍\U0001F467'
+        given = {
+            family: 2,
+            u'\U0001F1FA\U0001F1F8': 2,  # flag
+            u'\U0001F44D\U0001F3FD': 2,  # skin tone modifier
+            u'❤️': 2,  # variation selector 16
+            u'#️⃣': 2,  # keycap
+            u'☺︎': 1,  # variation selector 15
+            u'क्‍ष': 2,  # zero width joiner of devanagari, not emoji
+            u'\U0001F1FA\U0001F1F8\U0001F1FA': 3,
+        }
+        for text, width in given.items():
+            assert term.length(term.red(text) + u'x') == width + 1, text
+        assert _CLUSTER_WIDTHS[family] == 2
+
+        assert list(iter_graphemes(u'a' + family + u'b')) == [(u'a', 1), (family, 2), (u'b', 1)]
+        assert term.truncate(family * 2 + u'x', 3) == family
+        assert term.slice_cells(family * 2, 1, 4) == u' ' + family
+        assert term.center(family, 6) == u'  ' + family + u'  '
+        assert term.wrap(family * 3, 5) == [family * 2, family]
+
+    child()
+
+
 def test_length_ansiart():
     """Test length of ANSI art"""
     @as_subprocess
@@ -301,6 +349,23 @@ def test_sequence_length(all_terms):
     child(all_terms)
 
 
+def test_batch_methods(all_terms):
+    """Batch methods agree with those of each text."""
+    @as_subprocess
+    def child(kind):
+        term = TestTerminal(kind=kind, force_styling=True)
+        cells = [u'', u'name', u'h\xe9llo', u'コンニチハ', term.bold_red(u'コンニチハ'),
+                 u'tab\tstop', term.underline(u'x') + term.move_right(3)]
+        assert term.lengths(cells) == [term.length(cell) for cell in cells]
+        assert term.strip_seqs_many(cells) == [term.strip_seqs(cell) for cell in cells]
+        assert term.ljust_many(cells, 12, u'.') == [term.ljust(cell, 12, u'.') for cell in cells]
+        assert term.ljust_many(iter(cells), 12) == [term.ljust(cell, 12) for cell in cells]
+        assert term.ljust_many(cells) == [term.ljust(cell) for cell in cells]
+        assert term.lengths(iter(())) == []
+
+    child(all_terms)
+
+
 def test_env_winsize():
     """Test height and width is appropriately queried in a pty."""
     @as_subprocess
@@ -605,3 +670,189 @@ def test_foreign_sequences():
         term = TestTerminal(kind=kind)
         assert measure_length(u'\x1b[m', term) == len('\x1b[m')
     child(kind='ansi')
+
+
+def test_sequence_tokenizer_default():
+    """The 'regex' tokenizer is default, and only known tokenizers may be chosen."""
+    @as_subprocess
+    def child():
+        term = TestTerminal()
+        assert term.sequence_tokenizer == 'regex'
+        term.sequence_tokenizer = 'ecma48'
+        assert term.sequence_tokenizer == 'ecma48'
+        with pytest.raises(AssertionError):
+            term.sequence_tokenizer = 'nonesuch'
+        assert term.sequence_tokenizer == 'ecma48'
+
+    child()
+
+
+def test_ecma48_tokenizer_agrees(all_terms):
+    """Both tokenizers agree about the length and content of strings of known sequences."""
+    @as_subprocess
+    def child(kind):
+        from blessed.sequences import iter_parse
+        term = TestTerminal(kind=kind, force_styling=True)
+        given = (term.bold_red(u'コンニチハ, ') + term.move(3, 4) + term.clear_eol +
+                 u'x' + term.move_right(5) + term.underline(u'yz') + term.move_x(9) +
+                 term.on_color(3)(u'a\tb') + u'c\bd' + term.link('http://x', 'z') +
+                 term.normal)
+        expected_length = term.length(given)
+        expected_stripped = term.strip_seqs(given)
+        expected_padd = term.truncate(given, 7)
+        expected_seqs = u''.join(text for text, cap in iter_parse(term, given) if cap)
+
+        term.sequence_tokenizer = 'ecma48'
+        assert term.length(given) == expected_length
+        assert term.strip_seqs(given) == expected_stripped
+        assert term.truncate(given, 7) == expected_padd
+        assert u''.join(text for text, cap in iter_parse(term, given) if cap) == expected_seqs
+
+    child(all_terms)
+
+
+def test_ecma48_tokenizer_unknown_sequences():
+    """The 'ecma48' tokenizer measures sequences unknown to terminfo as zero-width."""
+    @as_subprocess
+    def child():
+        from blessed.sequences import iter_parse
+        term = TestTerminal(force_styling=True)
+        given = u'\x1b[?2004h' + u'abc' + u'\x1b]0;title\x07' + u'\x1bP1$r0m\x1b\\' + u'd'
+        assert term.length(given) > 4
+
+        term.sequence_tokenizer = 'ecma48'
+        assert term.length(given) == 4
+        assert term.strip_seqs(given) == u'abcd'
+        assert [(text, cap.name) for text, cap in iter_parse(term, given) if cap] == [
+            (u'\x1b[?2004h', 'unknown'),
+            (u'\x1b]0;title\x07', 'unknown'),
+            (u'\x1bP1$r0m\x1b\\', 'unknown'),
+        ]
+
+        # an unterminated string or control sequence, or lone escape, is only a single control
+        # character, the remaining text remains printable.
+        assert term.strip_seqs(u'\x1b]0;abc') == u'0;abc'
+        assert term.strip_seqs(u'xyz\x1b') == u'xyz'
+        assert [text for text, cap in iter_parse(term, u'\x1b[12\nz')] == [
+            u'\x1b[', u'1', u'2', u'\n', u'z']
+
+    child()
+
+
+def test_ecma48_tokenizer_resolves_termcap():
+    """Sequences found by the 'ecma48' tokenizer are resolved to the same Termcap."""
+    @as_subprocess
+    def child():
+        from blessed.sequences import iter_parse
+        term = TestTerminal(force_styling=True)
+        term.sequence_tokenizer = 'ecma48'
+        assert next(iter_parse(term, term.move(98, 76)))[1] is term.caps['cursor_address']
+        assert next(iter_parse(term, term.cuf(333)))[1] is term.caps['parm_right_cursor']
+        assert next(iter_parse(term, term.cuf(333)))[1].horizontal_distance(term.cuf(333)) == 333
+        assert next(iter_parse(term, u'\b'))[1].horizontal_distance(u'\b') == -1
+        # resolved sequences are remembered,
+        assert term.move(98, 76) in term._caps_resolved
+
+    child()
+
+
+def test_sequence_parsed_once():
+    """Sequence-aware methods of a Sequence, and of Terminal given it, share a single parse."""
+    @as_subprocess
+    def child():
+        try:
+            from unittest import mock
+        except ImportError:
+            import mock
+        from blessed import sequences
+        from blessed.sequences import Sequence
+        term = TestTerminal(force_styling=True)
+        given = term.bold_red(u'コンニチハ') + term.move_right(3) + u'x'
+        seq = Sequence(given, term)
+        assert Sequence(seq, term) is seq
+
+        with mock.patch.object(sequences, 'iter_spans', wraps=sequences.iter_spans) as spans:
+            assert seq.length() == 14
+            assert seq.ljust(16) == given + u'  '
+            assert seq.rjust(16) == u'  ' + given
+            assert seq.center(16) == u' ' + given + u' '
+            assert seq.strip_seqs() == u'コンニチハ   x'
+            assert term.length(seq) == 14
+            assert term.ljust(seq, 15) == given + u' '
+            assert term.center(seq, 18) == u'  ' + given + u'  '
+            assert spans.call_count == 1
+
+            # a truncated string containing horizontal movement must first be padded
+            assert term.truncate(seq, 12) == term.bold_red(u'コンニチハ') + u'  '
+            assert spans.call_count == 2
+            assert term.truncate(Sequence(u'xyz', term), 2) == u'xy'
+            assert spans.call_count == 3
+
+        # a Sequence of another terminal is not shared
+        other = TestTerminal()
+        assert Sequence(seq, other) is not seq
+        assert Sequence(seq, other) == seq
+
+    child()
+
+
+def test_sequence_cache():
+    """Results of sequence-aware Terminal methods are remembered by their arguments."""
+    @as_subprocess
+    def child():
+        term = TestTerminal(force_styling=True)
+        cache = term.sequence_cache
+        given = term.bold_red(u'コンニチハ') + u'xyz'
+        assert cache.cache_info() == (0, 0, 0, 1024, 0)
+
+        assert term.length(given) == 13
+        assert term.length(given) == 13
+        assert cache.cache_info() == (1, 1, 0, 1024, 1)
+
+        # keyed by width and chars
+        assert term.truncate(given, 4) == term.bold_red(u'コン')
+        assert term.truncate(given, 6) == term.bold_red(u'コンニ')
+        assert term.strip_seqs(given) == u'コンニチハxyz'
+        assert term.strip(given, u'z') == u'コンニチハxy'
+        assert term.strip(given) == u'コンニチハxyz'
+        assert cache.cache_info() == (1, 6, 0, 1024, 6)
+
+        # least recently used are evicted
+        term.length(given)
+        cache.maxsize = 2
+        assert cache.cache_info() == (2, 6, 4, 2, 2)
+        assert ('length', given) in cache
+        assert ('strip', given, None) in cache
+
+        # strings longer than maxlength are not remembered
+        cache.maxsize = 1024
+        long_text = term.red(u'x' * 300)
+        assert len(long_text) > cache.maxlength == 256
+        assert term.length(long_text) == 300
+        assert term.length(long_text) == 300
+        assert ('length', long_text) not in cache
+        assert cache.cache_info() == (2, 6, 4, 1024, 2)
+
+        # disabled
+        cache.maxsize = 0
+        assert term.length(u'abc') == 3
+        assert term.length(u'abc') == 3
+        assert cache.cache_info() == (2, 6, 6, 0, 0)
+
+        with pytest.raises(AssertionError):
+            cache.maxsize = -1
+
+    child()
+
+
+def test_sequence_cache_cleared_by_tokenizer():
+    """Changing the tokenizer discards results but retains statistics."""
+    @as_subprocess
+    def child():
+        term = TestTerminal(force_styling=True)
+        term.length(u'abc')
+        term.sequence_tokenizer = 'ecma48'
+        assert len(term.sequence_cache) == 0
+        assert term.sequence_cache.misses == 1
+
+    child()
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""Tests for sequence-aware processing of large files by a pool of processes."""
+# std imports
+import io
+import tempfile
+
+# 3rd party
+import pytest
+
+# local
+from .accessories import TestTerminal, as_subprocess
+from .conftest import IS_WINDOWS
+
+
+def make_log(term):
+    """Return text resembling a log file of terminal output, without final newline."""
+    lines = []
+    for num in range(200):
+        lines.append(u'[{0:03d}] '.format(num) + term.green(u'PASSED') + u' ünïcode コン')
+        lines.append(term.bold(u'===') + u' 50%\b\b\b70%' + term.move_left(3) + u'99%\tok')
+        lines.append(u'carriage\rreturn\r\n' + term.clear_eol + term.red(u'error:') + u'\x01')
+    return u'\n'.join(lines)
+
+
+def test_strip_seqs_bytes():
+    """strip_seqs_bytes() strips each line as strip_seqs(), and retains newlines."""
+    @as_subprocess
+    def child():
+        from blessed.sequences import strip_seqs_bytes
+        term = TestTerminal(force_styling=True)
+        given = make_log(term)
+        expected = u'\n'.join(term.strip_seqs(line) for line in given.split(u'\n'))
+        assert strip_seqs_bytes(term, given.encode('utf8')) == expected.encode('utf8')
+        assert strip_seqs_bytes(term, b'') == b''
+        # bytes of invalid encoding are retained
+        assert strip_seqs_bytes(term, b'\xff\x1b[1m\xfe\b\n') == b'\xff\n'
+
+    child()
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_strip_seqs_file(processes):
+    """strip_seqs_file() writes each line stripped, as by print(strip_seqs(line))."""
+    if IS_WINDOWS and processes > 1:
+        pytest.skip('a temporary file may not be opened again by name on windows')
+
+    @as_subprocess
+    def child(processes):
+        from blessed.parallel import strip_seqs_file
+        term = TestTerminal(force_styling=True)
+        given = make_log(term)
+        expected = u''.join(term.strip_seqs(line) + u'\n' for line in given.split(u'\n'))
+        with tempfile.NamedTemporaryFile() as infile:
+            infile.write(given.encode('utf8'))
+            infile.flush()
+            infile.seek(0)
+            outfile = io.BytesIO()
+            strip_seqs_file(term, infile, outfile, processes=processes, chunk_size=256,
+                            encoding='utf8')
+        assert outfile.getvalue() == expected.encode('utf8')
+
+    child(processes)
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_strip_seqs_file_encoding(processes):
+    """strip_seqs_file() reads and writes text of the encoding given, of ASCII only."""
+    if IS_WINDOWS and processes > 1:
+        pytest.skip('a temporary file may not be opened again by name on windows')
+
+    @as_subprocess
+    def child(processes):
+        from blessed.parallel import strip_seqs_file
+        term = TestTerminal(force_styling=True)
+        given = make_log(term).replace(u' コン', u'')
+        expected = u''.join(term.strip_seqs(line) + u'\n' for line in given.split(u'\n'))
+        with tempfile.NamedTemporaryFile() as infile:
+            infile.write(given.encode('latin1'))
+            infile.flush()
+            infile.seek(0)
+            outfile = io.BytesIO()
+            strip_seqs_file(term, infile, outfile, processes=processes, chunk_size=256,
+                            encoding='latin1')
+        assert outfile.getvalue() == expected.encode('latin1')
+
+        with pytest.raises(ValueError):
+            strip_seqs_file(term, io.BytesIO(), io.BytesIO(), encoding='utf-16')
+
+    child(processes)
+
+
+def test_strip_seqs_file_stream():
+    """strip_seqs_file() of a stream that may not be mapped is read by chunks of lines."""
+    @as_subprocess
+    def child():
+        from blessed.parallel import strip_seqs_file
+        term = TestTerminal(force_styling=True)
+        given = make_log(term)
+        expected = u''.join(term.strip_seqs(line) + u'\n' for line in given.split(u'\n'))
+        outfile = io.BytesIO()
+        strip_seqs_file(term, io.BytesIO(given.encode('utf8')), outfile, chunk_size=100,
+                        encoding='utf8')
+        assert outfile.getvalue() == expected.encode('utf8')
+
+        outfile = io.BytesIO()
+        strip_seqs_file(term, io.BytesIO(b''), outfile)
+        assert outfile.getvalue() == b''
+
+    child()
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_wrap_parallel(processes):
+    """wrap_parallel() returns the same lines as wrap(), of text or of an iterable of lines."""
+    @as_subprocess
+    def child(processes):
+        from blessed.parallel import wrap_parallel
+        term = TestTerminal(force_styling=True)
+        given = make_log(term) + u'\n\n' + u' '.join([term.bold(u'word')] * 50)
+        kwargs = {'subsequent_indent': u'  ', 'break_long_words': True}
+        expected = term.wrap(given, 17, **kwargs)
+        assert wrap_parallel(term, given, 17, processes, 500, **kwargs) == expected
+        assert wrap_parallel(term, io.StringIO(given), 17, processes, 500, **kwargs) == expected
+        assert wrap_parallel(term, u'', 17, processes) == []
+
+    child(processes)
+
+
+def test_strip_seqs_bytes_c1():
+    """Sequences of 8-bit controls are stripped of bytes of any encoding, as a single byte."""
+    @as_subprocess
+    def child():
+        from blessed.parallel import CapabilityTerminal, strip_seqs_file
+        from blessed.sequences import Termcap, strip_seqs_bytes
+        # as a terminal of 8-bit controls, such as kind 'xterm-8bit', of a control sequence
+        # introducer u'\x9b' in place of u'\x1b['.
+        term = CapabilityTerminal(TestTerminal(force_styling=True))
+        term.caps['enter_bold_mode'] = Termcap('enter_bold_mode', u'\x9b1m', 'bold')
+        given = u'caf\xe9 \x9b1mbold\x1b[m\n'
+        for encoding in ('latin1', 'utf8'):
+            assert strip_seqs_bytes(term, given.encode(encoding), encoding) == (
+                u'caf\xe9 bold\n'.encode(encoding))
+        outfile = io.BytesIO()
+        strip_seqs_file(term, io.BytesIO(given.encode('latin1')), outfile, encoding='latin1')
+        assert outfile.getvalue() == u'caf\xe9 bold\n'.encode('latin1')
+        # a sequence not of the characters of an encoding is not found in its bytes.
+        assert strip_seqs_bytes(term, b'\x9b1m\x1b[m', 'ascii') == b'\x9b1m'
+
+    child()
+
+
+def test_capability_terminal():
+    """CapabilityTerminal is picklable, and recognizes the same sequences as its terminal."""
+    @as_subprocess
+    def child():
+        import pickle
+        from blessed.parallel import CapabilityTerminal
+        from blessed.sequences import Sequence
+        term = TestTerminal(force_styling=True)
+        given = make_log(term)
+        standin = pickle.loads(pickle.dumps(CapabilityTerminal(term)))
+        assert Sequence(given, standin).strip_seqs() == term.strip_seqs(given)
+        assert Sequence(given, standin).length() == term.length(given)
+
+    child()
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""Tests for the in-memory model of a terminal screen."""
+# local
+from .accessories import as_subprocess
+
+
+def make_screen(height=5, width=20):
+    """Return (term, screen) of a Screen of given size, the stream of an xterm-256color Terminal."""
+    from blessed import Terminal
+    from blessed.screen import Screen
+    screen = Screen(height=height, width=width)
+    term = Terminal(kind='xterm-256color', stream=screen, force_styling=True)
+    return term, screen
+
+
+def test_screen_text():
+    """Text is written at the cursor, wrapped at the right margin, and scrolled at the bottom."""
+    @as_subprocess
+    def child():
+        term, screen = make_screen()
+        assert (term.height, term.width) == (5, 20)
+        term.stream.write(term.move_yx(1, 2) + u'hello コン\tx\n' + u'y' * 21)
+        assert screen.display == [u' ' * 20,
+                                  u'  hello コン    x   ',
+                                  u'y' * 20,
+                                  u'y' + u' ' * 19,
+                                  u' ' * 20]
+        assert screen.cursor == (3, 1)
+        assert screen.cell(1, 8) == (u'コ', screen.style)
+        assert screen.cell(1, 9).char == u''
+
+        # the cursor remains at the right margin until the next character.
+        term.stream.write(term.move_yx(4, 18) + u'ab')
+        assert screen.cursor == (4, 19)
+        term.stream.write(u'ce\u0301')
+        assert screen.display[-3:] == [u'y' + u' ' * 19, u' ' * 18 + u'ab', u'ce\u0301' + u' ' * 18]
+        assert screen.cursor == (4, 2)
+
+        # a wide character does not fit at the right margin, and is wrapped.
+        term.stream.write(term.move_x(19) + u'コ')
+        assert screen.line(3) == u'ce\u0301' + u' ' * 18
+        assert screen.line(4) == u'コ' + u' ' * 18
+        # overwriting half of a wide character erases it.
+        term.stream.write(term.move_x(1) + u'z')
+        assert screen.line(4) == u' z' + u' ' * 18
+
+    child()
+
+
+def test_screen_movement_and_erase():
+    """Cursor movement, erasing, insertion, and deletion of characters and lines."""
+    @as_subprocess
+    def child():
+        term, screen = make_screen()
+        for row in range(5):
+            term.stream.write(term.move_yx(row, 0) + u'{0}abcdefghij'.format(row))
+        term.stream.write(term.move_yx(0, 3) + term.clear_eol)
+        term.stream.write(term.move_yx(1, 3) + term.clear_bol)
+        term.stream.write(term.move_yx(2, 2) + term.dch1 + u'\x1b[2@')
+        term.stream.write(term.move_yx(3, 0) + term.move_down(1) + term.move_right(4) + u'\x1b[3X')
+        assert screen.display == [u'0ab' + u' ' * 17,
+                                  u'    defghij' + u' ' * 9,
+                                  u'2a  cdefghij' + u' ' * 8,
+                                  u'3abcdefghij' + u' ' * 9,
+                                  u'4abc   ghij' + u' ' * 9]
+        term.stream.write(term.move_yx(1, 5) + term.il1)
+        assert screen.cursor == (1, 0)
+        assert screen.line(1) == u' ' * 20 and screen.line(4) == u'3abcdefghij' + u' ' * 9
+        term.stream.write(term.dl1)
+        assert screen.line(1) == u'    defghij' + u' ' * 9 and screen.line(4) == u' ' * 20
+        term.stream.write(term.move_yx(2, 5) + term.clear_eos)
+        assert screen.display[2:] == [u'2a  c' + u' ' * 15, u' ' * 20, u' ' * 20]
+        term.stream.write(term.home + term.clear)
+        assert screen.display == [u' ' * 20] * 5 and screen.cursor == (0, 0)
+
+    child()
+
+
+def test_screen_scroll_region():
+    """Scrolling is limited to the scrolling region."""
+    @as_subprocess
+    def child():
+        term, screen = make_screen()
+        for row in range(5):
+            term.stream.write(term.move_yx(row, 0) + str(row))
+        term.stream.write(term.csr(1, 3) + term.move_yx(3, 0) + u'\nx')
+        assert [line[0] for line in screen.display] == [u'0', u'2', u'3', u'x', u'4']
+        term.stream.write(term.move_yx(1, 0) + term.ri)
+        assert [line[0] for line in screen.display] == [u'0', u' ', u'2', u'3', u'4']
+        term.stream.write(term.csr(0, 4) + term.move_yx(4, 0) + u'\n')
+        assert [line[0] for line in screen.display] == [u' ', u'2', u'3', u'4', u' ']
+
+    child()
+
+
+def test_screen_styles():
+    """Select Graphic Rendition sets the style of cells written, and erased."""
+    @as_subprocess
+    def child():
+        from blessed.screen import DEFAULT_STYLE
+        term, screen = make_screen()
+        term.number_of_colors = 1 << 24
+        term.stream.write(term.bold_red(u'a') + term.underline + term.on_color_rgb(1, 2, 3) + u'b' + term.normal +
+                          term.italic + term.color(196) + u'c' + term.normal + u'd' +
+                          u'\x1b[38:2::4:5:6;7me' + term.on_blue + term.clear_eol)
+        assert screen.cell(0, 0).style == DEFAULT_STYLE._replace(bold=True, fg=1)
+        assert screen.cell(0, 1).style == DEFAULT_STYLE._replace(underline=True, bg=(1, 2, 3))
+        assert screen.cell(0, 2).style == DEFAULT_STYLE._replace(italic=True, fg=196)
+        assert screen.cell(0, 3).style == DEFAULT_STYLE
+        assert screen.cell(0, 4).style == DEFAULT_STYLE._replace(reverse=True, fg=(4, 5, 6))
+        assert screen.cell(0, 5).style == DEFAULT_STYLE._replace(bg=4)
+        assert screen.cell(0, 19).style == DEFAULT_STYLE._replace(bg=4)
+
+    child()
+
+
+def test_screen_modes():
+    """Alternate screen, saved cursor, and cursor visibility."""
+    @as_subprocess
+    def child():
+        term, screen = make_screen()
+        term.stream.write(term.move_yx(2, 3) + u'primary')
+        with term.fullscreen(), term.hidden_cursor():
+            assert screen.alternate and not screen.cursor_visible
+            term.stream.write(term.home + u'alternate')
+            assert screen.line(0) == u'alternate' + u' ' * 11 and screen.line(2) == u' ' * 20
+        assert not screen.alternate and screen.cursor_visible
+        assert screen.line(2) == u'   primary' + u' ' * 10 and screen.cursor == (2, 10)
+        with term.location(0, 0):
+            term.stream.write(u'top')
+        assert screen.line(0) == u'top' + u' ' * 17 and screen.cursor == (2, 10)
+
+        # a sequence split between writes.
+        seq = term.move_yx(4, 4)
+        term.stream.write(seq[:3])
+        term.stream.write(seq[3:] + u'z')
+        assert screen.cursor == (4, 5)
+
+        screen.resize(3, 10)
+        assert (term.height, term.width) == (3, 10)
+        assert screen.display == [u'top' + u' ' * 7, u' ' * 10, u'   primary']
+        assert screen.cursor == (2, 5)
+
+    child()
+
+
+def test_screen_size_of_stream():
+    """Only a Screen given as stream is of its own size, not any stream of its attributes."""
+    @as_subprocess
+    def child():
+        from blessed import Terminal
+
+        class Stream(object):
+            """A stream of attributes named as those of a Screen."""
+            height, width = 3, 7
+
+            def write(self, text):
+                """Discard ``text``."""
+
+        term = Terminal(kind='xterm-256color', stream=Stream(), force_styling=True)
+        assert (term.height, term.width) != (3, 7)
+
+        term, screen = make_screen(height=4, width=9)
+        term.track_cursor = True
+        assert (term.height, term.width) == (4, 9)
+        screen.resize(6, 11)
+        assert (term.height, term.width) == (6, 11)
+
+    child()
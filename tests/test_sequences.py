@@ -286,6 +286,45 @@ def test_zero_location(all_terms):
     child(all_terms)
 
 
+def test_move_from(all_terms):
+    """move_from() is never longer than move_yx(), and moves to the target, with or without ONLCR."""
+    @as_subprocess
+    def child(kind):
+        import random
+        from blessed.screen import Screen
+        t = TestTerminal(kind=kind, stream=six.StringIO(), force_styling=True)
+        rng = random.Random(kind)
+        line = u'the quick brown fox jumps over the lazy dog' * 2
+        for _ in range(300):
+            cur = (rng.randrange(24), rng.randrange(80))
+            target = (rng.randrange(24), rng.randrange(80))
+            if rng.random() < 0.5:
+                target = (max(0, min(23, cur[0] + rng.randint(-2, 2))),
+                          max(0, min(79, cur[1] + rng.randint(-4, 4))))
+            moved = t.move_from(cur, target, line=line)
+            assert len(moved) <= len(t.move_yx(*target))
+            if kind.startswith('xterm'):
+                for onlcr in (True, False):
+                    screen = Screen(24, 80, onlcr=onlcr)
+                    screen.write(t.move_yx(target[0], 0) + line[:80] + t.move_yx(*cur) + moved)
+                    assert screen.cursor == target, (cur, target, moved)
+                    assert screen.line(target[0]) == line[:80]
+
+        assert t.move_from((3, 3), (3, 3)) == u''
+        assert t.move_from(None, (3, 3)) == t.move_yx(3, 3)
+        if kind.startswith('xterm'):
+            assert t.move_from((10, 40), (11, 2)) == u'\r\n' + t.move_right(2)
+            assert t.move_from((5, 5), (5, 4)) == u'\b'
+            assert t.move_from((5, 5), (0, 0)) == t.home
+            assert t.move_from((11, 0), (11, 2), line=u'ok, done') == u'ok'
+            assert t.move_from((11, 0), (11, 2), line=u'\u30b3\u30f3') == t.move_right(2)
+
+        t = TestTerminal(kind=kind, stream=six.StringIO())
+        assert t.move_from((1, 1), (2, 2)) == u''
+
+    child(all_terms)
+
+
 def test_mnemonic_colors(all_terms):
     """Make sure color shortcuts work."""
     # pylint:  disable=consider-using-ternary
@@ -527,6 +566,11 @@ def test_padd():
         assert Sequence('xxxx\x1b[3Dzz', term).padd() == u'xzz'
         assert Sequence('\x1b[3D', term).padd() == u''  # "Trim left"
         assert Sequence(term.red('xxxx\x1b[3Dzz'), term).padd() == term.red(u'xzz')
+        # movement to the left across several chunks of output, and beyond its start
+        assert Sequence(u'ab\tcd\x1b[11Dx', term).padd() == u'ax'
+        assert Sequence(u'ab\tcd\x1b[13Dx', term).padd() == u'x'
+        assert Sequence(u'ab\x1b[3Dxy\by', term).strip_seqs() == u'xy'
+        assert Sequence(u'0123456789' * 1000 + u'\b' * 9999, term).padd() == u'0'
     kind = 'vtwin10' if IS_WINDOWS else 'xterm-256color'
     child(kind)
 
@@ -601,6 +645,113 @@ def test_split_seqs_maxsplit3_and_term_right(all_terms):
     child(all_terms)
 
 
+def test_split_seqs_coalesce(all_terms):
+    """Test Terminal.split_seqs with coalesce=True, for both tokenizers."""
+    @as_subprocess
+    def child(kind):
+        from blessed import Terminal
+        term = Terminal(kind, force_styling=True)
+
+        for tokenizer in ('regex', 'ecma48'):
+            term.sequence_tokenizer = tokenizer
+            given_text = 'abc' + term.bold + 'bbq' + term.move_right(32) + 'RS'
+            expected = ['abc', term.bold, 'bbq', term.move_right(32), 'RS']
+            if not term.bold:
+                expected.remove(term.bold)
+            assert term.split_seqs(given_text, coalesce=True) == expected
+            assert term.split_seqs(given_text, 2, coalesce=True) == expected[:2] + [
+                u''.join(expected[2:])]
+            assert term.split_seqs(u'', coalesce=True) == []
+
+    child(all_terms)
+
+
+def test_iter_parse_coalesce(all_terms):
+    """Test iter_parse and iter_spans yield runs of text as a single token."""
+    @as_subprocess
+    def child(kind):
+        from blessed import Terminal
+        from blessed.sequences import iter_parse, iter_spans
+        term = Terminal(kind, force_styling=True)
+
+        for tokenizer in ('regex', 'ecma48'):
+            term.sequence_tokenizer = tokenizer
+            given_text = term.red(u'コンニチハ, ') + u'xyz' + term.move_x(3) + u'z'
+            tokens = list(iter_parse(term, given_text, coalesce=True))
+            assert u''.join(text for text, _ in tokens) == given_text
+            # runs of text are never adjacent to one another
+            assert all(left[1] or right[1] for left, right in zip(tokens, tokens[1:]))
+            assert tokens[-1][0].endswith(u'z' if term.move_x(3) else u'xyzz')
+            assert list(iter_parse(term, given_text)) == [
+                (char, None) if cap is None else (text, cap)
+                for text, cap in tokens for char in (text if cap is None else (text,))]
+
+            # spans are adjacent and cover all of the given text
+            spans = list(iter_spans(term, given_text))
+            assert [end for _, end, _ in spans[:-1]] == [start for start, _, _ in spans[1:]]
+            assert spans[0][0] == 0 and spans[-1][1] == len(given_text)
+
+    child(all_terms)
+
+
+def test_iter_spans_unknown_control():
+    """Unknown control characters are text for 'regex', and sequences for 'ecma48'."""
+    @as_subprocess
+    def child():
+        from blessed.sequences import iter_spans
+        term = TestTerminal(force_styling=True)
+        assert list(iter_spans(term, u'ab\x01cd')) == [(0, 5, None)]
+        term.sequence_tokenizer = 'ecma48'
+        assert [(start, end, cap and cap.name) for start, end, cap in
+                iter_spans(term, u'ab\x01cd')] == [(0, 2, None), (2, 3, 'unknown'), (3, 5, None)]
+
+    child()
+
+
+def test_sequence_parser(all_terms):
+    """SequenceParser finds the same sequences of a stream split at any position."""
+    @as_subprocess
+    def child(kind):
+        from blessed.sequences import SEQUENCE_TOKENIZERS, SequenceParser, iter_parse
+        term = TestTerminal(kind=kind, force_styling=True)
+        given = (term.bold_red(u'コンニチハ') + u'\x1b]8;;http://example.com\x1b\\link'
+                 + term.move_x(3) + u'\x1b[?2004h' + term.clear_eol + u'\x1b(Bxyz\x1b')
+        for tokenizer in SEQUENCE_TOKENIZERS:
+            term.sequence_tokenizer = tokenizer
+            expected = [(text, cap and cap.name) for text, cap in iter_parse(term, given)
+                        if cap is not None]
+            for split in range(len(given) + 1):
+                parser = SequenceParser(term)
+                tokens = list(parser.feed(given[:split]))
+                tokens.extend(parser.feed(given[split:]))
+                assert parser.pending == u'\x1b'
+                tokens.extend(parser.flush())
+                assert parser.pending == u''
+                assert u''.join(text for text, _ in tokens) == given
+                assert [(text, cap and cap.name) for text, cap in tokens
+                        if cap is not None] == expected, split
+
+    child(all_terms)
+
+
+def test_sequence_parser_max_pending():
+    """SequenceParser keeps no more than max_pending characters between chunks."""
+    @as_subprocess
+    def child():
+        from blessed.sequences import SequenceParser
+        term = TestTerminal(force_styling=True)
+        parser = SequenceParser(term, max_pending=8)
+        assert u''.join(text for text, _ in parser.feed(u'ab\x1b]0;ti')) == u'ab'
+        assert parser.pending == u'\x1b]0;ti'
+        assert u''.join(text for text, _ in parser.feed(u'tl')) == u''
+        assert parser.pending == u'\x1b]0;titl'
+        # an incomplete sequence of greater length is parsed as text
+        assert u''.join(text for text, _ in parser.feed(u'e')) == u'\x1b]0;title'
+        assert parser.pending == u''
+
+    child()
+
+
 def test_formatting_other_string(all_terms):
     """FormattingOtherString output depends on how it's called"""
     @as_subprocess
@@ -730,6 +881,119 @@ def test_truncate_default(all_terms):
     child(all_terms)
 
 
+def test_slice_cells(all_terms):
+    """Ensure that terminal.slice_cells keeps all sequences and fills split wide characters."""
+    @as_subprocess
+    def child(kind):
+        from blessed import Terminal
+        term = Terminal(kind)
+        red, blue, normal = term.red, term.blue, term.normal
+        given = red + u'コンニチハ' + normal + u'abc' + blue + u'xe\u0301z' + normal
+        assert term.slice_cells(given, 0) == given
+        assert term.slice_cells(given, 0, 100) == given
+        assert term.slice_cells(given, 0, 10) == red + u'コンニチハ' + normal + blue + normal
+        assert term.slice_cells(given, 4, 6) == red + u'ニ' + normal + blue + normal
+        assert term.slice_cells(given, 3, 7) == red + u' ニ ' + normal + blue + normal
+        assert term.slice_cells(given, 1, 2) == red + u' ' + normal + blue + normal
+        assert term.slice_cells(given, 9, 12) == red + u' ' + normal + u'ab' + blue + normal
+        # zero-width characters are kept with the character they follow
+        assert term.slice_cells(given, 14) == red + normal + blue + u'e\u0301z' + normal
+        assert term.slice_cells(given, 13, 14) == red + normal + blue + u'x' + normal
+        assert term.slice_cells(given, 20, 30) == red + normal + blue + normal
+        assert term.slice_cells(given, 5, 5) == red + normal + blue + normal
+
+    child(all_terms)
+
+
+def test_slice_cells_padding(all_terms):
+    """Ensure that terminal.slice_cells expands horizontal movement."""
+    @as_subprocess
+    def child(kind):
+        from blessed import Terminal
+        term = Terminal(kind)
+        given = term.blue(u'one' + term.move_right(5) + u'two')
+        assert term.slice_cells(given, 2, 9) == term.blue(u'e     t')
+        assert term.slice_cells(u'one\b\b\btwo', 1) == u'wo'
+
+    if all_terms != 'vtwin10':
+        # padding doesn't work the same on windows !
+        child(all_terms)
+
+
+def test_strip_seqs_map(all_terms):
+    """Ensure strip_seqs_map() maps each character of strip_seqs() to its offset and column."""
+    @as_subprocess
+    def child(kind):
+        from blessed import Terminal
+        term = Terminal(kind, force_styling=True)
+        for given in (term.red(u'Hello') + u', world',
+                      u'ab\bc' + term.move_right(2) + term.bold(u'コxe\u0301') + u'z',
+                      term.clear + u'one' + term.move_left(2) + u'\ttwo',
+                      u'', term.normal):
+            stripped = term.strip_seqs_map(given)
+            assert stripped.raw == given
+            assert stripped.text == term.strip_seqs(given)
+            assert len(stripped.offsets) == len(stripped.columns) == len(stripped.text) + 1
+            assert stripped.offsets[-1] == len(given)
+            assert stripped.columns[-1] == term.length(given)
+            for char, offset in zip(stripped.text, stripped.offsets):
+                assert char == given[offset] or char == u' '
+
+        stripped = term.strip_seqs_map(u'ab\bc' + term.move_right(2) + term.bold(u'コxe\u0301'))
+        assert stripped.text == u'ac  コxe\u0301'
+        assert list(stripped.columns) == [0, 1, 2, 3, 4, 6, 7, 7, 8]
+        assert [stripped.column_index(col) for col in range(10)] == [0, 1, 2, 3, 4, 4, 5, 6, 8, 8]
+        if term.move_right(2):
+            assert stripped.offsets[2] == stripped.offsets[3] == 4
+
+        given = term.red(u'Hello') + u', world'
+        stripped = term.strip_seqs_map(given)
+        start = stripped.text.index(u'o, w')
+        assert stripped.offsets[start] == given.index(u'o')
+        assert stripped.highlight([(start, start + 4), (0, 1), (1, 2)], u'[', u']') == (
+            term.red(u'[H][e]ll[o') + u', w]orld')
+        # overlapping, empty, and out of range.
+        assert stripped.highlight([(0, 3), (2, 4), (5, 5), (10, 20)], u'[', u']') == (
+            term.red(u'[Hel]lo') + u', wor[ld]')
+
+    child(all_terms)
+
+
+def test_styled_text(all_terms):
+    """Ensure StyledText measures, adjusts, truncates, and slices as the string it joins."""
+    @as_subprocess
+    def child(kind):
+        from blessed import Terminal
+        from blessed.sequences import StyledText
+        term = Terminal(kind, force_styling=True)
+        fragments = (term.red(u'コンニチハ'), u' | ', term.bold(u'abc'), u'', term.blue(u'xe\u0301z'))
+        given = u''.join(fragments)
+        styled = StyledText(term, fragments[0])
+        for fragment in fragments[1:]:
+            styled = styled + fragment
+        assert six.text_type(styled) == given
+        assert styled == given and styled == StyledText(term, given)
+        assert styled.width == styled.length() == term.length(styled) == term.length(given) == 19
+        assert [text for text, _ in styled.fragments()] == list(fragments)
+        assert (u'> ' + styled).width == 21
+        assert six.text_type(u'> ' + styled) == u'> ' + given
+        assert StyledText(term, u'known', width=3).width == 3
+
+        assert styled.ljust(25) == term.ljust(given, 25)
+        assert styled.ljust(25).width == 25
+        assert styled.rjust(25, u'-') == term.rjust(given, 25, u'-')
+        assert styled.ljust(5) is styled
+        for width in (0, 3, 9, 10, 13, 15, 19, 30):
+            assert styled.truncate(width) == term.truncate(given, width), width
+            assert styled.truncate(width).width == term.length(term.truncate(given, width))
+        for start, stop in ((0, None), (0, 10), (3, 7), (9, 14), (12, 17), (18, 30), (5, 5)):
+            assert styled.slice_cells(start, stop) == term.slice_cells(given, start, stop)
+            assert styled.slice_cells(start, stop).width == term.length(
+                term.slice_cells(given, start, stop))
+
+    child(all_terms)
+
+
 @pytest.mark.skipif(sys.version_info[:2] < (3, 8), reason="Only supported on Python >= 3.8")
 def test_supports_index(all_terms):
     """Ensure sequence formatting methods support objects with __index__()"""
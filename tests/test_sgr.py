@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Tests for removal of sequences of SGR that do not change the output displayed."""
+# std imports
+import random
+
+# local
+from .accessories import TestTerminal, as_subprocess
+
+
+def make_output(term, rng, count=60):
+    """Return output of ``count`` random fragments of formatted text, movement, and sequences."""
+    fragments = [
+        lambda: term.red(u'ab'), lambda: term.bold_on_blue(u'c'), lambda: term.normal,
+        lambda: term.bold, lambda: term.underline, lambda: term.color(rng.randint(0, 255)),
+        lambda: term.on_color_rgb(rng.randint(0, 255), 9, 9), lambda: term.color_rgb(1, 2, 3),
+        lambda: term.no_underline, lambda: u'\x1b[22m', lambda: u'\x1b[39;49m', lambda: u'xyz',
+        lambda: u'\x1b[53m', lambda: u'\x1b[0;21m', lambda: u'\x1b[38;5;300m', lambda: u'\x1b[;1m',
+        lambda: term.move_yx(rng.randint(0, 4), rng.randint(0, 19)),
+        lambda: term.move_left, lambda: u'\r\n', lambda: term.clear_eol, lambda: term.save,
+        lambda: term.restore, lambda: term.reverse(u'コ'), lambda: u' ',
+    ]
+    return u''.join(rng.choice(fragments)() for _ in range(count))
+
+
+def cells(screen):
+    """Return each cell of ``screen``, of its character and style."""
+    return [[screen.cell(y, x) for x in range(screen.width)] for y in range(screen.height)]
+
+
+def test_filter_sgr():
+    """Redundant sequences of SGR are removed, and the remaining written by the shortest."""
+    from blessed.sgr import filter_sgr
+    from blessed.style import BOLD, Style
+    assert filter_sgr(u'') == u''
+    assert filter_sgr(u'\x1b[m\x1b[0m\x1b[mtext\x1b[m') == u'text'
+    assert filter_sgr(u'\x1b[31ma\x1b[m\x1b[31mb\x1b[m\x1b[m') == u'\x1b[31mab\x1b[m'
+    assert filter_sgr(u'\x1b[1m\x1b[m\x1b[4m\x1b[24mtext') == u'text'
+    assert filter_sgr(u'\x1b[31m\x1b[32m\x1b[31ma') == u'\x1b[31ma'
+    assert filter_sgr(u'\x1b[1;31ma\x1b[0m\x1b[1mb') == u'\x1b[1;31ma\x1b[39mb'
+    assert filter_sgr(u'a\x1b[1m', style=Style(BOLD)) == u'a'
+
+    # the style is not written before movement of the cursor, but before erasing.
+    assert filter_sgr(u'\x1b[44m\x1b[5;5H\x1b[m') == u'\x1b[5;5H'
+    assert filter_sgr(u'\x1b[44m\x1b[5;5H\x1b[K') == u'\x1b[5;5H\x1b[44m\x1b[K'
+
+    # attributes not of a Style are written as given until all are reset.
+    assert filter_sgr(u'\x1b[53ma\x1b[53mb\x1b[m\x1b[mc') == u'\x1b[53ma\x1b[53mb\x1b[mc'
+    assert filter_sgr(u'\x1b[1ma\x1b[>4;1m') == u'\x1b[1ma\x1b[>4;1m'
+
+
+def test_filter_sgr_screen():
+    """Output filtered is displayed as the same, by whole text and by parts of a stream."""
+    @as_subprocess
+    def child():
+        from blessed.sgr import SGRFilterStream, filter_sgr
+        from blessed.screen import Screen
+        term = TestTerminal(kind='xterm-256color', force_styling=True)
+        rng = random.Random(25)
+        total = filtered_total = 0
+        for _ in range(100):
+            output = make_output(term, rng)
+            filtered = filter_sgr(output)
+            total, filtered_total = total + len(output), filtered_total + len(filtered)
+            expected, screen = Screen(5, 20), Screen(5, 20)
+            expected.write(output)
+            screen.write(filtered)
+            assert cells(screen) == cells(expected), (output, filtered)
+            assert (screen.cursor, screen.style) == (expected.cursor, expected.style)
+
+            screen = Screen(5, 20)
+            stream = SGRFilterStream(screen)
+            idx = 0
+            while idx < len(output):
+                size = rng.randint(1, 12)
+                assert stream.write(output[idx:idx + size]) == len(output[idx:idx + size])
+                idx += size
+            stream.flush()
+            assert cells(screen) == cells(expected), output
+            assert screen.style == expected.style
+        assert filtered_total < total
+
+        # the length written is of the text given, though filtered to nothing.
+        stream = SGRFilterStream(Screen(5, 20))
+        assert stream.write(u'\x1b[1m\x1b[m') == 7
+
+        # text of many formatted strings is mostly of its sequences, removed.
+        output = u''.join(term.red(char) for char in u'hello world')
+        assert len(filter_sgr(output)) < len(output) / 2
+
+    child()
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""Tests for interned values of attributes and colors, and Terminal.style()."""
+# std imports
+import re
+import pickle
+import random
+
+# 3rd party
+import pytest
+
+# local
+from .accessories import TestTerminal, as_subprocess
+
+
+def random_style(rng):
+    """Return a Style of random attributes and colors."""
+    from blessed.style import Style
+    colors = [None, None, rng.randint(0, 7), rng.randint(8, 15), rng.randint(16, 255),
+              (rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255))]
+    return Style(rng.randint(0, 255), rng.choice(colors), rng.choice(colors))
+
+
+def test_style_value():
+    """Equal styles are the same object, immutable, combined by '+', and pickled as such."""
+    from blessed.style import BOLD, DEFAULT, UNDERLINE, Style
+    bold_red = Style(BOLD, fg=1)
+    assert bold_red is Style(BOLD, 1, None) is Style.parse('bold_red')
+    assert Style(fg=[1, 2, 3]) is Style(fg=(1, 2, 3))
+    assert {bold_red: 1}[Style.parse('bold_red')] == 1
+    assert bold_red.attributes == ('bold',)
+    assert pickle.loads(pickle.dumps(bold_red)) is bold_red
+    assert DEFAULT is Style() is Style.parse('normal')
+    assert repr(bold_red + Style.parse('underline_on_blue')) == (
+        'Style(bits=BOLD|UNDERLINE, fg=1, bg=4)')
+    assert bold_red + Style(UNDERLINE, bg=4) is Style(BOLD | UNDERLINE, 1, 4)
+    assert Style(fg=2) + bold_red is bold_red
+    assert bold_red + DEFAULT is bold_red
+    with pytest.raises(AttributeError):
+        bold_red.bits = 0
+    for bits, color in ((256, None), (-1, None), ('1', None), (0, 256), (0, True), (True, None),
+                        (0, (1, 2))):
+        with pytest.raises(ValueError):
+            Style(bits, color)
+
+
+def test_style_parse():
+    """Names of compound formatters are parsed to a Style."""
+    from blessed.style import BOLD, REVERSE, UNDERLINE, Style
+    assert Style.parse('bold_red_on_bright_blue') is Style(BOLD, 1, 12)
+    assert Style.parse('standout_underline_bright_white') is Style(REVERSE | UNDERLINE, 15)
+    assert Style.parse('on_aquamarine') is Style(bg=(127, 255, 212))
+    for name in ('bold_reddish', 'bright_aquamarine', 'move_x', ''):
+        with pytest.raises(ValueError):
+            Style.parse(name)
+
+
+def test_style_sgr():
+    """A style is rendered as a sequence of SGR, and as a change from another style."""
+    from blessed.style import DIM, BOLD, DEFAULT, ITALIC, Style
+    assert DEFAULT.sgr == u'\x1b[m'
+    assert Style(BOLD | ITALIC, 1, 12).sgr == u'\x1b[0;1;3;31;104m'
+    assert Style(fg=100, bg=(1, 2, 3)).sgr == u'\x1b[0;38;5;100;48;2;1;2;3m'
+    assert Style(BOLD, 1).sgr is Style(BOLD, 1).sgr
+    assert Style(BOLD).diff(Style(BOLD)) == u''
+    assert Style(BOLD | ITALIC, 1).diff(Style(ITALIC, 4)) == u'\x1b[22;34m'
+    assert Style(BOLD | DIM, 1).diff(Style(DIM, 1)) == u'\x1b[22;2m'
+    assert Style(BOLD).diff(DEFAULT) == u'\x1b[m'
+
+
+def test_style_diff_screen():
+    """The change of one style to another is displayed as that style."""
+    @as_subprocess
+    def child():
+        from blessed.style import Style
+        from blessed.screen import Screen
+        rng = random.Random(24)
+        screen = Screen(height=2, width=10)
+        for _ in range(500):
+            before, after = random_style(rng), random_style(rng)
+            assert Style.from_cell_style(before.cell_style) is before
+            screen.write(before.sgr)
+            assert screen.style == before.cell_style
+            screen.write(before.diff(after))
+            assert screen.style == after.cell_style, (before, after)
+            assert len(before.diff(after)) <= len(after.sgr)
+
+    child()
+
+
+def test_terminal_style():
+    """Terminal.style() renders a Style once, as SGR on terminals of ANSI sequences."""
+    @as_subprocess
+    def child():
+        from blessed.style import Style
+        from blessed.formatters import FormattingString
+        term = TestTerminal(kind='xterm-256color', force_styling=True)
+        style = term.style('bold_red_on_bright_blue')
+        assert isinstance(style, FormattingString)
+        assert style == u'\x1b[0;1;31;104m'
+        assert style is term.style(Style.parse('red_bold_on_bright_blue'))
+        assert style(u'x') == style + u'x' + term.normal
+        assert term.style(Style(fg=(255, 0, 0))) == u'\x1b[0;91m'
+
+        term = TestTerminal(kind='xterm-256color', force_styling=None)
+        assert term.style('bold_red') == u''
+
+    child()
+
+
+def test_terminal_style_8_colors():
+    """Terminal.style() converts colors 8 through 255 to colors 0 through 7 of 8-color kinds."""
+    @as_subprocess
+    def child():
+        from blessed.style import Style
+        term = TestTerminal(kind='xterm', force_styling=True)
+        assert term.number_of_colors == 8
+        for color in range(256):
+            fg, bg = term.style(Style(fg=color)), term.style(Style(bg=color))
+            assert re.match(u'\x1b\\[0;3[0-7]m\\Z', fg), (color, fg)
+            assert re.match(u'\x1b\\[0;4[0-7]m\\Z', bg), (color, bg)
+        assert term.style('on_bright_black') == term.style(Style(bg=(128, 128, 128)))
+        assert re.match(u'\x1b\\[0;3[0-7]m\\Z', term.style(Style(fg=(255, 255, 255))))
+
+    child()
+
+
+def test_terminal_style_capabilities():
+    """Terminal.style() composes capabilities of terminals not of ANSI sequences."""
+    @as_subprocess
+    def child():
+        term = TestTerminal(kind='vt220', force_styling=True)
+        assert term.number_of_colors == 0
+        assert term.style('bold_underline_red') == term.normal + term.bold + term.smul
+
+    child()
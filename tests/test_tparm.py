@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""Tests for parameterized capabilities compiled to Python functions."""
+# std imports
+import random
+import platform
+
+# 3rd party
+import pytest
+
+# local
+from .accessories import TestTerminal, as_subprocess
+from .conftest import IS_WINDOWS
+
+if platform.system() != 'Windows':
+    import curses
+else:
+    import jinxed as curses  # pylint: disable=import-error
+
+pytestmark = pytest.mark.skipif(IS_WINDOWS, reason='compared to curses.tparm of ncurses')
+
+#: Parameterized string capabilities of terminfo(5).
+PARAMETERIZED_CAPNAMES = (
+    'cub', 'cud', 'cuf', 'cuu', 'cup', 'hpa', 'vpa', 'mrcup', 'csr', 'ech', 'dch', 'ich', 'il',
+    'dl', 'indn', 'rin', 'rep', 'setaf', 'setab', 'setf', 'setb', 'scp', 'initc', 'initp', 'sgr',
+    'sgr1', 'u6', 'u7', 'tsl', 'wind', 'mc5p', 'pfkey', 'pfloc', 'pfx', 'smgl', 'smgr', 'smglp',
+    'smgrp', 'smgtp', 'smgbp', 'slines', 'swidm', 'colornm', 'setcolor', 'dial', 'pctrm', 'sdrfq',
+)
+
+
+def assert_same_as_curses(cap, arguments):
+    """Assert that tparm() of ``cap`` and each of ``arguments`` is as curses.tparm()."""
+    from blessed._tparm import tparm
+    for args in arguments:
+        try:
+            expected = curses.tparm(cap.encode('latin1'), *args).decode('latin1')
+        except curses.error:
+            continue
+        assert tparm(cap, *args) == expected, (cap, args)
+
+
+def make_arguments(seed, count=40):
+    """Return ``count`` tuples of parameters, of small, boundary, and random values."""
+    rng = random.Random(seed)
+    values = [0, 1, 2, 7, 8, 9, 15, 16, 255, 256, 1000, -1, -10]
+    return [tuple(rng.choice(values + [rng.randint(-300, 300)])
+                  for _ in range(rng.randint(0, 9))) for _ in range(count)]
+
+
+def test_tparm_capabilities(all_terms):
+    """Every parameterized capability of the terminfo database is evaluated as by curses."""
+    @as_subprocess
+    def child(kind):
+        TestTerminal(kind=kind, force_styling=True)
+        for capname in PARAMETERIZED_CAPNAMES:
+            cap = curses.tigetstr(capname)
+            if cap and b'%' in cap:
+                assert_same_as_curses(cap.decode('latin1'), make_arguments(kind + capname))
+
+    child(all_terms)
+
+
+def test_tparm_language():
+    """Each element of the language of parameterized capabilities is evaluated as by curses."""
+    @as_subprocess
+    def child():
+        from blessed._tparm import compile_tparm
+        TestTerminal(kind='xterm-256color', force_styling=True)
+        compiled = [
+            u'plain', u'100%% %p1%d%%', u'%p1%d;%p2%d;%p3%d', u'%i%p1%d;%p2%d', u'%i%i%p1%d',
+            u'%p1%02d|%p1%3d|%p1%:-4d|%p1% d|%p1%.3d|%p1%5.2d', u'%p1%x|%p1%X|%p1%o|%p1%4x',
+            u'%p1%c%p2%c', u"%'A'%p1%+%c", u'%{48}%p1%+%c', u'%p1%{10}%/%d,%p1%{10}%m%d',
+            u'%p1%p2%/%d,%p1%p2%m%d', u'%p1%p2%*%d,%p1%p2%-%d', u'%p1%p2%&%d%p1%p2%|%d%p1%p2%^%d',
+            u'%p1%p2%=%d%p1%p2%<%d%p1%p2%>%d%p1%p2%A%d%p1%p2%O%d', u'%p1%!%d%p1%~%d',
+            u'%p1%Pa%p2%Pb%gb%ga%-%d%ga%d', u'%gz%p1%d%d%d',
+            u'%?%p1%tone%;', u'%?%p1%tone%etwo%;', u'%?%p1%{8}%<%t3%p1%d%e%p1%{16}%<%t9%p1%{8}%-%d'
+            u'%e38;5;%p1%d%;m', u'%p1%p2%?%p1%t%d%e%{7}%d%;%d',
+            u'%?%p1%t%?%p2%tA%eB%;%eC%;', u'%?%p1%p2%>%t%p1%Pa%e%p2%Pa%;%ga%d',
+        ]
+        for cap in compiled:
+            assert compile_tparm(cap) is not None, cap
+            assert_same_as_curses(cap, make_arguments(cap) + [(0,), (1, 0), (2 ** 31 - 1, 1)])
+
+        # these are given to curses.tparm
+        given_to_curses = [
+            u'%i%d;%d', u'%p1%#x', u'%p1%:+d', u'%p1%.0d', u'%p1%05.2d', u'%?%p1%t%i%;%p1%d',
+            u'%p1%PA%gA%d', u'%?%p1%tA', u'%p1%t', u'%e', u'%;', u'%{99999999999}%d', u'%p1%z',
+        ]
+        for cap in given_to_curses:
+            assert compile_tparm(cap) is None, cap
+            assert_same_as_curses(cap, [(), (1,), (0, 5), (3, 4)])
+
+    child()
+
+
+def test_tparm_errors():
+    """Arguments not of a C int are given to curses.tparm, raising its exceptions."""
+    @as_subprocess
+    def child():
+        from blessed._tparm import tparm
+        TestTerminal(kind='xterm-256color', force_styling=True)
+        assert tparm(u'%p1%d', 5) == u'5'
+        with pytest.raises(TypeError):
+            tparm(u'%p1%d', u'x')
+        with pytest.raises(TypeError):
+            tparm(u'%p1%d', [5])
+        with pytest.raises(OverflowError):
+            tparm(u'%p1%d', 2 ** 31)
+        with pytest.raises(TypeError):
+            tparm(u'%p1%d', *range(10))
+
+    child()
+
+
+def test_parameterizing_string_results():
+    """ParameterizingString remembers its results, of the same value as curses.tparm."""
+    @as_subprocess
+    def child():
+        from blessed.formatters import FormattingString
+        term = TestTerminal(kind='xterm-256color', force_styling=True)
+        expected = curses.tparm(curses.tigetstr('cup'), 4, 9).decode('latin1')
+        moved = term.move(4, 9)
+        assert isinstance(moved, FormattingString)
+        assert moved == term.move_yx(4, 9) == expected
+        assert term.move(4, 9) is moved
+        assert term.color(196)(u'x') == (curses.tparm(curses.tigetstr('setaf'), 196).decode(
+            'latin1') + u'x' + term.normal)
+
+        # arguments equal to those remembered, but not of int, are as given to curses.tparm.
+        with pytest.raises(TypeError):
+            term.move(4.0, 9)
+        assert term.move(True, 9) == curses.tparm(curses.tigetstr('cup'), True, 9).decode(
+            'latin1')
+        assert term.move(True, 9) is not term.move(True, 9)
+
+    child()
@@ -1,6 +1,7 @@
 """Tests for Terminal.wrap()"""
 
 # std imports
+import io
 import textwrap
 
 # 3rd party
@@ -131,3 +132,115 @@ def test_multiline():
         assert expected == result
 
     child()
+
+
+@pytest.mark.parametrize("kwargs", TEXTWRAP_KEYWORD_COMBINATIONS)
+def test_measure(many_columns, kwargs):
+    """Test that Terminal.measure() matches the lines of Terminal.wrap()."""
+    @as_subprocess
+    def child(width, kwargs):
+        term = TestTerminal(force_styling=True)
+        pgraph = (u'\n' + term.red(u'Z! a bc') + u' defghij\tklmno-pqrstuvw<<>>xyz012345678900 '
+                  + u'字字 ' + term.bold(u'well-known') + u'   end.\n\n  ') * 3
+        lines = term.wrap(pgraph, width=width, **kwargs)
+        assert term.measure(pgraph, width=width, **kwargs) == len(lines)
+
+        # each line begins at its offset, compared without indent
+        kwargs['subsequent_indent'] = u''
+        lines = term.wrap(pgraph, width=width, **kwargs)
+        offsets = term.measure(pgraph, width=width, offsets=True, **kwargs)
+        assert len(offsets) == len(lines)
+        for offset, line in zip(offsets, lines):
+            if u'\t' not in pgraph[offset:offset + len(line)]:
+                assert pgraph[offset:].startswith(line)
+
+    child(width=many_columns, kwargs=kwargs)
+
+
+def test_wrap_wide_character():
+    """Test that a character wider than the given width is given a line of its own."""
+    @as_subprocess
+    def child():
+        term = TestTerminal()
+        assert term.wrap(u'字字 a', 1) == [u'字', u'字', u'a']
+        assert term.measure(u'字字 a', 1) == 3
+        assert term.measure(u'hello world, hello!', 12, offsets=True) == [0, 13]
+        assert term.measure(u'\n\ta b', 3, offsets=True) == [0, 1, 4]
+
+    child()
+
+
+def test_wrap_long_words():
+    """Test that words longer than a line are broken as by textwrap, retaining sequences."""
+    @as_subprocess
+    def child():
+        term = TestTerminal(force_styling=True)
+        url = u'https://example.com/' + u'/'.join(u'path{0}'.format(n) for n in range(40))
+        given = u'see ' + url + u' or ' + term.bold(url[:60]) + url[60:]
+        result = term.wrap(given, 13)
+        expected = textwrap.wrap(u'see ' + url + u' or ' + url, 13)
+        assert [term.strip_seqs(line) for line in result] == expected
+        assert u''.join(result).count(term.bold) == 1
+        assert term.measure(given, 13) == len(result)
+        assert [term.length(line) for line in result[:-1]] == [13] * (len(result) - 1)
+
+    child()
+
+
+def test_wrap_carry_styles():
+    """Test that wrap(carry_styles=True) begins each line with the styles in effect, and ends it."""
+    @as_subprocess
+    def child():
+        from blessed.screen import Screen
+        term = TestTerminal(kind='xterm-256color', force_styling=True)
+        red, bold, normal = term.red, term.bold, term.normal
+        given = (u'plain ' + term.underline(u'under line') + u' text ' + red(u'red ') + bold
+                 + u'red bold words ' + u'\x1b[0;32m' + u'green words ' + normal + u'words')
+        lines = term.wrap(given, 10, subsequent_indent=u'> ', carry_styles=True)
+        assert lines == [
+            u'plain',
+            u'> ' + term.underline + u'under' + normal,
+            u'> ' + term.underline + u'line' + normal,
+            u'> text ' + red + u'red' + normal,
+            u'> ' + red + normal + bold + u'red bold' + normal,
+            u'> ' + bold + u'words' + normal,
+            u'> ' + bold + u'\x1b[0;32m' + u'green' + normal,
+            u'> ' + u'\x1b[0;32m' + u'words' + normal,
+            u'> ' + u'\x1b[0;32m' + normal + u'words']
+        assert [term.strip_seqs(line) for line in lines] == term.wrap(
+            term.strip_seqs(given), 10, subsequent_indent=u'> ')
+
+        # each line is displayed alone as it is following all of the lines before it.
+        together = Screen(9, 10)
+        together.write(u'\n'.join(term.wrap(given, 10)))
+        for row, line in enumerate(term.wrap(given, 10, carry_styles=True)):
+            alone = Screen(1, 10)
+            alone.write(line)
+            assert [alone.cell(0, col) for col in range(10)] == [
+                together.cell(row, col) for col in range(10)]
+
+        assert term.wrap(red(u'a b'), 1, carry_styles=True) == [
+            red + u'a' + normal, red + u'b' + normal]
+        assert term.wrap(u'a b', 1, carry_styles=True) == [u'a', u'b']
+
+    child()
+
+
+def test_iter_wrap():
+    """Test that Terminal.iter_wrap() lazily wraps lines of an iterable or file object."""
+    @as_subprocess
+    def child():
+        term = TestTerminal()
+        text = u'hello world, hello!\n\n' + u'x' * 30 + u'\r\nend\n'
+        assert list(term.iter_wrap(io.StringIO(text), 12)) == term.wrap(text, 12)
+        assert list(term.iter_wrap(text.splitlines(), 12)) == term.wrap(text, 12)
+        assert list(term.iter_wrap([u'a b', u'', u'c\nd'], 1, index=True)) == [
+            (0, u'a'), (0, u'b'), (1, u''), (2, u'c'), (2, u'd')]
+
+        def endless():
+            while True:
+                yield u'hello world'
+        lines = term.iter_wrap(endless(), 5)
+        assert [next(lines) for _ in range(3)] == [u'hello', u'world', u'hello']
+
+    child()